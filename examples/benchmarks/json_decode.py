@@ -0,0 +1,62 @@
+"""Benchmark decoding large device listings with json and orjson."""
+
+from __future__ import annotations
+
+import json
+import timeit
+from functools import partial
+
+import orjson
+
+
+def device(device_id: int) -> dict[str, object]:
+    """Create a device row, like the ones returned by the Balena Cloud API."""
+    return {
+        "id": device_id,
+        "belongs_to__application": {"__id": 1},
+        "belongs_to__user": None,
+        "device_name": f"Device_{device_id}",
+        "uuid": f"{device_id:032x}",
+        "is_running__release": {"__id": 1},
+        "note": None,
+        "status": "Idle",
+        "update_status": "done",
+        "is_online": device_id % 3 != 0,
+        "last_connectivity_event": "2024-01-01T00:00:00.000Z",
+        "ip_address": "10.0.0.1",
+        "mac_address": "00:00:00:00:00:01 00:00:00:00:00:02",
+        "public_address": "192.0.2.1",
+        "os_version": "balenaOS 5.3.0",
+        "os_variant": "prod",
+        "supervisor_version": "16.1.0",
+        "is_web_accessible": False,
+        "longitude": "0.0000",
+        "latitude": "0.0000",
+        "location": "Location",
+        "cpu_usage": 12,
+        "memory_usage": 512,
+        "memory_total": 4096,
+        "storage_usage": 1024,
+        "storage_total": 30000,
+        "cpu_temp": 45,
+        "created_at": "2024-01-01T00:00:00.000Z",
+        "modified_at": "2024-01-01T00:00:00.000Z",
+    }
+
+
+def main() -> None:
+    """Compare the decode speed of json and orjson for device listings."""
+    for devices in (1_000, 10_000, 50_000):
+        content = orjson.dumps({"d": [device(index) for index in range(devices)]})
+        number = 5
+        stdlib = timeit.timeit(partial(json.loads, content), number=number) / number
+        fast = timeit.timeit(partial(orjson.loads, content), number=number) / number
+        print(
+            f"{devices:>6} devices ({len(content) / 1_000_000:5.1f} MB): "
+            f"json {stdlib * 1000:7.1f} ms, orjson {fast * 1000:7.1f} ms, "
+            f"{stdlib / fast:4.1f}x faster"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark the overhead of the middleware chain per request."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from balena_cloud import BalenaCloud, RateLimiter, ResponseCache, RetryPolicy
+from balena_cloud.middleware import Request, build_chain
+
+
+async def send(request: Request) -> Any:
+    """Answer a request without sending it, like a very fast API."""
+    return request.uri
+
+
+async def measure(client: BalenaCloud, calls: int) -> float:
+    """Measure the average time of a request through the default chain."""
+    handler = build_chain(client.default_middlewares(), send)
+    start = time.perf_counter()
+    for index in range(calls):
+        await handler(Request(client, f"device({index})"))
+    return (time.perf_counter() - start) / calls
+
+
+async def main() -> None:
+    """Compare the chains of the options with sending directly."""
+    calls = 100_000
+    direct = time.perf_counter()
+    for index in range(calls):
+        await send(Request(None, f"device({index})"))
+    direct = (time.perf_counter() - direct) / calls
+    print(f"{'direct':>28}: {direct * 1_000_000:5.2f} µs")
+    token = "API_TOKEN"  # noqa: S105
+    for name, client in (
+        ("default", BalenaCloud(token)),
+        ("without coalescing", BalenaCloud(token, coalesce_requests=False)),
+        (
+            "retry and rate limit",
+            BalenaCloud(
+                token,
+                retry=RetryPolicy(),
+                rate_limiter=RateLimiter(rate=10**9, burst=10**9),
+            ),
+        ),
+        ("cache", BalenaCloud(token, cache=ResponseCache(max_entries=calls))),
+    ):
+        average = await measure(client, calls)
+        print(f"{name:>28}: {average * 1_000_000:5.2f} µs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
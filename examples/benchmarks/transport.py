@@ -0,0 +1,42 @@
+"""Benchmark the client without a network, with the in-memory transport."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from balena_cloud import BalenaCloud, MemoryTransport
+
+
+async def main() -> None:
+    """Measure sequential and concurrent device requests served from memory."""
+    calls = 10_000
+    transport = MemoryTransport()
+    transport.add(
+        "/v7/device",
+        {"d": [{"id": index, "device_name": f"Device_{index}"} for index in range(50)]},
+    )
+    async with BalenaCloud(
+        token="API_TOKEN",  # noqa: S106
+        coalesce_requests=False,
+        transport=transport,
+    ) as client:
+        start = time.perf_counter()
+        for index in range(calls):
+            await client.request("device", params={"$skip": index})
+        sequential = (time.perf_counter() - start) / calls
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                client.request("device", params={"$skip": index})
+                for index in range(calls)
+            )
+        )
+        concurrent = (time.perf_counter() - start) / calls
+    print(f"{'sequential':>12}: {sequential * 1_000_000:6.2f} µs per request")
+    print(f"{'concurrent':>12}: {concurrent * 1_000_000:6.2f} µs per request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -39,6 +39,16 @@ async def main() -> None:
         tags = await client.device_tag.get_all(device_id=device_id)
         print(tags)
 
+        print()
+        print("Add or update a tag on many devices")
+        print("===================================")
+        results = await client.device_tag.bulk_upsert(
+            [(device, "rollout", "wave-1") for device in (device_id, 7654321)],
+            concurrency=32,
+        )
+        for result in results:
+            print(result.item, "ok" if result.ok else result.error)
+
         print()
         print("Delete a tag from a device")
         print("===========================")
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import asyncio
 
-from balena_cloud import BalenaCloud, Device, Fleet, Service
+from balena_cloud import BalenaCloud, Device, Field, Fleet, Query, Service
 
 
 async def main() -> None:
@@ -31,6 +31,12 @@ async def main() -> None:
         for device in devices:
             print(device)
 
+        print()
+        print("Iterating over all devices from a fleet, page by page:")
+        print("=======================================================")
+        async for device in client.fleet.iter_devices(fleet_id, page_size=500):
+            print(device)
+
         print()
         print("Getting all devices from a fleet with a specific status:")
         print("=========================================================")
@@ -41,6 +47,18 @@ async def main() -> None:
         for device in filtered_devices:
             print(device)
 
+        print()
+        print("Getting the 10 most recent online devices with a tag:")
+        print("======================================================")
+        query = Query(
+            filter=Field("is_online").eq(True)  # noqa: FBT003
+            & Field("device_tag").any(lambda tag: (tag / "tag_key").eq("rollout")),
+            orderby=["created_at desc"],
+            top=10,
+        )
+        for device in await client.fleet.get_devices(fleet_id, query=query):
+            print(device)
+
         print()
         print("Getting all services from a fleet:")
         print("==================================")
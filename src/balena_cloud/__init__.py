@@ -1,14 +1,21 @@
 """Asynchronous Python client for Balena Cloud."""
 
 from .balena_cloud import BalenaCloud
+from .bulk import BulkResult
+from .cache import ResponseCache, RevalidatingCache
 from .exceptions import (
     BalenaCloudAuthenticationError,
     BalenaCloudConflictError,
     BalenaCloudConnectionError,
     BalenaCloudError,
+    BalenaCloudNotModifiedError,
     BalenaCloudParameterValidationError,
     BalenaCloudResourceNotFoundError,
+    BalenaCloudResponseError,
 )
+from .health import FleetHealth
+from .index import DeviceIndex
+from .lookup import LookupResult
 from .models import (
     Device,
     EnvironmentVariable,
@@ -19,21 +26,57 @@ from .models import (
     ServiceInstall,
     Tag,
 )
+from .odata import Field, Filter, Query
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .snapshot import FleetSnapshot
+from .store import SnapshotStore
+from .sync import DeviceEvent, DeviceSync
+from .table import DeviceRow, DeviceTable
+from .transport import (
+    AiohttpTransport,
+    ConnectorOptions,
+    HTTP2Transport,
+    MemoryTransport,
+)
 
 __all__ = [
+    "AiohttpTransport",
     "BalenaCloud",
     "BalenaCloudAuthenticationError",
     "BalenaCloudConflictError",
     "BalenaCloudConnectionError",
     "BalenaCloudError",
+    "BalenaCloudNotModifiedError",
     "BalenaCloudParameterValidationError",
     "BalenaCloudResourceNotFoundError",
+    "BalenaCloudResponseError",
+    "BulkResult",
+    "ConnectorOptions",
     "Device",
+    "DeviceEvent",
+    "DeviceIndex",
+    "DeviceRow",
+    "DeviceSync",
+    "DeviceTable",
     "EnvironmentVariable",
+    "Field",
+    "Filter",
     "Fleet",
+    "FleetHealth",
+    "FleetSnapshot",
+    "HTTP2Transport",
+    "LookupResult",
+    "MemoryTransport",
     "Organization",
+    "Query",
+    "RateLimiter",
     "Release",
+    "ResponseCache",
+    "RetryPolicy",
+    "RevalidatingCache",
     "Service",
     "ServiceInstall",
+    "SnapshotStore",
     "Tag",
 ]
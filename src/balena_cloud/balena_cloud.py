@@ -3,21 +3,26 @@
 from __future__ import annotations
 
 import asyncio
-import socket
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from importlib import metadata
-from typing import Any, Self
+from typing import TYPE_CHECKING, Any, Self
 
-from aiohttp import ClientError, ClientResponseError, ClientSession
-from aiohttp.hdrs import METH_DELETE, METH_GET, METH_PATCH
+import orjson
+from aiohttp import ClientSession
+from aiohttp.hdrs import METH_DELETE, METH_GET, METH_PATCH, RETRY_AFTER
 from yarl import URL
 
+from .batch import Batch
 from .exceptions import (
     BalenaCloudAuthenticationError,
     BalenaCloudConflictError,
     BalenaCloudConnectionError,
     BalenaCloudError,
+    BalenaCloudNotModifiedError,
+    BalenaCloudResponseError,
 )
+from .middleware import Coalescer, Request, batching, build_chain
+from .odata import Field, Query
 from .resources import (
     DeviceResource,
     DeviceServiceVariableResource,
@@ -30,20 +35,75 @@ from .resources import (
     ServiceInstallResource,
     ServiceResource,
 )
+from .retry import parse_retry_after
+from .streaming import RowParser
+from .transport import AiohttpTransport, ConnectorOptions
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+
+    from .cache import ResponseCache, RevalidatingCache
+    from .middleware import Handler, Middleware
+    from .rate_limit import RateLimiter
+    from .retry import RetryPolicy
+    from .transport import Transport, TransportResponse
 
 VERSION: str = metadata.version(__package__)  # ty:ignore[invalid-argument-type]
 
+# Comparison of the filter on the last ID of a page, by the ordering by ID.
+KEYSET_OPERATORS = {"id": "gt", "id asc": "gt", "id desc": "lt"}
+
 
+# Besides its options, the client has an attribute per resource namespace.
 @dataclass
-class BalenaCloud:
+class BalenaCloud:  # pylint: disable=too-many-instance-attributes
     """Main class for handling connections with the Balena Cloud API."""
 
     token: str
 
     request_timeout: float = 10.0
     session: ClientSession | None = None
+    page_size: int = 1000
+    stream_pages: bool = False
+    connector: ConnectorOptions = field(default_factory=ConnectorOptions)
+    cache: ResponseCache | None = None
+    revalidating_cache: RevalidatingCache | None = None
+    coalesce_requests: bool = True
+    retry: RetryPolicy | None = None
+    rate_limiter: RateLimiter | None = None
+
+    middlewares: Sequence[Middleware] | None = None
+    transport: Transport | None = None
 
     _close_session: bool = False
+    _coalescer: Coalescer = field(default_factory=Coalescer)
+    _handler: Handler | None = None
+
+    def default_middlewares(self) -> list[Middleware]:
+        """Get the middleware chain of the cache, coalesce, retry and rate options.
+
+        The chain is used when `middlewares` is not set. Build a custom chain
+        from these middlewares to reorder them or to add your own, for
+        example, `middlewares=[metrics, *client.default_middlewares()]`.
+
+        Returns
+        -------
+            The middlewares, the first one runs first (outermost).
+
+        """
+        middlewares: list[Middleware] = []
+        if self.revalidating_cache is not None:
+            middlewares.append(self.revalidating_cache)
+        if self.cache is not None:
+            middlewares.append(self.cache)
+        middlewares.append(batching)
+        if self.coalesce_requests:
+            middlewares.append(self._coalescer)
+        if self.retry is not None:
+            middlewares.append(self.retry)
+        if self.rate_limiter is not None:
+            middlewares.append(self.rate_limiter)
+        return middlewares
 
     async def request(
         self,
@@ -73,63 +133,373 @@ class BalenaCloud:
             BalenaCloudAuthenticationError: If the request is unauthorized.
             BalenaCloudError: If an unexpected error
 
+        """
+        if self._handler is None:
+            # Built on the first request, after the options are set.
+            self._handler = build_chain(
+                self.default_middlewares()
+                if self.middlewares is None
+                else self.middlewares,
+                self._send,
+            )
+        return await self._handler(Request(self, uri, method, params, data))
+
+    async def _send(self, request: Request) -> Any:
+        """Send a request to the Balena Cloud API at the end of the chain.
+
+        Args:
+        ----
+            request: The request to send.
+
+        Returns:
+        -------
+            The JSON decoded response, or None for PATCH and DELETE requests.
+
+        Raises:
+        ------
+            BalenaCloudNotModifiedError: If the API responds with 304 Not
+                Modified to a conditional request.
+            BalenaCloudError: If the response body is not valid JSON.
+
+        """
+        response = await self._open(request)
+        if response.status == 304:
+            await response.release()
+            msg = "The response of the Balena Cloud API was not modified."
+            raise BalenaCloudNotModifiedError(msg, response.status)
+        request.response_headers = response.headers
+        if request.method not in {METH_DELETE, METH_PATCH}:
+            await self._check_content_type(response)
+            # Decoded with orjson instead of the slower json module of aiohttp.
+            content = await response.read()
+            if not content.strip():
+                return None
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError as exception:
+                text = content.decode(errors="replace")
+                msg = "Invalid JSON response from the Balena Cloud API."
+                raise BalenaCloudError(msg, {"Response": text}) from exception
+        return None
+
+    async def _open(self, request: Request) -> TransportResponse:
+        """Send a request and wait for the status and headers of the response.
+
+        Args:
+        ----
+            request: The request to send.
+
+        Returns:
+        -------
+            The successful response, of which the body is not read yet.
+
+        Raises:
+        ------
+            BalenaCloudConnectionError: If a connection error occurs.
+            BalenaCloudAuthenticationError: If the request is unauthorized.
+            BalenaCloudConflictError: If the request conflicts with a resource.
+
         """
         url = URL.build(
             scheme="https",
             host="api.balena-cloud.com",
             path="/v7/",
-        ).join(URL(uri))
+        ).join(URL(request.uri))
+        if request.params:
+            url = url.extend_query(request.params)
 
         headers = {
             "Accept": "application/json",
             "Authorization": f"Bearer {self.token}",
             "User-Agent": f"PythonBalenaCloud/{VERSION}",
+            **(request.headers or {}),
         }
+        body = None
+        if request.data is not None:
+            headers["Content-Type"] = "application/json"
+            body = orjson.dumps(request.data)
 
-        if self.session is None:
-            self.session = ClientSession()
-            self._close_session = True
-
+        transport = self._get_transport()
         try:
             async with asyncio.timeout(self.request_timeout):
-                response = await self.session.request(
-                    method,
-                    url,
-                    headers=headers,
-                    params=params,
-                    json=data,
-                    ssl=True,
+                response = await transport.request(
+                    request.method, url, headers=headers, data=body
                 )
 
                 if response.status == 409:
-                    response_data = await response.json()
+                    content = await response.read()
+                    try:
+                        response_data = orjson.loads(content)
+                    except orjson.JSONDecodeError:
+                        response_data = content.decode(errors="replace")
                     raise BalenaCloudConflictError(response_data, response.status)
-
-                response.raise_for_status()
         except TimeoutError as exception:
             msg = "Timeout occurred while connecting to the Balena Cloud API."
             raise BalenaCloudConnectionError(msg) from exception
-        except ClientResponseError as exception:
-            if exception.status == 401:
+
+        if response.status >= 400:
+            await response.release()
+            if response.status == 401:
                 msg = "The request to the Balena Cloud API was unauthorized."
-                raise BalenaCloudAuthenticationError(msg) from exception
+                raise BalenaCloudAuthenticationError(msg)
             msg = "Error occurred while connecting to the Balena Cloud API."
-            raise BalenaCloudConnectionError(msg) from exception
-        except (ClientError, socket.gaierror) as exception:
+            raise BalenaCloudResponseError(
+                msg,
+                response.status,
+                retry_after=parse_retry_after(response.headers.get(RETRY_AFTER)),
+            )
+        return response
+
+    @staticmethod
+    async def _check_content_type(response: TransportResponse) -> None:
+        """Check that the response is JSON.
+
+        Args:
+        ----
+            response: The response to check.
+
+        Raises:
+        ------
+            BalenaCloudError: If the response has an unexpected content type.
+
+        """
+        content_type = response.headers.get("Content-Type", "")
+        if "application/json" not in content_type:
+            text = (await response.read()).decode(errors="replace")
+            msg = "Unexpected content type response from the Balena Cloud API."
+            raise BalenaCloudError(
+                msg, {"Content-Type": content_type, "Response": text}
+            )
+
+    async def stream(
+        self,
+        uri: str,
+        *,
+        params: dict[str, Any] | None = None,
+    ) -> AsyncIterator[Any]:
+        """Iterate over the rows of a collection while it is downloaded.
+
+        The `{"d": [...]}` response is parsed incrementally, every row is
+        yielded as soon as it is received, and only that row is held in
+        memory. Streamed requests bypass the middleware chain, so they are
+        not cached, coalesced, batched or retried and custom `middlewares`
+        do not see them, only the `rate_limiter` is applied.
+
+        Args:
+        ----
+            uri: Request URI of the collection, for example, 'device'.
+            params: Query parameters to include in the request.
+
+        Yields:
+        ------
+            The JSON decoded rows of the collection.
+
+        Raises:
+        ------
+            BalenaCloudConnectionError: If a connection error occurs.
+            BalenaCloudError: If the response is not a complete collection.
+
+        """
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(METH_GET)
+        response = await self._open(Request(self, uri, params=params))
+        try:
+            await self._check_content_type(response)
+            parser = RowParser()
+            while True:
+                try:
+                    async with asyncio.timeout(self.request_timeout):
+                        chunk = await response.read_chunk()
+                except TimeoutError as exception:
+                    msg = "Timeout occurred while connecting to the Balena Cloud API."
+                    raise BalenaCloudConnectionError(msg) from exception
+                if not chunk:
+                    break
+                for row in parser.feed(chunk):
+                    yield row
+            parser.close()
+        finally:
+            await response.release()
+
+    def _get_session(self) -> ClientSession:
+        """Get the client session, create one with a tuned connector if needed."""
+        if self.session is None:
+            self.session = ClientSession(connector=self.connector.connector())
+            self._close_session = True
+        return self.session
+
+    def _get_transport(self) -> Transport:
+        """Get the transport, the aiohttp transport of the session by default."""
+        if self.transport is None:
+            self.transport = AiohttpTransport(self._get_session())
+        return self.transport
+
+    async def warmup(self, connections: int = 4) -> None:
+        """Open connections to the Balena Cloud API ahead of a burst.
+
+        The connections stay open in the connection pool, so the following
+        requests do not have to pay for the TCP and TLS handshakes.
+
+        Args:
+        ----
+            connections: The number of connections to open.
+
+        Raises:
+        ------
+            BalenaCloudConnectionError: If a connection error occurs.
+
+        """
+        transport = self._get_transport()
+        url = URL.build(scheme="https", host="api.balena-cloud.com", path="/ping")
+
+        async def ping() -> None:
+            response = await transport.request(METH_GET, url, headers={}, data=None)
+            await response.read()
+
+        try:
+            async with asyncio.timeout(self.request_timeout):
+                await asyncio.gather(*(ping() for _ in range(connections)))
+        except TimeoutError as exception:
             msg = "Error occurred while connecting to the Balena Cloud API."
             raise BalenaCloudConnectionError(msg) from exception
 
-        if method not in {METH_DELETE, METH_PATCH}:
-            content_type = response.headers.get("Content-Type", "")
-            if "application/json" not in content_type:
-                text = await response.text()
-                msg = "Unexpected content type response from the Balena Cloud API."
-                raise BalenaCloudError(
-                    msg, {"Content-Type": content_type, "Response": text}
-                )
+    async def paginate(
+        self,
+        uri: str,
+        *,
+        params: dict[str, Any] | None = None,
+        page_size: int | None = None,
+        query: Query | None = None,
+    ) -> AsyncIterator[Any]:
+        """Iterate over all rows of a collection, one page at a time.
 
-            return await response.json()
-        return None
+        Only a single page is held in memory and the first rows are available
+        before the whole collection has been fetched. When the rows are
+        ordered by ID, the default, the next page is requested with a filter
+        on the last ID (`id gt <last id>`) instead of `$skip`, so no rows are
+        skipped or repeated when rows are added or removed in the meantime.
+        Other orderings are paged with `$skip`. With `stream_pages` enabled,
+        the pages are parsed while they are downloaded, see `stream`.
+
+        Args:
+        ----
+            uri: Request URI of the collection, for example, 'device'.
+            params: Query parameters to include in every page request.
+            page_size: Number of rows per page, defaults to `page_size`.
+            query: Filter, ordering and row limit of the collection (optional).
+
+        Yields:
+        ------
+            The JSON decoded rows of the collection.
+
+        """
+        page_size = page_size or self.page_size
+        params = {"$orderby": "id asc", **(params or {})}
+        limit = None
+        if query is not None:
+            params = query.params(params)
+            limit = query.top
+        keyset = self._paging_params(params)
+        fetched = 0
+        page_params = params
+        while limit is None or fetched < limit:
+            top = page_size if limit is None else min(page_size, limit - fetched)
+            page_params = {**page_params, "$top": top}
+            if keyset is None:
+                page_params["$skip"] = fetched
+            count = 0
+            last: Any = None
+            if self.stream_pages:
+                async for row in self.stream(uri, params=page_params):
+                    count += 1
+                    last = row
+                    yield row
+            else:
+                rows = (await self.request(uri, params=page_params))["d"]
+                count = len(rows)
+                for last in rows:
+                    yield last
+            if count < top:
+                return
+            fetched += count
+            if keyset is not None:
+                after = getattr(Field("id"), keyset)(last["id"])
+                page_params = Query(filter=after).params(params)
+
+    @staticmethod
+    def _paging_params(params: dict[str, Any]) -> str | None:
+        """Prepare the query parameters of the pages of a collection.
+
+        Args:
+        ----
+            params: The query parameters of the collection, which are updated.
+
+        Returns:
+        -------
+            The `Field` method of the filter on the last ID of a page, or None
+            when the pages are requested with `$skip`.
+
+        """
+        orderby = params["$orderby"]
+        keyset = KEYSET_OPERATORS.get(" ".join(orderby.split()))
+        if keyset is None:
+            if orderby.rsplit(",", 1)[-1].split()[:1] != ["id"]:
+                # Rows that are equal in the ordering are ordered by ID, so
+                # their order is the same for every page.
+                params["$orderby"] = f"{orderby},id asc"
+        elif "$select" in params:
+            fields = params["$select"].split(",")
+            if "id" not in fields:
+                params["$select"] = ",".join([*fields, "id"])
+        return keyset
+
+    async def count(
+        self,
+        uri: str,
+        *,
+        params: dict[str, Any] | None = None,
+        query: Query | None = None,
+    ) -> int:
+        """Count the rows of a collection on the server with `$count`.
+
+        Args:
+        ----
+            uri: Request URI of the collection, for example, 'device'.
+            params: Query parameters to include in the request, like `$filter`.
+            query: Filter of the collection, the ordering and row limit are
+                not used (optional).
+
+        Returns:
+        -------
+            The number of rows that match the filter.
+
+        """
+        if query is not None and query.filter is not None:
+            params = Query(filter=query.filter).params(params or {})
+        response = await self.request(f"{uri}/$count", params=params)
+        return int(response["d"])
+
+    def batch(self, max_size: int = 50) -> Batch:
+        """Collect the requests made in a context into `$batch` requests.
+
+        Requests that are started together, for example with `asyncio.gather`,
+        are sent as a single `$batch` request, each call still returns its own
+        result or raises its own error.
+
+        Args:
+        ----
+            max_size: The maximum number of requests in one `$batch` request.
+
+        Returns:
+        -------
+            An async context manager that collects the requests.
+
+        Raises:
+        ------
+            BalenaCloudParameterValidationError: If the max size is below 1.
+
+        """
+        return Batch(client=self, max_size=max_size)
 
     def __post_init__(self) -> None:
         """Post resource client initialization."""
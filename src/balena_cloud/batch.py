@@ -0,0 +1,207 @@
+"""OData `$batch` support for the Balena Cloud API."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any, Self
+
+from aiohttp.hdrs import METH_POST
+from yarl import URL
+
+from .exceptions import (
+    BalenaCloudAuthenticationError,
+    BalenaCloudConflictError,
+    BalenaCloudError,
+    BalenaCloudParameterValidationError,
+    BalenaCloudResponseError,
+)
+
+if TYPE_CHECKING:
+    from .balena_cloud import BalenaCloud
+
+_CURRENT_BATCH: contextvars.ContextVar[Batch | None] = contextvars.ContextVar(
+    "balena_cloud_batch", default=None
+)
+
+
+def current_batch() -> Batch | None:
+    """Return the batch that collects the requests of the current context."""
+    return _CURRENT_BATCH.get()
+
+
+def _fail(requests: list[_BatchRequest], exception: Exception) -> None:
+    """Fail the requests that are not resolved, so no caller waits forever."""
+    for request in requests:
+        if not request.future.done():
+            request.future.set_exception(exception)
+
+
+def _cancel(requests: list[_BatchRequest], _task: asyncio.Task[None]) -> None:
+    """Cancel the requests that are left when their `$batch` request is done."""
+    for request in requests:
+        request.future.cancel()
+
+
+@dataclass
+class _BatchRequest:
+    """A request that is waiting to be sent in a `$batch` request."""
+
+    method: str
+    uri: str
+    params: dict[str, Any] | None
+    data: dict[str, Any] | None
+    future: asyncio.Future[Any]
+
+
+@dataclass
+class Batch:
+    """Collect requests and send them with OData `$batch` requests.
+
+    Requests made inside the context are queued instead of being sent. All
+    requests queued in the same event loop iteration, for example the calls
+    passed to `asyncio.gather`, are combined in a single `$batch` request of
+    at most `max_size` requests. Every call resolves with its own response.
+    """
+
+    client: BalenaCloud
+    max_size: int = 50
+
+    _queue: list[_BatchRequest] = field(default_factory=list)
+    _flushes: set[asyncio.Task[None]] = field(default_factory=set)
+    _flush_scheduled: bool = False
+    _token: contextvars.Token[Batch | None] | None = None
+
+    def __post_init__(self) -> None:
+        """Check the batch size.
+
+        Raises
+        ------
+            BalenaCloudParameterValidationError: If the size is below 1.
+
+        """
+        if self.max_size < 1:
+            msg = "The maximum size of a batch must be at least 1."
+            raise BalenaCloudParameterValidationError(msg)
+
+    async def submit(
+        self,
+        uri: str,
+        *,
+        method: str,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> Any:
+        """Queue a request and wait for its response.
+
+        Args:
+        ----
+            uri: Request URI, without '/api/', for example, 'status'.
+            method: HTTP method to use.
+            params: Query parameters to include in the request.
+            data: Data to include in the request.
+
+        Returns:
+        -------
+            The JSON decoded body of the response of this request.
+
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self._queue.append(_BatchRequest(method, uri, params, data, future))
+        if len(self._queue) >= self.max_size:
+            self.flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self.flush)
+        return await future
+
+    def flush(self) -> None:
+        """Send all queued requests."""
+        self._flush_scheduled = False
+        while self._queue:
+            requests = self._queue[: self.max_size]
+            del self._queue[: self.max_size]
+            # Run in an empty context, so the batch request itself is not queued.
+            task = asyncio.get_running_loop().create_task(
+                self._send(requests), context=contextvars.Context()
+            )
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+            # Also when the task is cancelled before `_send` starts.
+            task.add_done_callback(partial(_cancel, requests))
+
+    async def _send(self, requests: list[_BatchRequest]) -> None:
+        """Send a `$batch` request and resolve the queued requests."""
+        try:
+            await self._resolve(requests)
+        # Any error is forwarded to the callers. On cancellation, or another
+        # BaseException, `_cancel` cancels the requests when the task ends.
+        except Exception as exception:  # noqa: BLE001 # pylint: disable=broad-exception-caught
+            _fail(requests, exception)
+
+    async def _resolve(self, requests: list[_BatchRequest]) -> None:
+        """Send a `$batch` request and resolve the requests with its responses."""
+        body = {
+            "requests": [
+                {
+                    "id": str(index),
+                    "method": request.method,
+                    "url": str(
+                        URL.build(path=f"/v7/{request.uri}", query=request.params)
+                    ),
+                    "headers": {"Content-Type": "application/json"},
+                    **({"body": request.data} if request.data is not None else {}),
+                }
+                for index, request in enumerate(requests)
+            ]
+        }
+        response = await self.client.request("$batch", method=METH_POST, data=body)
+        responses = {item["id"]: item for item in response.get("responses", [])}
+        for index, request in enumerate(requests):
+            if request.future.done():
+                continue
+            item = responses.get(str(index))
+            if item is None:
+                msg = "No response for the request in the Balena Cloud API batch."
+                request.future.set_exception(BalenaCloudError(msg))
+                continue
+            status, result = item["status"], item.get("body")
+            if status == 401:
+                msg = "The request to the Balena Cloud API was unauthorized."
+                request.future.set_exception(BalenaCloudAuthenticationError(msg))
+            elif status == 409:
+                request.future.set_exception(BalenaCloudConflictError(result, status))
+            elif status >= 400:
+                msg = "Error occurred while connecting to the Balena Cloud API."
+                request.future.set_exception(BalenaCloudResponseError(msg, status))
+            else:
+                request.future.set_result(result)
+
+    async def __aenter__(self) -> Self:
+        """Async enter.
+
+        Returns
+        -------
+            The batch object.
+
+        """
+        self._token = _CURRENT_BATCH.set(self)
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Async exit, sends the remaining requests.
+
+        Args:
+        ----
+            _exc_info: Exec type.
+
+        """
+        if self._token is not None:
+            _CURRENT_BATCH.reset(self._token)
+            self._token = None
+        self.flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
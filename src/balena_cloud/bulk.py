@@ -0,0 +1,72 @@
+"""Bulk operations for the Balena Cloud API."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import BalenaCloudError, BalenaCloudParameterValidationError
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+
+@dataclass
+class BulkResult:
+    """Class to represent the outcome of a single item in a bulk operation."""
+
+    item: Any
+    result: Any = None
+    error: BalenaCloudError | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the item was processed without an error."""
+        return self.error is None
+
+
+async def run_bulk(
+    items: Iterable[tuple[Any, ...]],
+    call: Callable[..., Awaitable[Any]],
+    *,
+    concurrency: int,
+) -> list[BulkResult]:
+    """Call a coroutine function for every item with bounded parallelism.
+
+    Every item is unpacked as the positional arguments of `call`. At most
+    `concurrency` calls are in flight at the same time, and an API error
+    of one item is recorded in its result and does not stop the others.
+    Other errors, for example, of a malformed item, are raised.
+
+    Args:
+    ----
+        items: The argument tuples to call the function with.
+        call: The coroutine function to call.
+        concurrency: The maximum number of concurrent calls.
+
+    Returns:
+    -------
+        A result for every item, in the order of the items.
+
+    Raises:
+    ------
+        BalenaCloudParameterValidationError: If the concurrency is below 1.
+
+    """
+    if concurrency < 1:
+        msg = "The concurrency of a bulk operation must be at least 1."
+        raise BalenaCloudParameterValidationError(msg)
+    items = list(items)
+    results: list[BulkResult] = [BulkResult(item=item) for item in items]
+    pending = iter(results)
+
+    async def worker() -> None:
+        for result in pending:
+            try:
+                result.result = await call(*result.item)
+            except BalenaCloudError as exception:
+                result.error = exception
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(items)))))
+    return results
@@ -0,0 +1,341 @@
+"""Response cache for the Balena Cloud API."""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from aiohttp.hdrs import (
+    ETAG,
+    IF_MODIFIED_SINCE,
+    IF_NONE_MATCH,
+    LAST_MODIFIED,
+    METH_GET,
+)
+
+from .exceptions import BalenaCloudNotModifiedError
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .middleware import Handler, Request
+
+
+def resource_name(uri: str) -> str:
+    """Get the resource name of a request URI.
+
+    Args:
+    ----
+        uri: Request URI, for example, "device(uuid='1234')".
+
+    Returns:
+    -------
+        The name of the resource, for example, 'device'.
+
+    """
+    return uri.split("(", 1)[0].split("/", 1)[0]
+
+
+# Identifiers in an `$expand` or `$filter` value, for example, 'device_tag'.
+IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+
+
+def referenced_resources(uri: str, params: dict[str, Any] | None) -> frozenset[str]:
+    """Get the resources of which a response of a request may contain data.
+
+    These are the resource of the URI and every name in its `$expand` and
+    `$filter` parameters. A navigation property counts as the resource it
+    points to as well, 'belongs_to__application' also as 'application'.
+    Field names and literals are included too, which only evicts more.
+
+    Args:
+    ----
+        uri: Request URI, for example, "device(1)".
+        params: Query parameters of the request.
+
+    Returns:
+    -------
+        The names of the referenced resources.
+
+    """
+    resources = {resource_name(uri)}
+    for key in ("$expand", "$filter"):
+        for name in IDENTIFIER.findall(str((params or {}).get(key, ""))):
+            resources.add(name)
+            resources.add(name.rsplit("__", 1)[-1])
+    return frozenset(resources)
+
+
+def cache_key(uri: str, params: dict[str, Any] | None) -> tuple[str, ...]:
+    """Get the cache key of a request.
+
+    Args:
+    ----
+        uri: Request URI, without '/api/', for example, 'status'.
+        params: Query parameters of the request.
+
+    Returns:
+    -------
+        A hashable key for the request.
+
+    """
+    if not params:
+        return (uri,)
+    return (uri, *(f"{key}={value}" for key, value in sorted(params.items())))
+
+
+@dataclass
+class ResponseCache:
+    """Cache the responses of read-only requests.
+
+    Responses are kept for the TTL of their resource and the least recently
+    used response is evicted when the cache is full. A change (POST, PATCH
+    or DELETE) of a resource evicts all cached responses of that resource,
+    including those that expand or filter on it.
+    Subclass it to store the responses elsewhere.
+    """
+
+    ttl: float = 60.0
+    ttls: dict[str, float] = field(default_factory=dict)
+    max_entries: int = 1024
+
+    hits: int = 0
+    misses: int = 0
+
+    _entries: OrderedDict[tuple[str, ...], tuple[float, frozenset[str], Any]] = field(
+        default_factory=OrderedDict
+    )
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._entries)
+
+    async def __call__(self, request: Request, call_next: Handler) -> Any:
+        """Serve a GET request from the cache, or cache its response."""
+        if request.method != METH_GET:
+            self.invalidate(request.uri)
+            return await call_next(request)
+        if (cached := self.get(request.uri, request.params)) is not None:
+            return cached
+        response = await call_next(request)
+        self.set(request.uri, request.params, response)
+        return response
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the ratio of lookups that were served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, uri: str, params: dict[str, Any] | None = None) -> Any | None:
+        """Get a cached response.
+
+        Args:
+        ----
+            uri: Request URI, without '/api/', for example, 'status'.
+            params: Query parameters of the request.
+
+        Returns:
+        -------
+            The cached response, or None when it is not cached or expired.
+
+        """
+        key = cache_key(uri, params)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def set(self, uri: str, params: dict[str, Any] | None, response: Any) -> None:
+        """Cache a response.
+
+        Args:
+        ----
+            uri: Request URI, without '/api/', for example, 'status'.
+            params: Query parameters of the request.
+            response: The JSON decoded response.
+
+        """
+        resource = resource_name(uri)
+        ttl = self.ttls.get(resource, self.ttl)
+        if ttl <= 0:
+            return
+        key = cache_key(uri, params)
+        self._entries[key] = (
+            time.monotonic() + ttl,
+            referenced_resources(uri, params),
+            response,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, uri: str) -> None:
+        """Evict all cached responses that reference the resource of a URI.
+
+        Args:
+        ----
+            uri: Request URI of the changed resource, for example, 'device(1)'.
+
+        """
+        resource = resource_name(uri)
+        for key in [
+            key for key, entry in self._entries.items() if resource in entry[1]
+        ]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Evict all cached responses and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+@dataclass(slots=True)
+class Validators:
+    """Class to represent the validators and the payload of a response."""
+
+    resource: str
+    response: Any
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Return the headers of a conditional request for the response."""
+        headers = {}
+        if self.etag is not None:
+            headers[IF_NONE_MATCH] = self.etag
+        if self.last_modified is not None:
+            headers[IF_MODIFIED_SINCE] = self.last_modified
+        return headers
+
+
+@dataclass
+class RevalidatingCache:
+    """Revalidate the responses of read-only requests with the API.
+
+    The `ETag` and `Last-Modified` headers of a response are kept with its
+    JSON decoded payload. The next request for the same URL sends them as
+    `If-None-Match` and `If-Modified-Since`, and when the API answers with
+    304 Not Modified the stored payload is returned, without transferring
+    or parsing the body again. Unlike `ResponseCache`, every request still
+    reaches the API, so the responses are never stale. Batched requests are
+    sent without conditions.
+    """
+
+    max_entries: int = 256
+
+    hits: int = 0
+    misses: int = 0
+
+    _entries: OrderedDict[tuple[str, ...], Validators] = field(
+        default_factory=OrderedDict
+    )
+
+    def __len__(self) -> int:
+        """Return the number of stored responses."""
+        return len(self._entries)
+
+    async def __call__(self, request: Request, call_next: Handler) -> Any:
+        """Send a GET request with the validators of its last response.
+
+        A change of a resource evicts all stored responses of that resource.
+        """
+        if request.method != METH_GET:
+            self.invalidate(request.uri)
+            return await call_next(request)
+        validators = self.get(request.uri, request.params)
+        if validators is not None:
+            request.headers = {**(request.headers or {}), **validators.headers}
+        try:
+            response = await call_next(request)
+        except BalenaCloudNotModifiedError:
+            if validators is None:
+                raise
+            # Not Modified, the payload of the previous response is still valid.
+            self.hits += 1
+            return validators.response
+        self.misses += 1
+        if request.response_headers is not None:
+            self.set(request.uri, request.params, request.response_headers, response)
+        return response
+
+    def get(self, uri: str, params: dict[str, Any] | None = None) -> Validators | None:
+        """Get the validators of a request.
+
+        Args:
+        ----
+            uri: Request URI, without '/api/', for example, 'status'.
+            params: Query parameters of the request.
+
+        Returns:
+        -------
+            The validators and payload of the last response, if any.
+
+        """
+        key = cache_key(uri, params)
+        validators = self._entries.get(key)
+        if validators is not None:
+            self._entries.move_to_end(key)
+        return validators
+
+    def set(
+        self,
+        uri: str,
+        params: dict[str, Any] | None,
+        headers: Mapping[str, str],
+        response: Any,
+    ) -> None:
+        """Store the validators of a response, if it has any.
+
+        Args:
+        ----
+            uri: Request URI, without '/api/', for example, 'status'.
+            params: Query parameters of the request.
+            headers: Headers of the response.
+            response: The JSON decoded response.
+
+        """
+        key = cache_key(uri, params)
+        etag = headers.get(ETAG)
+        last_modified = headers.get(LAST_MODIFIED)
+        if etag is None and last_modified is None:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = Validators(
+            resource_name(uri), response, etag, last_modified
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, uri: str) -> None:
+        """Evict all stored responses of the resource of a request URI.
+
+        Args:
+        ----
+            uri: Request URI of the changed resource, for example, 'device(1)'.
+
+        """
+        resource = resource_name(uri)
+        for key in [
+            key
+            for key, validators in self._entries.items()
+            if validators.resource == resource
+        ]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Evict all stored responses and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,107 @@
+"""Decoding of Balena Cloud API rows into models."""
+
+from __future__ import annotations
+
+from dataclasses import MISSING
+from dataclasses import fields as dataclass_fields
+from functools import cache
+from typing import TYPE_CHECKING, Any, Literal, TypeVar, overload
+
+from mashumaro import DataClassDictMixin
+
+from .exceptions import BalenaCloudParameterValidationError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+ModelT = TypeVar("ModelT", bound=DataClassDictMixin)
+
+
+def _raw(row: dict[str, Any]) -> dict[str, Any]:
+    return row
+
+
+@cache
+def required_fields(model: type[DataClassDictMixin]) -> tuple[str, ...]:
+    """Get the API field names a model can not be created without.
+
+    Args:
+    ----
+        model: The model class.
+
+    Returns:
+    -------
+        A tuple with the API field names of the fields without a default.
+
+    """
+    return tuple(
+        field.metadata.get("alias", field.name)
+        for field in dataclass_fields(model)  # ty:ignore[invalid-argument-type]
+        if field.default is MISSING and field.default_factory is MISSING
+    )
+
+
+@cache
+def _decoder(
+    model: type[ModelT],
+    fields: tuple[str, ...] | None,
+) -> Callable[[dict[str, Any]], ModelT]:
+    if fields is not None and (
+        missing := [name for name in required_fields(model) if name not in fields]
+    ):
+        msg = (
+            f"The selected fields miss the {model.__name__} fields "
+            f"{', '.join(missing)}, select them or use raw=True."
+        )
+        raise BalenaCloudParameterValidationError(msg)
+    return model.from_dict
+
+
+@overload
+def decoder(
+    model: type[ModelT],
+    fields: Sequence[str] | None = None,
+    *,
+    raw: Literal[False] = False,
+) -> Callable[[dict[str, Any]], ModelT]: ...
+
+
+@overload
+def decoder(
+    model: type[ModelT],
+    fields: Sequence[str] | None = None,
+    *,
+    raw: bool,
+) -> Callable[[dict[str, Any]], ModelT | dict[str, Any]]: ...
+
+
+def decoder(
+    model: type[ModelT],
+    fields: Sequence[str] | None = None,
+    *,
+    raw: bool = False,
+) -> Callable[[dict[str, Any]], ModelT | dict[str, Any]]:
+    """Get the function that decodes the rows of a request.
+
+    The decoder is looked up once per model and field projection, and a
+    projection that misses fields the model needs is rejected before any
+    request is sent, instead of failing on every row.
+
+    Args:
+    ----
+        model: The model class the rows are converted to.
+        fields: Field names selected instead of the model fields (optional).
+        raw: Keep the JSON decoded rows instead of creating models.
+
+    Returns:
+    -------
+        A function that converts a JSON decoded row.
+
+    Raises:
+    ------
+        BalenaCloudParameterValidationError: If the fields miss model fields.
+
+    """
+    if raw:
+        return _raw
+    return _decoder(model, None if fields is None else tuple(fields))
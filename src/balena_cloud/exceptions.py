@@ -27,3 +27,25 @@ class BalenaCloudParameterValidationError(BalenaCloudError):
 
 class BalenaCloudResourceNotFoundError(BalenaCloudError):
     """Exception raised when a resource is not found."""
+
+
+class BalenaCloudResponseError(BalenaCloudConnectionError):
+    """Exception raised when the API responds with an error status."""
+
+    def __init__(
+        self,
+        message: str,
+        status: int,
+        retry_after: float | None = None,
+    ) -> None:
+        """Initialize the exception."""
+        super().__init__(f"{message} (code: {status})")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class BalenaCloudNotModifiedError(BalenaCloudResponseError):
+    """Exception raised when a conditional request was not modified.
+
+    It is handled by `RevalidatingCache`, which adds the conditions.
+    """
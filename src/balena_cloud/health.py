@@ -0,0 +1,26 @@
+"""Health summary of the devices of fleets."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .odata import Field
+
+# Filters of the device counts of a health summary, besides the total.
+ONLINE = Field("is_online").eq(True)  # noqa: FBT003
+UPDATING = Field("overall_status").eq("updating")
+
+
+@dataclass(slots=True)
+class FleetHealth:
+    """Class to represent the device counts of a fleet."""
+
+    fleet_id: int
+    total: int
+    online: int
+    updating: int
+
+    @property
+    def offline(self) -> int:
+        """Return the number of devices that are offline."""
+        return self.total - self.online
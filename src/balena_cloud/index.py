@@ -0,0 +1,227 @@
+"""Hash indexes on the devices of a fleet."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from .models import Device
+
+
+def _add(index: dict[Any, set[int]], key: Any, device_id: int) -> None:
+    index.setdefault(key, set()).add(device_id)
+
+
+def _discard(index: dict[Any, set[int]], key: Any, device_id: int) -> None:
+    ids = index.get(key)
+    if ids is not None:
+        ids.discard(device_id)
+        if not ids:
+            del index[key]
+
+
+def _tag_keys(device: Device) -> Iterator[str | tuple[str, str]]:
+    """Yield the tag keys and (key, value) pairs a device is indexed on."""
+    for tag in device.tags or ():
+        yield tag.key
+        yield tag.key, tag.value
+
+
+@dataclass(slots=True)
+class DeviceIndex:
+    """Devices with hash indexes for constant-time lookups.
+
+    Devices are indexed on their ID, UUID, name, status, online state and,
+    when the tags are included, on their tag keys and values. Lookups that
+    can match several devices return the devices in no particular order.
+    Adding a device with an ID that is already indexed replaces it.
+    """
+
+    _devices: dict[int, Device] = field(default_factory=dict)
+    _by_uuid: dict[str, int] = field(default_factory=dict)
+    _by_name: dict[str, set[int]] = field(default_factory=dict)
+    _by_status: dict[str, set[int]] = field(default_factory=dict)
+    _by_tag: dict[str | tuple[str, str], set[int]] = field(default_factory=dict)
+    _online: set[int] = field(default_factory=set)
+    _offline: set[int] = field(default_factory=set)
+
+    @classmethod
+    def from_devices(cls, devices: Iterable[Device]) -> DeviceIndex:
+        """Create an index of devices.
+
+        Args:
+        ----
+            devices: The devices, for example, from `FleetResource.get_devices`.
+
+        Returns:
+        -------
+            A device index.
+
+        """
+        index = cls()
+        for device in devices:
+            index.add(device)
+        return index
+
+    def add(self, device: Device) -> None:
+        """Add a device to the index, or replace the device with the same ID.
+
+        Args:
+        ----
+            device: The device.
+
+        """
+        self.remove(device.id)
+        device_id = device.id
+        self._devices[device_id] = device
+        self._by_uuid[device.uuid] = device_id
+        _add(self._by_name, device.name, device_id)
+        _add(self._by_status, device.status, device_id)
+        for key in _tag_keys(device):
+            _add(self._by_tag, key, device_id)
+        (self._online if device.is_online else self._offline).add(device_id)
+
+    def remove(self, device_id: int) -> Device | None:
+        """Remove a device from the index.
+
+        Args:
+        ----
+            device_id: The device ID.
+
+        Returns:
+        -------
+            The removed device, or None if it was not in the index.
+
+        """
+        device = self._devices.pop(device_id, None)
+        if device is None:
+            return None
+        del self._by_uuid[device.uuid]
+        _discard(self._by_name, device.name, device_id)
+        _discard(self._by_status, device.status, device_id)
+        for key in _tag_keys(device):
+            _discard(self._by_tag, key, device_id)
+        self._online.discard(device_id)
+        self._offline.discard(device_id)
+        return device
+
+    def __len__(self) -> int:
+        """Return the number of devices."""
+        return len(self._devices)
+
+    def __contains__(self, device_id: object) -> bool:
+        """Return whether a device ID is in the index."""
+        return device_id in self._devices
+
+    def __iter__(self) -> Iterator[Device]:
+        """Iterate over the devices."""
+        return iter(self._devices.values())
+
+    def _select(self, ids: Iterable[int]) -> list[Device]:
+        return [self._devices[device_id] for device_id in ids]
+
+    def get(self, device_id: int) -> Device | None:
+        """Get a device by its ID.
+
+        Args:
+        ----
+            device_id: The device ID.
+
+        Returns:
+        -------
+            The device, or None if it is not in the index.
+
+        """
+        return self._devices.get(device_id)
+
+    def get_by_uuid(self, device_uuid: str) -> Device | None:
+        """Get a device by its UUID.
+
+        Args:
+        ----
+            device_uuid: The device UUID.
+
+        Returns:
+        -------
+            The device, or None if it is not in the index.
+
+        """
+        device_id = self._by_uuid.get(device_uuid)
+        return None if device_id is None else self._devices[device_id]
+
+    def with_name(self, name: str) -> list[Device]:
+        """Get the devices with a name.
+
+        Args:
+        ----
+            name: The device name.
+
+        Returns:
+        -------
+            The devices with the name.
+
+        """
+        return self._select(self._by_name.get(name, ()))
+
+    def with_status(self, status: str) -> list[Device]:
+        """Get the devices with a status.
+
+        Args:
+        ----
+            status: The device status, for example, 'Idle'.
+
+        Returns:
+        -------
+            The devices with the status.
+
+        """
+        return self._select(self._by_status.get(status, ()))
+
+    def with_tag(self, key: str, value: str | None = None) -> list[Device]:
+        """Get the devices with a tag.
+
+        Args:
+        ----
+            key: The tag key.
+            value: The tag value, any value matches when omitted (optional).
+
+        Returns:
+        -------
+            The devices with the tag.
+
+        """
+        tag = key if value is None else (key, value)
+        return self._select(self._by_tag.get(tag, ()))
+
+    def online(self) -> list[Device]:
+        """Get the devices that are online.
+
+        Returns
+        -------
+            The online devices.
+
+        """
+        return self._select(self._online)
+
+    def offline(self) -> list[Device]:
+        """Get the devices that are offline.
+
+        Returns
+        -------
+            The offline devices.
+
+        """
+        return self._select(self._offline)
+
+    def count_by_status(self) -> dict[str, int]:
+        """Count the devices per status.
+
+        Returns
+        -------
+            The number of devices for every status.
+
+        """
+        return {status: len(ids) for status, ids in self._by_status.items()}
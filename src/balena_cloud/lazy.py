@@ -0,0 +1,64 @@
+"""Lazily parsed datetime fields for the Balena Cloud models."""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, TypeVar
+
+from mashumaro.helper import pass_through
+
+ModelT = TypeVar("ModelT", bound=type)
+
+# Field metadata of a datetime field that is parsed when it is first read,
+# mashumaro keeps the string of the API on deserialization.
+LAZY_DATETIME: dict[str, Any] = {"deserialize": pass_through, "lazy": True}
+
+
+def lazy_datetime_property(slot: Any) -> property:
+    """Create a descriptor that parses an ISO 8601 string on the first access.
+
+    The property wraps the slot of a dataclass field. The model keeps the
+    string of the API, the first time the field is read it is replaced by
+    the parsed `datetime`, which is returned from then on. Setting the field
+    goes straight to the slot, so creating a model costs nothing extra.
+
+    Args:
+    ----
+        slot: The member descriptor of the slot of the field.
+
+    Returns:
+    -------
+        A property to replace the member descriptor on the model class.
+
+    """
+
+    # The property replaces the slot on the class, only its descriptor reaches it.
+    # pylint: disable=unnecessary-dunder-call
+    def get(instance: object) -> datetime:
+        value = slot.__get__(instance)
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+            slot.__set__(instance, value)
+        return value
+
+    return property(get, slot.__set__)
+
+
+def lazy_datetimes(model: ModelT) -> ModelT:
+    """Install the descriptors for the `LAZY_DATETIME` fields of a model.
+
+    Args:
+    ----
+        model: The slotted dataclass, decorated after `dataclass`.
+
+    Returns:
+    -------
+        The model class.
+
+    """
+    for model_field in fields(model):  # ty:ignore[invalid-argument-type]
+        if model_field.metadata.get("lazy"):
+            slot = model.__dict__[model_field.name]
+            setattr(model, model_field.name, lazy_datetime_property(slot))
+    return model
@@ -0,0 +1,121 @@
+"""Lookups of many resources by their ID or another unique field."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Generic
+from urllib.parse import quote
+
+from .decoding import ModelT, decoder
+from .odata import Field, literal, select
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+# Maximum length of the URL encoded values of a `$filter` of one request,
+# which keeps the URL well below the limits of servers and proxies.
+MAX_FILTER_LENGTH = 4096
+
+
+@dataclass(slots=True)
+class LookupResult(Generic[ModelT]):
+    """Class to represent the outcome of a lookup of many resources."""
+
+    items: list[ModelT] = field(default_factory=list)
+    missing: list[Any] = field(default_factory=list)
+
+
+def chunk_values(
+    values: Iterable[Any],
+    max_length: int = MAX_FILTER_LENGTH,
+) -> list[list[Any]]:
+    """Split values into chunks that fit in the `$filter` of one request.
+
+    Args:
+    ----
+        values: The values to look up.
+        max_length: Maximum URL encoded length of the values of a chunk.
+
+    Returns:
+    -------
+        The chunks of values, in the order of the values.
+
+    """
+    chunks: list[list[Any]] = []
+    chunk: list[Any] = []
+    length = 0
+    for value in values:
+        # The URL encoded value and the separator ('%2C').
+        size = len(quote(literal(value), safe="")) + 3
+        if chunk and length + size > max_length:
+            chunks.append(chunk)
+            chunk, length = [], 0
+        chunk.append(value)
+        length += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+@dataclass(slots=True)
+class Lookup(Generic[ModelT]):
+    """Look up many resources of a model by their ID or another unique field.
+
+    The values are split into chunks that fit in the URL of a request, the
+    chunks are requested concurrently with `$filter=key in (...)`.
+    """
+
+    parent: Any
+    resource: str
+    model: type[ModelT]
+    key: str = "id"
+    max_length: int = MAX_FILTER_LENGTH
+
+    async def get_many(
+        self,
+        values: Iterable[Any],
+        fields: Sequence[str] | None = None,
+    ) -> LookupResult[ModelT]:
+        """Get the resources of the values.
+
+        Args:
+        ----
+            values: The values of the key field to look up.
+            fields: Fields to select instead of the model fields (optional).
+
+        Returns:
+        -------
+            The resources in the order of the values, and the values that
+            were not found.
+
+        """
+        values = list(values)
+        key = self.key
+        if fields is not None and key not in fields:
+            fields = [*fields, key]
+        decode = decoder(self.model, fields)
+        params = {"$select": select(self.model, fields)}
+
+        async def fetch(chunk: list[Any]) -> list[dict[str, Any]]:
+            return [
+                item
+                async for item in self.parent.paginate(
+                    self.resource,
+                    params={**params, "$filter": str(Field(key).in_(chunk))},
+                )
+            ]
+
+        rows: dict[Any, dict[str, Any]] = {}
+        for chunk in await asyncio.gather(
+            *map(fetch, chunk_values(dict.fromkeys(values), self.max_length))
+        ):
+            rows.update((row[key], row) for row in chunk)
+
+        result: LookupResult[ModelT] = LookupResult()
+        for value in values:
+            if (row := rows.get(value)) is None:
+                result.missing.append(value)
+            else:
+                result.items.append(decode(row))
+        return result
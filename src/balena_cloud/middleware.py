@@ -0,0 +1,136 @@
+"""Middleware chain of the requests to the Balena Cloud API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from aiohttp.hdrs import METH_GET
+
+from .batch import current_batch
+from .cache import cache_key
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+
+@dataclass(slots=True)
+class Request:
+    """Class to represent a request that is passed along the middlewares.
+
+    Middlewares can add `headers` to the request, the client sets the
+    `response_headers` once the response is received.
+    """
+
+    client: Any
+    uri: str
+    method: str = METH_GET
+    params: dict[str, Any] | None = None
+    data: dict[str, Any] | None = None
+    headers: dict[str, str] | None = None
+    response_headers: Mapping[str, str] | None = None
+
+
+# Sends a request, or passes it to the next middleware, and returns the result.
+Handler = Callable[[Request], Awaitable[Any]]
+# Receives a request and the next handler of the chain.
+Middleware = Callable[[Request, Handler], Awaitable[Any]]
+
+
+def _link(middleware: Middleware, call_next: Handler) -> Handler:
+    async def handler(request: Request) -> Any:
+        return await middleware(request, call_next)
+
+    return handler
+
+
+def build_chain(middlewares: Iterable[Middleware], handler: Handler) -> Handler:
+    """Wrap a request handler in middlewares.
+
+    A middleware is an async callable that receives the request and the next
+    handler of the chain. It can change the request, return a response
+    without calling the next handler, or handle the result or the error of
+    the next handler.
+
+    Args:
+    ----
+        middlewares: The middlewares, the first one runs first (outermost).
+        handler: The handler that sends the request.
+
+    Returns:
+    -------
+        A handler that runs a request through all middlewares.
+
+    """
+    for middleware in reversed(list(middlewares)):
+        handler = _link(middleware, handler)
+    return handler
+
+
+async def batching(request: Request, call_next: Handler) -> Any:
+    """Queue the request in the batch of the current context, if any.
+
+    See `BalenaCloud.batch`.
+    """
+    batch = current_batch()
+    if batch is not None and batch.client is request.client:
+        return await batch.submit(
+            request.uri,
+            method=request.method,
+            params=request.params,
+            data=request.data,
+        )
+    return await call_next(request)
+
+
+@dataclass
+class Coalescer:
+    """Share a single GET request between identical concurrent requests.
+
+    The first caller sends the request itself, callers that make the same
+    request while it is in flight wait for its result. No task is created
+    for this, so a request without followers costs next to nothing. All
+    callers receive the same decoded objects, so like the rows of
+    `raw=True` calls, they should not be changed in place. When the first
+    caller is cancelled, a waiting caller sends the request again.
+    """
+
+    _in_flight: dict[tuple[str, ...], asyncio.Future[Any]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        """Return the number of shared requests that are in flight."""
+        return len(self._in_flight)
+
+    async def __call__(self, request: Request, call_next: Handler) -> Any:
+        """Join an identical GET request that is in flight, or send it."""
+        if request.method != METH_GET:
+            return await call_next(request)
+        key = cache_key(request.uri, request.params)
+        while (shared := self._in_flight.get(key)) is not None:
+            try:
+                # Shielded, so a cancelled caller does not cancel the others.
+                return await asyncio.shield(shared)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not shared.cancelled() or (task is not None and task.cancelling()):
+                    raise
+
+        shared = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = shared
+        try:
+            result = await call_next(request)
+        except asyncio.CancelledError:
+            shared.cancel()
+            raise
+        except BaseException as exception:
+            shared.set_exception(exception)
+            # Mark the exception as retrieved, there may be no other callers.
+            shared.exception()
+            raise
+        else:
+            shared.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
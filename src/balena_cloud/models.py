@@ -4,11 +4,25 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime  # noqa: TC003
+from typing import Any
 
 from mashumaro import DataClassDictMixin, field_options
+from mashumaro.config import TO_DICT_ADD_BY_ALIAS_FLAG, BaseConfig
 
+from .lazy import LAZY_DATETIME, lazy_datetimes
 
-@dataclass
+# Config of the models that can be converted back to API rows. It adds the
+# `by_alias` option to `to_dict`, so `from_dict` can read the result again,
+# for example, when a model is stored.
+AliasConfig = type(
+    "AliasConfig",
+    (BaseConfig,),
+    {"code_generation_options": [TO_DICT_ADD_BY_ALIAS_FLAG]},
+)
+
+
+@lazy_datetimes
+@dataclass(slots=True)
 class Organization(DataClassDictMixin):
     """Class to represent an organization in Balena Cloud."""
 
@@ -17,13 +31,14 @@ class Organization(DataClassDictMixin):
     handle: str
     company_name: str
     website: str
-    created_at: datetime
+    created_at: datetime = field(metadata=LAZY_DATETIME)
 
     # Boolean fields
     is_frozen: bool
 
 
-@dataclass
+@lazy_datetimes
+@dataclass(slots=True)
 class Fleet(DataClassDictMixin):
     """Class to represent a fleet in Balena Cloud."""
 
@@ -31,7 +46,7 @@ class Fleet(DataClassDictMixin):
     name: str = field(metadata=field_options(alias="app_name"))
     slug: str
     uuid: str
-    created_at: datetime
+    created_at: datetime = field(metadata=LAZY_DATETIME)
 
     # Boolean fields
     is_public: bool
@@ -40,7 +55,8 @@ class Fleet(DataClassDictMixin):
     is_discoverable: bool
 
 
-@dataclass
+@lazy_datetimes
+@dataclass(slots=True)
 class Release(DataClassDictMixin):
     """Class to represent a release in Balena Cloud."""
 
@@ -49,7 +65,7 @@ class Release(DataClassDictMixin):
     semver: str
     semver_prerelease: str
     revision: int | str
-    created_at: datetime
+    created_at: datetime = field(metadata=LAZY_DATETIME)
 
     # Boolean fields
     is_final: bool
@@ -57,28 +73,90 @@ class Release(DataClassDictMixin):
     is_passing_tests: bool
 
 
-@dataclass
+@lazy_datetimes
+@dataclass(slots=True)
 class Service(DataClassDictMixin):
     """Class to represent a service in Balena Cloud."""
 
     id: int
     name: str = field(metadata=field_options(alias="service_name"))
-    created_at: datetime
+    created_at: datetime = field(metadata=LAZY_DATETIME)
 
 
-@dataclass
-class ServiceInstall(DataClassDictMixin):
-    """Class to represent a service install in Balena Cloud."""
+@lazy_datetimes
+@dataclass(slots=True)
+class EnvironmentVariable(DataClassDictMixin):
+    """Class to represent an device environment variable in Balena Cloud."""
+
+    Config = AliasConfig
+
+    id: int
+    name: str
+    value: str
+    created_at: datetime = field(metadata=LAZY_DATETIME)
+
+
+@dataclass(slots=True)
+class Tag(DataClassDictMixin):
+    """Class to represent a device tag in Balena Cloud."""
+
+    Config = AliasConfig
 
     id: int
-    created_at: datetime
-    service_name: str | None = None
+    key: str = field(metadata=field_options(alias="tag_key"))
+    value: str
+
+
+def _service_name(service: Any) -> str | None:
+    """Get the service name of an expanded `installs__service`.
+
+    Args:
+    ----
+        service: The expanded service, nested expands return it as a list.
+            The service name itself is read as is, as written by `to_dict`
+            with `by_alias`.
+
+    Returns:
+    -------
+        The name of the service, if any.
 
+    """
+    if isinstance(service, list):
+        service = service[0] if service else None
+    if isinstance(service, dict):
+        return service.get("service_name")
+    return service
 
-@dataclass
+
+@lazy_datetimes
+@dataclass(slots=True)
+class ServiceInstall(DataClassDictMixin):
+    """Class to represent a service install in Balena Cloud."""
+
+    Config = AliasConfig
+
+    id: int
+    created_at: datetime = field(metadata=LAZY_DATETIME)
+    # Read from the expanded service, the row itself is not copied.
+    service_name: str | None = field(
+        default=None,
+        metadata={
+            **field_options(alias="installs__service", deserialize=_service_name),
+            "select": False,
+        },
+    )
+    service_variables: list[EnvironmentVariable] | None = field(
+        default=None,
+        metadata={"alias": "device_service_environment_variable", "select": False},
+    )
+
+
+@dataclass(slots=True)
 class Device(DataClassDictMixin):
     """Class to represent a device in Balena Cloud."""
 
+    Config = AliasConfig
+
     id: int
     name: str = field(metadata=field_options(alias="device_name"))
     status: str
@@ -92,21 +170,14 @@ class Device(DataClassDictMixin):
     latitude: float
     longitude: float
 
-
-@dataclass
-class EnvironmentVariable(DataClassDictMixin):
-    """Class to represent an device environment variable in Balena Cloud."""
-
-    id: int
-    name: str
-    value: str
-    created_at: datetime
-
-
-@dataclass
-class Tag(DataClassDictMixin):
-    """Class to represent a device tag in Balena Cloud."""
-
-    id: int
-    key: str = field(metadata=field_options(alias="tag_key"))
-    value: str
+    # Related collections, only filled in when included in the request
+    tags: list[Tag] | None = field(
+        default=None, metadata={"alias": "device_tag", "select": False}
+    )
+    environment_variables: list[EnvironmentVariable] | None = field(
+        default=None,
+        metadata={"alias": "device_environment_variable", "select": False},
+    )
+    service_installs: list[ServiceInstall] | None = field(
+        default=None, metadata={"alias": "service_install", "select": False}
+    )
@@ -0,0 +1,299 @@
+"""OData query helpers for the Balena Cloud API."""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import fields as dataclass_fields
+from datetime import datetime
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import BalenaCloudParameterValidationError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from mashumaro import DataClassDictMixin
+
+
+@cache
+def model_fields(model: type[DataClassDictMixin]) -> tuple[str, ...]:
+    """Get the API field names that are used by a model.
+
+    Fields are named by their alias when one is set, fields marked with
+    `select=False` in their metadata are not part of the API resource.
+
+    Args:
+    ----
+        model: The model class.
+
+    Returns:
+    -------
+        A tuple with the API field names of the model.
+
+    """
+    return tuple(
+        field.metadata.get("alias", field.name)
+        for field in dataclass_fields(model)  # ty:ignore[invalid-argument-type]
+        if field.metadata.get("select", True)
+    )
+
+
+def select(
+    model: type[DataClassDictMixin],
+    fields: Iterable[str] | None = None,
+) -> str:
+    """Build a `$select` query value for a model.
+
+    Args:
+    ----
+        model: The model class the response is converted to.
+        fields: Field names to select instead of the model fields (optional).
+
+    Returns:
+    -------
+        A comma separated list of field names.
+
+    """
+    return ",".join(model_fields(model) if fields is None else fields)
+
+
+def expand(name: str, model: type[DataClassDictMixin], *expands: str) -> str:
+    """Build an `$expand` query value for a related collection of a model.
+
+    Args:
+    ----
+        name: The navigation property of the related collection.
+        model: The model class the related rows are converted to.
+        expands: `$expand` values nested in the related collection (optional).
+
+    Returns:
+    -------
+        The navigation property with the `$select` of the model fields.
+
+    """
+    options = f"$select={select(model)}"
+    if expands:
+        options += f";$expand={','.join(expands)}"
+    return f"{name}({options})"
+
+
+def literal(value: Any) -> str:
+    """Format a value as an OData literal.
+
+    Strings are quoted with their quotes doubled, so a value can not end
+    the string and change the meaning of the filter.
+
+    Args:
+    ----
+        value: A string, number, boolean, datetime or None.
+
+    Returns:
+    -------
+        The OData literal of the value.
+
+    Raises:
+    ------
+        BalenaCloudParameterValidationError: If the value type is not supported.
+
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int | float):
+        return repr(value)
+    if isinstance(value, datetime):
+        return f"datetime'{value.isoformat()}'"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    msg = f"Unsupported OData filter value: {value!r}."
+    raise BalenaCloudParameterValidationError(msg)
+
+
+@dataclass(frozen=True, slots=True)
+class Filter:
+    """An OData `$filter` expression, combined with `&`, `|` and `~`."""
+
+    expression: str
+
+    def __str__(self) -> str:
+        """Return the filter expression."""
+        return self.expression
+
+    def __and__(self, other: Filter) -> Filter:
+        """Match both filters."""
+        return Filter(f"({self}) and ({other})")
+
+    def __or__(self, other: Filter) -> Filter:
+        """Match either filter."""
+        return Filter(f"({self}) or ({other})")
+
+    def __invert__(self) -> Filter:
+        """Match when the filter does not match."""
+        return Filter(f"not ({self})")
+
+
+_LAMBDA_DEPTH: ContextVar[int] = ContextVar("balena_cloud_lambda_depth", default=0)
+
+
+@dataclass(frozen=True, slots=True)
+class Field:
+    """A field of a resource to filter on, for example, `Field("status")`.
+
+    Navigate to a field of a related resource with `/`, for example,
+    `Field("belongs_to__application") / "app_name"`.
+    """
+
+    name: str
+
+    def __truediv__(self, name: str) -> Field:
+        """Return a field of the related resource."""
+        return Field(f"{self.name}/{name}")
+
+    def _compare(self, operator: str, value: Any) -> Filter:
+        return Filter(f"{self.name} {operator} {literal(value)}")
+
+    def eq(self, value: Any) -> Filter:
+        """Match when the field equals the value."""
+        return self._compare("eq", value)
+
+    def ne(self, value: Any) -> Filter:
+        """Match when the field does not equal the value."""
+        return self._compare("ne", value)
+
+    def gt(self, value: Any) -> Filter:
+        """Match when the field is greater than the value."""
+        return self._compare("gt", value)
+
+    def ge(self, value: Any) -> Filter:
+        """Match when the field is greater than or equal to the value."""
+        return self._compare("ge", value)
+
+    def lt(self, value: Any) -> Filter:
+        """Match when the field is less than the value."""
+        return self._compare("lt", value)
+
+    def le(self, value: Any) -> Filter:
+        """Match when the field is less than or equal to the value."""
+        return self._compare("le", value)
+
+    def in_(self, values: Iterable[Any]) -> Filter:
+        """Match when the field equals one of the values.
+
+        Args:
+        ----
+            values: The values to match, at least one.
+
+        Returns:
+        -------
+            The filter.
+
+        Raises:
+        ------
+            BalenaCloudParameterValidationError: If there are no values.
+
+        """
+        literals = [literal(value) for value in values]
+        if not literals:
+            msg = f"An 'in' filter on {self.name} needs at least one value."
+            raise BalenaCloudParameterValidationError(msg)
+        return Filter(f"{self.name} in ({','.join(literals)})")
+
+    def contains(self, value: str) -> Filter:
+        """Match when the field contains the string."""
+        return Filter(f"contains({self.name},{literal(value)})")
+
+    def startswith(self, value: str) -> Filter:
+        """Match when the field starts with the string."""
+        return Filter(f"startswith({self.name},{literal(value)})")
+
+    def endswith(self, value: str) -> Filter:
+        """Match when the field ends with the string."""
+        return Filter(f"endswith({self.name},{literal(value)})")
+
+    def any(self, predicate: Callable[[Field], Filter] | None = None) -> Filter:
+        """Match when any related resource matches the predicate.
+
+        Args:
+        ----
+            predicate: Function that builds the filter of a related resource,
+                without a predicate any related resource matches (optional).
+
+        Returns:
+        -------
+            The filter.
+
+        """
+        return self._lambda("any", predicate)
+
+    def all(self, predicate: Callable[[Field], Filter]) -> Filter:
+        """Match when all related resources match the predicate.
+
+        Args:
+        ----
+            predicate: Function that builds the filter of a related resource.
+
+        Returns:
+        -------
+            The filter.
+
+        """
+        return self._lambda("all", predicate)
+
+    def _lambda(
+        self,
+        operator: str,
+        predicate: Callable[[Field], Filter] | None,
+    ) -> Filter:
+        depth = _LAMBDA_DEPTH.get()
+        variable = f"x{depth}"
+        if predicate is None:
+            return Filter(f"{self.name}/{operator}({variable}:true)")
+        token = _LAMBDA_DEPTH.set(depth + 1)
+        try:
+            expression = predicate(Field(variable))
+        finally:
+            _LAMBDA_DEPTH.reset(token)
+        return Filter(f"{self.name}/{operator}({variable}:{expression})")
+
+
+@dataclass(frozen=True, slots=True)
+class Query:
+    """Options for the collection requests of a resource.
+
+    The filter is combined with the filter of the request itself, the
+    ordering replaces the default ordering by ID and `top` limits the total
+    number of rows, no matter the page size. The rows are still ordered by
+    ID when they are equal in the ordering, so that no rows are skipped or
+    repeated between pages.
+    """
+
+    filter: Filter | None = None
+    orderby: Sequence[str] = ()
+    top: int | None = None
+
+    def params(self, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Merge the query into the query parameters of a request.
+
+        Args:
+        ----
+            params: The query parameters of the request (optional).
+
+        Returns:
+        -------
+            New query parameters with the filter and ordering of the query.
+
+        """
+        params = dict(params or {})
+        if self.filter is not None:
+            current = params.get("$filter")
+            params["$filter"] = (
+                str(self.filter)
+                if current is None
+                else f"({current}) and ({self.filter})"
+            )
+        if self.orderby:
+            params["$orderby"] = ",".join(self.orderby)
+        return params
@@ -0,0 +1,166 @@
+"""Client-side rate limiting for the Balena Cloud API."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from aiohttp.hdrs import METH_GET, METH_HEAD, METH_OPTIONS
+
+from .exceptions import BalenaCloudResponseError
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from .middleware import Handler, Request
+
+READ_METHODS = frozenset({METH_GET, METH_HEAD, METH_OPTIONS})
+
+
+@dataclass
+class TokenBucket:
+    """Token bucket that allows `rate` requests per second, `burst` at once."""
+
+    rate: float
+    burst: float
+
+    _configured_rate: float = field(init=False)
+    _tokens: float = field(init=False)
+    _updated: float = field(init=False)
+    _lock: asyncio.Lock = field(init=False, default_factory=asyncio.Lock)
+
+    def __post_init__(self) -> None:
+        """Start with a full bucket."""
+        self._configured_rate = self.rate
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def slow_down(self, min_rate: float) -> None:
+        """Halve the rate, but not below `min_rate`."""
+        self.rate = max(min_rate, self.rate / 2)
+
+    def recover(self, step: float) -> None:
+        """Raise the rate by a fraction of the configured rate, up to that rate."""
+        self.rate = min(self._configured_rate, self.rate + self._configured_rate * step)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        # The lock makes waiting requests take their turn in arrival order.
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+@dataclass
+class RateLimiter:
+    """Limit the request rate of a client, shared by all its resources.
+
+    Reads and writes share a single bucket, unless `write_rate` is set. When
+    `adaptive` is enabled, a 429 response halves the rate of its bucket (to
+    at least `min_rate`), after which every successful request recovers the
+    rate step by step up to the configured rate again.
+    """
+
+    rate: float = 10.0
+    burst: int = 20
+    write_rate: float | None = None
+    write_burst: int | None = None
+    adaptive: bool = True
+    min_rate: float = 0.5
+    recovery: float = 0.05
+
+    _read: TokenBucket = field(init=False)
+    _write: TokenBucket = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Create the token buckets."""
+        self._read = TokenBucket(self.rate, self.burst)
+        self._write = self._read
+        if self.write_rate is not None:
+            self._write = TokenBucket(
+                self.write_rate,
+                self.write_burst if self.write_burst is not None else self.burst,
+            )
+
+    def bucket(self, method: str) -> TokenBucket:
+        """Get the token bucket used for an HTTP method.
+
+        Args:
+        ----
+            method: HTTP method of the request.
+
+        Returns:
+        -------
+            The token bucket of reads or writes.
+
+        """
+        return self._read if method in READ_METHODS else self._write
+
+    async def acquire(self, method: str) -> None:
+        """Wait until a request with this HTTP method may be sent.
+
+        Args:
+        ----
+            method: HTTP method of the request.
+
+        """
+        await self.bucket(method).acquire()
+
+    def throttled(self, method: str) -> None:
+        """Slow down after the API responded that the rate limit is exceeded.
+
+        Args:
+        ----
+            method: HTTP method of the throttled request.
+
+        """
+        if self.adaptive:
+            self.bucket(method).slow_down(self.min_rate)
+
+    def succeeded(self, method: str) -> None:
+        """Speed up again after a successful request.
+
+        Args:
+        ----
+            method: HTTP method of the successful request.
+
+        """
+        self.bucket(method).recover(self.recovery)
+
+    async def __call__(self, request: Request, call_next: Handler) -> Any:
+        """Send a request along the middleware chain, within the rate limit."""
+        return await self.run(request.method, partial(call_next, request))
+
+    async def run(self, method: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a request within the rate limit.
+
+        Args:
+        ----
+            method: HTTP method of the request.
+            call: Coroutine function that sends the request.
+
+        Returns:
+        -------
+            The result of the request.
+
+        """
+        await self.acquire(method)
+        try:
+            result = await call()
+        except BalenaCloudResponseError as exception:
+            if exception.status == 429:
+                self.throttled(method)
+            raise
+        self.succeeded(method)
+        return result
@@ -1,17 +1,79 @@
 """Device resource clients."""
 
+# The list methods take the paging, field and query options as keywords.
+# pylint: disable=too-many-arguments
+# ruff: noqa: PLR0913
+
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any, Literal, overload
 
 from aiohttp.hdrs import METH_DELETE, METH_PATCH, METH_POST
 
+from balena_cloud.bulk import BulkResult, run_bulk
+from balena_cloud.decoding import decoder
 from balena_cloud.exceptions import (
+    BalenaCloudConflictError,
     BalenaCloudParameterValidationError,
     BalenaCloudResourceNotFoundError,
 )
+from balena_cloud.lookup import Lookup, LookupResult
 from balena_cloud.models import Device, EnvironmentVariable, ServiceInstall, Tag
+from balena_cloud.odata import Query, expand, literal, select
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable, Sequence
+
+# Related collections that can be included with a device.
+DEVICE_INCLUDES = (
+    "tags",
+    "environment_variables",
+    "service_installs",
+    "service_variables",
+)
+
+
+def expand_device(include: Iterable[str]) -> str:
+    """Build the `$expand` query value to include related device collections.
+
+    The service variables are part of the service installs, including them
+    includes the service installs as well.
+
+    Args:
+    ----
+        include: Names of the related collections, see `DEVICE_INCLUDES`.
+
+    Returns:
+    -------
+        A comma separated list of expanded navigation properties.
+
+    Raises:
+    ------
+        BalenaCloudParameterValidationError: If a collection is unknown.
+
+    """
+    include = set(include)
+    if unknown := include.difference(DEVICE_INCLUDES):
+        msg = (
+            f"Unknown device includes: {', '.join(sorted(unknown))}, "
+            f"use one of {', '.join(DEVICE_INCLUDES)}."
+        )
+        raise BalenaCloudParameterValidationError(msg)
+
+    expands = []
+    if "tags" in include:
+        expands.append(expand("device_tag", Tag))
+    if "environment_variables" in include:
+        expands.append(expand("device_environment_variable", EnvironmentVariable))
+    if "service_installs" in include or "service_variables" in include:
+        service_expands = ["installs__service($select=service_name)"]
+        if "service_variables" in include:
+            service_expands.append(
+                expand("device_service_environment_variable", EnvironmentVariable)
+            )
+        expands.append(expand("service_install", ServiceInstall, *service_expands))
+    return ",".join(expands)
 
 
 @dataclass
@@ -24,6 +86,9 @@ class DeviceResource:
         self,
         device_id: int | None = None,
         device_uuid: str | None = None,
+        *,
+        fields: Sequence[str] | None = None,
+        include: Iterable[str] | None = None,
     ) -> Device:
         """Get a device by its ID.
 
@@ -31,6 +96,9 @@ class DeviceResource:
         ----
             device_id: The device ID (optional).
             device_uuid: The device UUID (optional).
+            fields: Fields to select instead of the model fields (optional).
+            include: Related collections to fetch in the same request, for
+                example, ['tags', 'service_variables'] (optional).
 
         Returns:
         -------
@@ -41,14 +109,53 @@ class DeviceResource:
             msg = "You must provide either a device ID or a device UUID."
             raise BalenaCloudParameterValidationError(msg)
 
+        decode = decoder(Device, fields)
+        params = {"$select": select(Device, fields)}
+        if include:
+            params["$expand"] = expand_device(include)
         if device_id is not None:
-            response = await self.parent.request(f"device({device_id})")
+            response = await self.parent.request(f"device({device_id})", params=params)
         else:
-            response = await self.parent.request(f"device(uuid='{device_uuid}')")
+            response = await self.parent.request(
+                f"device(uuid={literal(device_uuid)})", params=params
+            )
         if not response["d"]:
             msg = "No device found with the provided ID or UUID."
             raise BalenaCloudResourceNotFoundError(msg)
-        return Device.from_dict(response["d"][0])
+        return decode(response["d"][0])
+
+    async def get_many(
+        self,
+        device_ids: Iterable[int] | None = None,
+        device_uuids: Iterable[str] | None = None,
+        *,
+        fields: Sequence[str] | None = None,
+    ) -> LookupResult[Device]:
+        """Get many devices by their ID or UUID with a few requests.
+
+        Args:
+        ----
+            device_ids: The device IDs (optional).
+            device_uuids: The device UUIDs (optional).
+            fields: Fields to select instead of the model fields (optional).
+
+        Returns:
+        -------
+            The devices in the order of the IDs or UUIDs, and the IDs or UUIDs
+            that were not found.
+
+        """
+        if (device_ids is None) == (device_uuids is None):
+            msg = "You must provide either device IDs or device UUIDs."
+            raise BalenaCloudParameterValidationError(msg)
+
+        if device_ids is not None:
+            return await Lookup(self.parent, "device", Device).get_many(
+                device_ids, fields
+            )
+        return await Lookup(self.parent, "device", Device, key="uuid").get_many(
+            device_uuids or (), fields
+        )
 
     async def update(
         self,
@@ -81,6 +188,8 @@ class DeviceResource:
         device_uuid: str | None = None,
         *,
         expand_service: bool = False,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
     ) -> list[ServiceInstall]:
         """Get all service installs from a device.
 
@@ -89,6 +198,8 @@ class DeviceResource:
             device_id: The device ID (optional).
             device_uuid: The device UUID (optional).
             expand_service: Expand service names in the response.
+            page_size: Number of service installs per request (optional).
+            fields: Fields to select instead of the model fields (optional).
 
         Returns:
         -------
@@ -99,6 +210,8 @@ class DeviceResource:
             device_id=device_id,
             device_uuid=device_uuid,
             expand_service=expand_service,
+            page_size=page_size,
+            fields=fields,
         )
 
 
@@ -113,6 +226,7 @@ class ServiceInstallResource:
         service_install_id: int,
         *,
         expand_service: bool = False,
+        fields: Sequence[str] | None = None,
     ) -> ServiceInstall:
         """Get a service install by its ID.
 
@@ -120,17 +234,17 @@ class ServiceInstallResource:
         ----
             service_install_id: The service install ID.
             expand_service: Expand service names in the response.
+            fields: Fields to select instead of the model fields (optional).
 
         Returns:
         -------
             A service install object.
 
         """
-        params = None
+        decode = decoder(ServiceInstall, fields)
+        params = {"$select": select(ServiceInstall, fields)}
         if expand_service:
-            params = {
-                "$expand": "installs__service($select=service_name)",
-            }
+            params["$expand"] = "installs__service($select=service_name)"
 
         response = await self.parent.request(
             f"service_install({service_install_id})",
@@ -139,26 +253,60 @@ class ServiceInstallResource:
         if not response["d"]:
             msg = "No service install found with the provided ID."
             raise BalenaCloudResourceNotFoundError(msg)
-        return self._from_dict(response["d"][0])
+        return decode(response["d"][0])
 
-    async def get_all(
+    @overload
+    def iter_all(
         self,
         device_id: int | None = None,
         device_uuid: str | None = None,
         *,
         expand_service: bool = False,
-    ) -> list[ServiceInstall]:
-        """Get all service installs from a device.
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[False] = False,
+    ) -> AsyncIterator[ServiceInstall]: ...
+
+    @overload
+    def iter_all(
+        self,
+        device_id: int | None = None,
+        device_uuid: str | None = None,
+        *,
+        expand_service: bool = False,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[True],
+    ) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def iter_all(
+        self,
+        device_id: int | None = None,
+        device_uuid: str | None = None,
+        *,
+        expand_service: bool = False,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[ServiceInstall | dict[str, Any]]:
+        """Iterate over all service installs from a device.
 
         Args:
         ----
             device_id: The device ID (optional).
             device_uuid: The device UUID (optional).
             expand_service: Expand service names in the response.
+            page_size: Number of service installs per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+            raw: Yield the JSON decoded rows instead of models (optional).
 
-        Returns:
-        -------
-            A list of service installs in the device.
+        Yields:
+        ------
+            Service install objects in the device.
 
         """
         if device_id is None and device_uuid is None:
@@ -168,21 +316,58 @@ class ServiceInstallResource:
         if device_id is not None:
             filter_query = f"device eq {device_id}"
         else:
-            filter_query = f"device/uuid eq '{device_uuid}'"
+            filter_query = f"device/uuid eq {literal(device_uuid)}"
 
-        params = {"$filter": filter_query}
+        params = {
+            "$filter": filter_query,
+            "$select": select(ServiceInstall, fields),
+        }
         if expand_service:
             params["$expand"] = "installs__service($select=service_name)"
 
-        response = await self.parent.request("service_install", params=params)
-        return [self._from_dict(item) for item in response["d"]]
+        decode = decoder(ServiceInstall, fields, raw=raw)
+        async for item in self.parent.paginate(
+            "service_install", params=params, page_size=page_size, query=query
+        ):
+            yield decode(item)
 
-    @staticmethod
-    def _from_dict(data: dict[str, Any]) -> ServiceInstall:
-        service = data.get("installs__service")
-        if isinstance(service, dict) and service.get("service_name") is not None:
-            data = {**data, "service_name": service["service_name"]}
-        return ServiceInstall.from_dict(data)
+    async def get_all(
+        self,
+        device_id: int | None = None,
+        device_uuid: str | None = None,
+        *,
+        expand_service: bool = False,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+    ) -> list[ServiceInstall]:
+        """Get all service installs from a device.
+
+        Args:
+        ----
+            device_id: The device ID (optional).
+            device_uuid: The device UUID (optional).
+            expand_service: Expand service names in the response.
+            page_size: Number of service installs per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+
+        Returns:
+        -------
+            A list of service installs in the device.
+
+        """
+        return [
+            item
+            async for item in self.iter_all(
+                device_id,
+                device_uuid,
+                expand_service=expand_service,
+                page_size=page_size,
+                fields=fields,
+                query=query,
+            )
+        ]
 
 
 @dataclass
@@ -191,39 +376,82 @@ class DeviceTagResource:
 
     parent: Any
 
-    async def get(self, tag_id: int) -> Tag:
+    async def get(
+        self,
+        tag_id: int,
+        *,
+        fields: Sequence[str] | None = None,
+    ) -> Tag:
         """Get a device tag by its ID.
 
         Args:
         ----
             tag_id: The tag ID.
+            fields: Fields to select instead of the model fields (optional).
 
         Returns:
         -------
             A tag object.
 
         """
-        response = await self.parent.request(f"device_tag({tag_id})")
+        decode = decoder(Tag, fields)
+        response = await self.parent.request(
+            f"device_tag({tag_id})",
+            params={"$select": select(Tag, fields)},
+        )
         if not response["d"]:
             msg = "No device tag found with the provided ID."
             raise BalenaCloudResourceNotFoundError(msg)
-        return Tag.from_dict(response["d"][0])
+        return decode(response["d"][0])
 
-    async def get_all(
+    @overload
+    def iter_all(
         self,
         device_id: int | None = None,
         device_uuid: str | None = None,
-    ) -> list[Tag]:
-        """Get all tags from a device.
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[False] = False,
+    ) -> AsyncIterator[Tag]: ...
+
+    @overload
+    def iter_all(
+        self,
+        device_id: int | None = None,
+        device_uuid: str | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[True],
+    ) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def iter_all(
+        self,
+        device_id: int | None = None,
+        device_uuid: str | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[Tag | dict[str, Any]]:
+        """Iterate over all tags from a device.
 
         Args:
         ----
             device_id: The device ID (optional).
             device_uuid: The device UUID (optional).
+            page_size: Number of tags per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+            raw: Yield the JSON decoded rows instead of models (optional).
 
-        Returns:
-        -------
-            A list of tags in the device.
+        Yields:
+        ------
+            Tag objects in the device.
 
         """
         if device_id is None and device_uuid is None:
@@ -231,16 +459,49 @@ class DeviceTagResource:
             raise BalenaCloudParameterValidationError(msg)
 
         if device_id is not None:
-            response = await self.parent.request(
-                "device_tag",
-                params={"$filter": f"device eq {device_id}"},
-            )
+            filter_query = f"device eq {device_id}"
         else:
-            response = await self.parent.request(
-                "device_tag",
-                params={"$filter": f"device/uuid eq '{device_uuid}'"},
+            filter_query = f"device/uuid eq {literal(device_uuid)}"
+
+        decode = decoder(Tag, fields, raw=raw)
+        async for item in self.parent.paginate(
+            "device_tag",
+            params={"$filter": filter_query, "$select": select(Tag, fields)},
+            page_size=page_size,
+            query=query,
+        ):
+            yield decode(item)
+
+    async def get_all(
+        self,
+        device_id: int | None = None,
+        device_uuid: str | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+    ) -> list[Tag]:
+        """Get all tags from a device.
+
+        Args:
+        ----
+            device_id: The device ID (optional).
+            device_uuid: The device UUID (optional).
+            page_size: Number of tags per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+
+        Returns:
+        -------
+            A list of tags in the device.
+
+        """
+        return [
+            item
+            async for item in self.iter_all(
+                device_id, device_uuid, page_size=page_size, fields=fields, query=query
             )
-        return [Tag.from_dict(item) for item in response["d"]]
+        ]
 
     async def add(
         self,
@@ -284,11 +545,56 @@ class DeviceTagResource:
 
         """
         await self.parent.request(
-            f"device_tag(device={device_id},tag_key='{key}')",
+            f"device_tag(device={device_id},tag_key={literal(key)})",
             method=METH_PATCH,
             data={"value": str(value)},
         )
 
+    async def upsert(
+        self,
+        device_id: int,
+        key: str,
+        value: object,
+    ) -> Tag | None:
+        """Add a tag to a device, or update it when it already exists.
+
+        Args:
+        ----
+            device_id: The device ID.
+            key: The tag key.
+            value: The new value.
+
+        Returns:
+        -------
+            The created object, or None when an existing one was updated.
+
+        """
+        try:
+            return await self.add(device_id, key, value)
+        except BalenaCloudConflictError:
+            await self.update(device_id, key, value)
+        return None
+
+    async def bulk_upsert(
+        self,
+        items: Iterable[tuple[int, str, object]],
+        *,
+        concurrency: int = 32,
+    ) -> list[BulkResult]:
+        """Add or update many device tags concurrently.
+
+        Args:
+        ----
+            items: Tuples of the device ID, tag key and value.
+            concurrency: The maximum number of concurrent requests.
+
+        Returns:
+        -------
+            A result for every item, failed items contain the raised error.
+
+        """
+        return await run_bulk(items, self.upsert, concurrency=concurrency)
+
     async def remove(self, tag_id: int) -> None:
         """Remove a tag from a device.
 
@@ -309,41 +615,105 @@ class DeviceVariableResource:
 
     parent: Any
 
-    async def get(self, variable_id: int) -> EnvironmentVariable:
+    async def get(
+        self,
+        variable_id: int,
+        *,
+        fields: Sequence[str] | None = None,
+    ) -> EnvironmentVariable:
         """Get an environment variable by its ID from device.
 
         Args:
         ----
             variable_id: The variable ID.
+            fields: Fields to select instead of the model fields (optional).
 
         Returns:
         -------
             An environment variable object.
 
         """
+        decode = decoder(EnvironmentVariable, fields)
         response = await self.parent.request(
-            f"device_environment_variable({variable_id})"
+            f"device_environment_variable({variable_id})",
+            params={"$select": select(EnvironmentVariable, fields)},
         )
         if not response["d"]:
             msg = "No device environment variable found with the provided ID."
             raise BalenaCloudResourceNotFoundError(msg)
-        return EnvironmentVariable.from_dict(response["d"][0])
+        return decode(response["d"][0])
 
-    async def get_all(
+    async def get_many(
+        self,
+        variable_ids: Iterable[int],
+        *,
+        fields: Sequence[str] | None = None,
+    ) -> LookupResult[EnvironmentVariable]:
+        """Get many environment variables by their ID with a few requests.
+
+        Args:
+        ----
+            variable_ids: The variable IDs.
+            fields: Fields to select instead of the model fields (optional).
+
+        Returns:
+        -------
+            The environment variables in the order of the IDs, and the IDs
+            that were not found.
+
+        """
+        return await Lookup(
+            self.parent, "device_environment_variable", EnvironmentVariable
+        ).get_many(variable_ids, fields)
+
+    @overload
+    def iter_all(
         self,
         device_id: int | None = None,
         device_uuid: str | None = None,
-    ) -> list[EnvironmentVariable]:
-        """Get all environment variables from a device.
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[False] = False,
+    ) -> AsyncIterator[EnvironmentVariable]: ...
+
+    @overload
+    def iter_all(
+        self,
+        device_id: int | None = None,
+        device_uuid: str | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[True],
+    ) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def iter_all(
+        self,
+        device_id: int | None = None,
+        device_uuid: str | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[EnvironmentVariable | dict[str, Any]]:
+        """Iterate over all environment variables from a device.
 
         Args:
         ----
             device_id: The device ID (optional).
             device_uuid: The device UUID (optional).
+            page_size: Number of variables per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+            raw: Yield the JSON decoded rows instead of models (optional).
 
-        Returns:
-        -------
-            A list of environment variables in the device.
+        Yields:
+        ------
+            Environment variable objects in the device.
 
         """
         if device_id is None and device_uuid is None:
@@ -351,16 +721,52 @@ class DeviceVariableResource:
             raise BalenaCloudParameterValidationError(msg)
 
         if device_id is not None:
-            response = await self.parent.request(
-                "device_environment_variable",
-                params={"$filter": f"device eq {device_id}"},
-            )
+            filter_query = f"device eq {device_id}"
         else:
-            response = await self.parent.request(
-                "device_environment_variable",
-                params={"$filter": f"device/any(d:d/uuid eq '{device_uuid}')"},
+            filter_query = f"device/any(d:d/uuid eq {literal(device_uuid)})"
+
+        decode = decoder(EnvironmentVariable, fields, raw=raw)
+        async for item in self.parent.paginate(
+            "device_environment_variable",
+            params={
+                "$filter": filter_query,
+                "$select": select(EnvironmentVariable, fields),
+            },
+            page_size=page_size,
+            query=query,
+        ):
+            yield decode(item)
+
+    async def get_all(
+        self,
+        device_id: int | None = None,
+        device_uuid: str | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+    ) -> list[EnvironmentVariable]:
+        """Get all environment variables from a device.
+
+        Args:
+        ----
+            device_id: The device ID (optional).
+            device_uuid: The device UUID (optional).
+            page_size: Number of variables per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+
+        Returns:
+        -------
+            A list of environment variables in the device.
+
+        """
+        return [
+            item
+            async for item in self.iter_all(
+                device_id, device_uuid, page_size=page_size, fields=fields, query=query
             )
-        return [EnvironmentVariable.from_dict(item) for item in response["d"]]
+        ]
 
     async def add(
         self,
@@ -399,6 +805,58 @@ class DeviceVariableResource:
             data={"value": str(value)},
         )
 
+    async def upsert(
+        self,
+        device_id: int,
+        name: str,
+        value: object,
+    ) -> EnvironmentVariable | None:
+        """Add an environment variable to a device, or update it when it already exists.
+
+        Args:
+        ----
+            device_id: The device ID.
+            name: The variable name.
+            value: The new value.
+
+        Returns:
+        -------
+            The created object, or None when an existing one was updated.
+
+        """
+        try:
+            return await self.add(device_id, name, value)
+        except BalenaCloudConflictError:
+            await self.parent.request(
+                "device_environment_variable",
+                method=METH_PATCH,
+                params={
+                    "$filter": f"device eq {device_id} and name eq {literal(name)}"
+                },
+                data={"value": str(value)},
+            )
+        return None
+
+    async def bulk_upsert(
+        self,
+        items: Iterable[tuple[int, str, object]],
+        *,
+        concurrency: int = 32,
+    ) -> list[BulkResult]:
+        """Add or update many device environment variables concurrently.
+
+        Args:
+        ----
+            items: Tuples of the device ID, variable name and value.
+            concurrency: The maximum number of concurrent requests.
+
+        Returns:
+        -------
+            A result for every item, failed items contain the raised error.
+
+        """
+        return await run_bulk(items, self.upsert, concurrency=concurrency)
+
     async def remove(self, variable_id: int) -> None:
         """Remove an environment variable from a device.
 
@@ -419,41 +877,105 @@ class DeviceServiceVariableResource:
 
     parent: Any
 
-    async def get(self, variable_id: int) -> EnvironmentVariable:
+    async def get(
+        self,
+        variable_id: int,
+        *,
+        fields: Sequence[str] | None = None,
+    ) -> EnvironmentVariable:
         """Get a service environment variable by its ID from a device.
 
         Args:
         ----
             variable_id: The variable ID.
+            fields: Fields to select instead of the model fields (optional).
 
         Returns:
         -------
             An environment variable object.
 
         """
+        decode = decoder(EnvironmentVariable, fields)
         response = await self.parent.request(
-            f"device_service_environment_variable({variable_id})"
+            f"device_service_environment_variable({variable_id})",
+            params={"$select": select(EnvironmentVariable, fields)},
         )
         if not response["d"]:
             msg = "No device service environment variable found with the provided ID."
             raise BalenaCloudResourceNotFoundError(msg)
-        return EnvironmentVariable.from_dict(response["d"][0])
+        return decode(response["d"][0])
 
-    async def get_all(
+    async def get_many(
+        self,
+        variable_ids: Iterable[int],
+        *,
+        fields: Sequence[str] | None = None,
+    ) -> LookupResult[EnvironmentVariable]:
+        """Get many service environment variables by their ID with a few requests.
+
+        Args:
+        ----
+            variable_ids: The variable IDs.
+            fields: Fields to select instead of the model fields (optional).
+
+        Returns:
+        -------
+            The service environment variables in the order of the IDs, and
+            the IDs that were not found.
+
+        """
+        return await Lookup(
+            self.parent, "device_service_environment_variable", EnvironmentVariable
+        ).get_many(variable_ids, fields)
+
+    @overload
+    def iter_all(
         self,
         device_id: int | None = None,
         device_uuid: str | None = None,
-    ) -> list[EnvironmentVariable]:
-        """Get all service environment variables from a device.
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[False] = False,
+    ) -> AsyncIterator[EnvironmentVariable]: ...
+
+    @overload
+    def iter_all(
+        self,
+        device_id: int | None = None,
+        device_uuid: str | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[True],
+    ) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def iter_all(
+        self,
+        device_id: int | None = None,
+        device_uuid: str | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[EnvironmentVariable | dict[str, Any]]:
+        """Iterate over all service environment variables from a device.
 
         Args:
         ----
             device_id: The device ID (optional).
             device_uuid: The device UUID (optional).
+            page_size: Number of variables per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+            raw: Yield the JSON decoded rows instead of models (optional).
 
-        Returns:
-        -------
-            A list of service environment variables in the device.
+        Yields:
+        ------
+            Service environment variable objects in the device.
 
         """
         if device_id is None and device_uuid is None:
@@ -461,21 +983,55 @@ class DeviceServiceVariableResource:
             raise BalenaCloudParameterValidationError(msg)
 
         if device_id is not None:
-            response = await self.parent.request(
-                "device_service_environment_variable",
-                params={"$filter": f"service_install/device eq {device_id}"},
-            )
+            filter_query = f"service_install/device eq {device_id}"
         else:
-            response = await self.parent.request(
-                "device_service_environment_variable",
-                params={
-                    "$filter": (
-                        "service_install/any(si:si/device/any("
-                        f"d:d/uuid eq '{device_uuid}'))"
-                    )
-                },
+            filter_query = (
+                "service_install/any(si:si/device/any(d:d/uuid eq "
+                f"{literal(device_uuid)}))"
+            )
+
+        decode = decoder(EnvironmentVariable, fields, raw=raw)
+        async for item in self.parent.paginate(
+            "device_service_environment_variable",
+            params={
+                "$filter": filter_query,
+                "$select": select(EnvironmentVariable, fields),
+            },
+            page_size=page_size,
+            query=query,
+        ):
+            yield decode(item)
+
+    async def get_all(
+        self,
+        device_id: int | None = None,
+        device_uuid: str | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+    ) -> list[EnvironmentVariable]:
+        """Get all service environment variables from a device.
+
+        Args:
+        ----
+            device_id: The device ID (optional).
+            device_uuid: The device UUID (optional).
+            page_size: Number of variables per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+
+        Returns:
+        -------
+            A list of service environment variables in the device.
+
+        """
+        return [
+            item
+            async for item in self.iter_all(
+                device_id, device_uuid, page_size=page_size, fields=fields, query=query
             )
-        return [EnvironmentVariable.from_dict(item) for item in response["d"]]
+        ]
 
     async def add(
         self,
@@ -518,6 +1074,61 @@ class DeviceServiceVariableResource:
             data={"value": str(value)},
         )
 
+    async def upsert(
+        self,
+        service_install_id: int,
+        name: str,
+        value: object,
+    ) -> EnvironmentVariable | None:
+        """Add or update a service environment variable of a device.
+
+        Args:
+        ----
+            service_install_id: The service install ID.
+            name: The variable name.
+            value: The new value.
+
+        Returns:
+        -------
+            The created object, or None when an existing one was updated.
+
+        """
+        try:
+            return await self.add(service_install_id, name, value)
+        except BalenaCloudConflictError:
+            await self.parent.request(
+                "device_service_environment_variable",
+                method=METH_PATCH,
+                params={
+                    "$filter": (
+                        f"service_install eq {service_install_id} "
+                        f"and name eq {literal(name)}"
+                    )
+                },
+                data={"value": str(value)},
+            )
+        return None
+
+    async def bulk_upsert(
+        self,
+        items: Iterable[tuple[int, str, object]],
+        *,
+        concurrency: int = 32,
+    ) -> list[BulkResult]:
+        """Add or update many device service environment variables concurrently.
+
+        Args:
+        ----
+            items: Tuples of the service install ID, variable name and value.
+            concurrency: The maximum number of concurrent requests.
+
+        Returns:
+        -------
+            A result for every item, failed items contain the raised error.
+
+        """
+        return await run_bulk(items, self.upsert, concurrency=concurrency)
+
     async def remove(self, variable_id: int) -> None:
         """Remove a service environment variable from a device.
 
@@ -1,17 +1,43 @@
 """Fleet resource clients."""
 
+# The list methods take the paging, field and query options as keywords.
+# pylint: disable=too-many-arguments
+# ruff: noqa: PLR0913
+
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any, Literal, overload
 
 from aiohttp.hdrs import METH_DELETE, METH_PATCH, METH_POST
 
+from balena_cloud.bulk import BulkResult, run_bulk
+from balena_cloud.decoding import decoder
 from balena_cloud.exceptions import (
+    BalenaCloudConflictError,
     BalenaCloudParameterValidationError,
     BalenaCloudResourceNotFoundError,
 )
-from balena_cloud.models import Device, EnvironmentVariable, Fleet, Release, Service
+from balena_cloud.health import ONLINE, UPDATING, FleetHealth
+from balena_cloud.lookup import Lookup, LookupResult
+from balena_cloud.models import (
+    Device,
+    EnvironmentVariable,
+    Fleet,
+    Release,
+    Service,
+    ServiceInstall,
+    Tag,
+)
+from balena_cloud.odata import Field, Query, literal, model_fields, select
+from balena_cloud.resources.device import expand_device
+from balena_cloud.snapshot import FleetSnapshot
+from balena_cloud.sync import DeviceSync
+from balena_cloud.table import DeviceTable
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable, Sequence
 
 
 @dataclass
@@ -20,25 +46,94 @@ class FleetResource:
 
     parent: Any
 
-    async def get_all(self) -> list[Fleet]:
+    @overload
+    def iter_all(
+        self,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[False] = False,
+    ) -> AsyncIterator[Fleet]: ...
+
+    @overload
+    def iter_all(
+        self,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[True],
+    ) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def iter_all(
+        self,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[Fleet | dict[str, Any]]:
+        """Iterate over all fleets that is authorized by the user.
+
+        Args:
+        ----
+            page_size: Number of fleets per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+            raw: Yield the JSON decoded rows instead of models (optional).
+
+        Yields:
+        ------
+            Fleet objects, one page at a time.
+
+        """
+        decode = decoder(Fleet, fields, raw=raw)
+        async for item in self.parent.paginate(
+            "application",
+            params={
+                "$filter": "is_directly_accessible_by__user/any(dau:true)",
+                "$select": select(Fleet, fields),
+            },
+            page_size=page_size,
+            query=query,
+        ):
+            yield decode(item)
+
+    async def get_all(
+        self,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+    ) -> list[Fleet]:
         """Get all fleets that is authorized by the user.
 
-        Returns
+        Args:
+        ----
+            page_size: Number of fleets per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+
+        Returns:
         -------
             A list of fleets.
 
         """
-        response = await self.parent.request(
-            "application",
-            params={"$filter": "is_directly_accessible_by__user/any(dau:true)"},
-        )
-        return [Fleet.from_dict(item) for item in response["d"]]
+        return [
+            item
+            async for item in self.iter_all(
+                page_size=page_size, fields=fields, query=query
+            )
+        ]
 
     async def get(
         self,
         fleet_id: int | None = None,
         fleet_slug: str | None = None,
         fleet_name: str | None = None,
+        *,
+        fields: Sequence[str] | None = None,
     ) -> Fleet:
         """Get a fleet by its ID, slug or name.
 
@@ -47,6 +142,7 @@ class FleetResource:
             fleet_id: The fleet ID (optional).
             fleet_slug: The fleet slug (optional).
             fleet_name: The fleet name (optional).
+            fields: Fields to select instead of the model fields (optional).
 
         Returns:
         -------
@@ -57,23 +153,106 @@ class FleetResource:
             msg = "You must provide either a fleet ID, a fleet slug or a fleet name."
             raise BalenaCloudParameterValidationError(msg)
 
+        decode = decoder(Fleet, fields)
+        params = {"$select": select(Fleet, fields)}
         if fleet_id is not None:
-            response = await self.parent.request(f"application({fleet_id})")
+            response = await self.parent.request(
+                f"application({fleet_id})", params=params
+            )
         elif fleet_slug is not None:
-            response = await self.parent.request(f"application(slug='{fleet_slug}')")
+            response = await self.parent.request(
+                f"application(slug={literal(fleet_slug)})", params=params
+            )
         else:
             response = await self.parent.request(
-                "application", params={"$filter": f"app_name eq '{fleet_name}'"}
+                "application",
+                params={**params, "$filter": f"app_name eq {literal(fleet_name)}"},
             )
         if not response["d"]:
             msg = "No fleet found with the provided ID, slug or name."
             raise BalenaCloudResourceNotFoundError(msg)
-        return Fleet.from_dict(response["d"][0])
+        return decode(response["d"][0])
+
+    @overload
+    def iter_devices(
+        self,
+        fleet_id: int,
+        filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        include: Iterable[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[False] = False,
+    ) -> AsyncIterator[Device]: ...
+
+    @overload
+    def iter_devices(
+        self,
+        fleet_id: int,
+        filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        include: Iterable[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[True],
+    ) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def iter_devices(
+        self,
+        fleet_id: int,
+        filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        include: Iterable[str] | None = None,
+        query: Query | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[Device | dict[str, Any]]:
+        """Iterate over all devices from a specific fleet.
+
+        Args:
+        ----
+            fleet_id: The fleet ID.
+            filters: Filters to apply to the request (optional).
+            page_size: Number of devices per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            include: Related collections to fetch in the same request, for
+                example, ['tags', 'service_variables'] (optional).
+            query: Filter, ordering and row limit of the request (optional).
+            raw: Yield the JSON decoded rows instead of models (optional).
+
+        Yields:
+        ------
+            Device objects in the fleet with the applied filters (if any).
+
+        """
+        params = {
+            "$filter": self._fleet_filter("belongs_to__application", fleet_id, filters),
+            "$select": select(Device, fields),
+        }
+        if include:
+            params["$expand"] = expand_device(include)
+
+        decode = decoder(Device, fields, raw=raw)
+        async for item in self.parent.paginate(
+            "device",
+            params=params,
+            page_size=page_size,
+            query=query,
+        ):
+            yield decode(item)
 
     async def get_devices(
         self,
         fleet_id: int,
         filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        include: Iterable[str] | None = None,
+        query: Query | None = None,
     ) -> list[Device]:
         """Get all devices from a specific fleet.
 
@@ -81,28 +260,309 @@ class FleetResource:
         ----
             fleet_id: The fleet ID.
             filters: Filters to apply to the request (optional).
+            page_size: Number of devices per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            include: Related collections to fetch in the same request, for
+                example, ['tags', 'service_variables'] (optional).
+            query: Filter, ordering and row limit of the request (optional).
 
         Returns:
         -------
             A list of devices in the fleet with the applied filters (if any).
 
         """
-        if filters is None:
-            response = await self.parent.request(
-                "device",
-                params={"$filter": f"belongs_to__application eq {fleet_id}"},
+        return [
+            item
+            async for item in self.iter_devices(
+                fleet_id,
+                filters,
+                page_size=page_size,
+                fields=fields,
+                include=include,
+                query=query,
             )
-        else:
-            query = f"belongs_to__application eq {fleet_id}"
-            for key, value in filters.items():
-                query += f" and {key} eq '{value}'"
-            response = await self.parent.request("device", params={"$filter": query})
-        return [Device.from_dict(item) for item in response["d"]]
+        ]
+
+    async def get_device_table(
+        self,
+        fleet_id: int,
+        filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        query: Query | None = None,
+    ) -> DeviceTable:
+        """Get all devices from a specific fleet as a columnar device table.
+
+        Only the table fields are requested and no `Device` objects are
+        created, which keeps the memory use low for large fleets.
+
+        Args:
+        ----
+            fleet_id: The fleet ID.
+            filters: Filters to apply to the request (optional).
+            page_size: Number of devices per request (optional).
+            query: Filter, ordering and row limit of the request (optional).
+
+        Returns:
+        -------
+            A device table of the fleet with the applied filters (if any).
+
+        """
+        table = DeviceTable()
+        async for item in self.parent.paginate(
+            "device",
+            params={
+                "$filter": self._fleet_filter(
+                    "belongs_to__application", fleet_id, filters
+                ),
+                "$select": ",".join(DeviceTable.FIELDS),
+            },
+            page_size=page_size,
+            query=query,
+        ):
+            table.append(item)
+        return table
+
+    async def count_devices(
+        self,
+        fleet_id: int,
+        filters: dict[str, Any] | None = None,
+        *,
+        query: Query | None = None,
+    ) -> int:
+        """Count the devices of a fleet on the server.
+
+        Args:
+        ----
+            fleet_id: The fleet ID.
+            filters: Filters to apply to the request (optional).
+            query: Filter of the request, for example,
+                `Query(filter=Field("is_online").eq(True))` (optional).
+
+        Returns:
+        -------
+            The number of devices in the fleet with the applied filters (if any).
+
+        """
+        return await self.parent.count(
+            "device",
+            params={
+                "$filter": self._fleet_filter(
+                    "belongs_to__application", fleet_id, filters
+                )
+            },
+            query=query,
+        )
+
+    async def health_summary(self, fleet_ids: Iterable[int]) -> dict[int, FleetHealth]:
+        """Count the total, online and updating devices of fleets.
+
+        Only the counts are requested, concurrently for all fleets, instead
+        of the devices themselves.
+
+        Args:
+        ----
+            fleet_ids: The fleet IDs.
+
+        Returns:
+        -------
+            The device counts of every fleet, in the order of the fleet IDs.
+
+        """
+        fleet_ids = list(dict.fromkeys(fleet_ids))
+        counts = await asyncio.gather(
+            *(
+                self.count_devices(fleet_id, query=query)
+                for fleet_id in fleet_ids
+                for query in (None, Query(filter=ONLINE), Query(filter=UPDATING))
+            )
+        )
+        return {
+            fleet_id: FleetHealth(fleet_id, *counts[index * 3 : index * 3 + 3])
+            for index, fleet_id in enumerate(fleet_ids)
+        }
+
+    async def snapshot(
+        self,
+        fleet_id: int,
+        *,
+        page_size: int | None = None,
+    ) -> FleetSnapshot:
+        """Get all devices from a fleet with their related collections.
+
+        The devices, device tags, device variables, service installs and
+        service variables of the whole fleet are requested concurrently, one
+        filtered collection query each, and joined on their device. The
+        number of requests does not depend on the number of devices, apart
+        from the pages of large fleets.
+
+        Args:
+        ----
+            fleet_id: The fleet ID.
+            page_size: Number of rows per request (optional).
+
+        Returns:
+        -------
+            A fleet snapshot.
+
+        """
+
+        async def rows(
+            resource: str, owner: str, fields: Sequence[str], **params: str
+        ) -> list[dict[str, Any]]:
+            return [
+                item
+                async for item in self.parent.paginate(
+                    resource,
+                    params={
+                        "$filter": str(Field(owner).eq(fleet_id)),
+                        "$select": ",".join(fields),
+                        **params,
+                    },
+                    page_size=page_size,
+                )
+            ]
+
+        fleet = "belongs_to__application"
+        devices, tags, variables, installs, service_variables = await asyncio.gather(
+            rows("device", fleet, model_fields(Device)),
+            rows("device_tag", f"device/{fleet}", [*model_fields(Tag), "device"]),
+            rows(
+                "device_environment_variable",
+                f"device/{fleet}",
+                [*model_fields(EnvironmentVariable), "device"],
+            ),
+            rows(
+                "service_install",
+                f"device/{fleet}",
+                [*model_fields(ServiceInstall), "device"],
+                **{"$expand": "installs__service($select=service_name)"},
+            ),
+            rows(
+                "device_service_environment_variable",
+                f"service_install/device/{fleet}",
+                [*model_fields(EnvironmentVariable), "service_install"],
+            ),
+        )
+        return FleetSnapshot.from_rows(
+            fleet_id,
+            devices,
+            {
+                "tags": tags,
+                "environment_variables": variables,
+                "service_installs": installs,
+                "service_variables": service_variables,
+            },
+        )
+
+    def sync(
+        self,
+        fleet_id: int,
+        *,
+        detect_removals: bool = True,
+        page_size: int | None = None,
+    ) -> DeviceSync:
+        """Create a sync that keeps a local copy of the devices of a fleet.
+
+        Args:
+        ----
+            fleet_id: The fleet ID.
+            detect_removals: Request the device IDs on every poll to find the
+                removed devices.
+            page_size: Number of devices per request (optional).
+
+        Returns:
+        -------
+            A device sync, call `poll` or iterate over `watch` to update it.
+
+        """
+        return DeviceSync(
+            self.parent,
+            fleet_id,
+            detect_removals=detect_removals,
+            page_size=page_size,
+        )
+
+    @staticmethod
+    def _fleet_filter(owner: str, fleet_id: int, filters: dict[str, Any] | None) -> str:
+        """Build the filter for the resources of a fleet, with equality filters."""
+        return " and ".join(
+            str(Field(key).eq(value))
+            for key, value in {owner: fleet_id, **(filters or {})}.items()
+        )
+
+    @overload
+    def iter_releases(
+        self,
+        fleet_id: int,
+        filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[False] = False,
+    ) -> AsyncIterator[Release]: ...
+
+    @overload
+    def iter_releases(
+        self,
+        fleet_id: int,
+        filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[True],
+    ) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def iter_releases(
+        self,
+        fleet_id: int,
+        filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[Release | dict[str, Any]]:
+        """Iterate over all releases from a specific fleet.
+
+        Args:
+        ----
+            fleet_id: The fleet ID.
+            filters: Filters to apply to the request (optional).
+            page_size: Number of releases per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+            raw: Yield the JSON decoded rows instead of models (optional).
+
+        Yields:
+        ------
+            Release objects in the fleet with the applied filters (if any).
+
+        """
+        decode = decoder(Release, fields, raw=raw)
+        async for item in self.parent.paginate(
+            "release",
+            params={
+                "$filter": self._fleet_filter(
+                    "belongs_to__application", fleet_id, filters
+                ),
+                "$select": select(Release, fields),
+            },
+            page_size=page_size,
+            query=query,
+        ):
+            yield decode(item)
 
     async def get_releases(
         self,
         fleet_id: int,
         filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
     ) -> list[Release]:
         """Get all releases from a specific fleet.
 
@@ -110,28 +570,92 @@ class FleetResource:
         ----
             fleet_id: The fleet ID.
             filters: Filters to apply to the request (optional).
+            page_size: Number of releases per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
 
         Returns:
         -------
             A list of releases in the fleet with the applied filters (if any).
 
         """
-        if filters is None:
-            response = await self.parent.request(
-                "release",
-                params={"$filter": f"belongs_to__application eq {fleet_id}"},
+        return [
+            item
+            async for item in self.iter_releases(
+                fleet_id, filters, page_size=page_size, fields=fields, query=query
             )
-        else:
-            query = f"belongs_to__application eq {fleet_id}"
-            for key, value in filters.items():
-                query += f" and {key} eq '{value}'"
-            response = await self.parent.request("release", params={"$filter": query})
-        return [Release.from_dict(item) for item in response["d"]]
+        ]
+
+    @overload
+    def iter_services(
+        self,
+        fleet_id: int,
+        filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[False] = False,
+    ) -> AsyncIterator[Service]: ...
+
+    @overload
+    def iter_services(
+        self,
+        fleet_id: int,
+        filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[True],
+    ) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def iter_services(
+        self,
+        fleet_id: int,
+        filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[Service | dict[str, Any]]:
+        """Iterate over all services from a specific fleet.
+
+        Args:
+        ----
+            fleet_id: The fleet ID.
+            filters: Filters to apply to the request (optional).
+            page_size: Number of services per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+            raw: Yield the JSON decoded rows instead of models (optional).
+
+        Yields:
+        ------
+            Service objects in the fleet with the applied filters (if any).
+
+        """
+        decode = decoder(Service, fields, raw=raw)
+        async for item in self.parent.paginate(
+            "service",
+            params={
+                "$filter": self._fleet_filter("application", fleet_id, filters),
+                "$select": select(Service, fields),
+            },
+            page_size=page_size,
+            query=query,
+        ):
+            yield decode(item)
 
     async def get_services(
         self,
         fleet_id: int,
         filters: dict[str, Any] | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
     ) -> list[Service]:
         """Get all services from a specific fleet.
 
@@ -139,23 +663,21 @@ class FleetResource:
         ----
             fleet_id: The fleet ID.
             filters: Filters to apply to the request (optional).
+            page_size: Number of services per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
 
         Returns:
         -------
             A list of services in the fleet with the applied filters (if any).
 
         """
-        if filters is None:
-            response = await self.parent.request(
-                "service",
-                params={"$filter": f"application eq {fleet_id}"},
+        return [
+            item
+            async for item in self.iter_services(
+                fleet_id, filters, page_size=page_size, fields=fields, query=query
             )
-        else:
-            query = f"application eq {fleet_id}"
-            for key, value in filters.items():
-                query += f" and {key} eq '{value}'"
-            response = await self.parent.request("service", params={"$filter": query})
-        return [Service.from_dict(item) for item in response["d"]]
+        ]
 
 
 @dataclass
@@ -164,41 +686,109 @@ class ServiceResource:
 
     parent: Any
 
-    async def get(self, service_id: int) -> Service:
+    async def get(
+        self,
+        service_id: int,
+        *,
+        fields: Sequence[str] | None = None,
+    ) -> Service:
         """Get a service by its ID.
 
         Args:
         ----
             service_id: The service ID.
+            fields: Fields to select instead of the model fields (optional).
 
         Returns:
         -------
             A service object.
 
         """
-        response = await self.parent.request(f"service({service_id})")
+        decode = decoder(Service, fields)
+        response = await self.parent.request(
+            f"service({service_id})",
+            params={"$select": select(Service, fields)},
+        )
         if not response["d"]:
             msg = "No service found with the provided ID."
             raise BalenaCloudResourceNotFoundError(msg)
-        return Service.from_dict(response["d"][0])
+        return decode(response["d"][0])
 
-    async def get_all(
+    async def get_many(
+        self,
+        service_ids: Iterable[int],
+        *,
+        fields: Sequence[str] | None = None,
+    ) -> LookupResult[Service]:
+        """Get many services by their ID with a few requests.
+
+        Args:
+        ----
+            service_ids: The service IDs.
+            fields: Fields to select instead of the model fields (optional).
+
+        Returns:
+        -------
+            The services in the order of the IDs, and the IDs that were not
+            found.
+
+        """
+        return await Lookup(self.parent, "service", Service).get_many(
+            service_ids, fields
+        )
+
+    @overload
+    def iter_all(
         self,
         fleet_id: int | None = None,
         fleet_name: str | None = None,
         fleet_slug: str | None = None,
-    ) -> list[Service]:
-        """Get all services from a fleet.
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[False] = False,
+    ) -> AsyncIterator[Service]: ...
+
+    @overload
+    def iter_all(
+        self,
+        fleet_id: int | None = None,
+        fleet_name: str | None = None,
+        fleet_slug: str | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[True],
+    ) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def iter_all(
+        self,
+        fleet_id: int | None = None,
+        fleet_name: str | None = None,
+        fleet_slug: str | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[Service | dict[str, Any]]:
+        """Iterate over all services from a fleet.
 
         Args:
         ----
             fleet_id: The fleet ID (optional).
             fleet_name: The fleet name (optional).
             fleet_slug: The fleet slug (optional).
+            page_size: Number of services per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+            raw: Yield the JSON decoded rows instead of models (optional).
 
-        Returns:
-        -------
-            A list of services in the fleet.
+        Yields:
+        ------
+            Service objects in the fleet.
 
         """
         if fleet_id is None and fleet_name is None and fleet_slug is None:
@@ -208,15 +798,56 @@ class ServiceResource:
         if fleet_id is not None:
             filter_query = f"application eq {fleet_id}"
         elif fleet_name is not None:
-            filter_query = f"application/app_name eq '{fleet_name}'"
+            filter_query = f"application/app_name eq {literal(fleet_name)}"
         else:
-            filter_query = f"application/slug eq '{fleet_slug}'"
+            filter_query = f"application/slug eq {literal(fleet_slug)}"
 
-        response = await self.parent.request(
+        decode = decoder(Service, fields, raw=raw)
+        async for item in self.parent.paginate(
             "service",
-            params={"$filter": filter_query},
-        )
-        return [Service.from_dict(item) for item in response["d"]]
+            params={"$filter": filter_query, "$select": select(Service, fields)},
+            page_size=page_size,
+            query=query,
+        ):
+            yield decode(item)
+
+    async def get_all(
+        self,
+        fleet_id: int | None = None,
+        fleet_name: str | None = None,
+        fleet_slug: str | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+    ) -> list[Service]:
+        """Get all services from a fleet.
+
+        Args:
+        ----
+            fleet_id: The fleet ID (optional).
+            fleet_name: The fleet name (optional).
+            fleet_slug: The fleet slug (optional).
+            page_size: Number of services per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+
+        Returns:
+        -------
+            A list of services in the fleet.
+
+        """
+        return [
+            item
+            async for item in self.iter_all(
+                fleet_id,
+                fleet_name,
+                fleet_slug,
+                page_size=page_size,
+                fields=fields,
+                query=query,
+            )
+        ]
 
 
 @dataclass
@@ -225,50 +856,147 @@ class FleetServiceVariableResource:
 
     parent: Any
 
-    async def get(self, variable_id: int) -> EnvironmentVariable:
+    async def get(
+        self,
+        variable_id: int,
+        *,
+        fields: Sequence[str] | None = None,
+    ) -> EnvironmentVariable:
         """Get a service environment variable by its ID from a fleet.
 
         Args:
         ----
             variable_id: The variable ID.
+            fields: Fields to select instead of the model fields (optional).
 
         Returns:
         -------
             An environment variable object.
 
         """
+        decode = decoder(EnvironmentVariable, fields)
         response = await self.parent.request(
-            f"service_environment_variable({variable_id})"
+            f"service_environment_variable({variable_id})",
+            params={"$select": select(EnvironmentVariable, fields)},
         )
         if not response["d"]:
             msg = "No fleet service environment variable found with the provided ID."
             raise BalenaCloudResourceNotFoundError(msg)
-        return EnvironmentVariable.from_dict(response["d"][0])
+        return decode(response["d"][0])
+
+    async def get_many(
+        self,
+        variable_ids: Iterable[int],
+        *,
+        fields: Sequence[str] | None = None,
+    ) -> LookupResult[EnvironmentVariable]:
+        """Get many service environment variables by their ID with a few requests.
+
+        Args:
+        ----
+            variable_ids: The variable IDs.
+            fields: Fields to select instead of the model fields (optional).
+
+        Returns:
+        -------
+            The service environment variables in the order of the IDs, and
+            the IDs that were not found.
+
+        """
+        return await Lookup(
+            self.parent, "service_environment_variable", EnvironmentVariable
+        ).get_many(variable_ids, fields)
+
+    @overload
+    def iter_all(
+        self,
+        service_id: int | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[False] = False,
+    ) -> AsyncIterator[EnvironmentVariable]: ...
+
+    @overload
+    def iter_all(
+        self,
+        service_id: int | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[True],
+    ) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def iter_all(
+        self,
+        service_id: int | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[EnvironmentVariable | dict[str, Any]]:
+        """Iterate over all service environment variables from a fleet service.
+
+        Args:
+        ----
+            service_id: The service ID.
+            page_size: Number of variables per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+            raw: Yield the JSON decoded rows instead of models (optional).
+
+        Yields:
+        ------
+            Environment variable objects in the fleet service.
+
+        """
+        if service_id is None:
+            msg = "You must provide a service ID."
+            raise BalenaCloudParameterValidationError(msg)
+
+        decode = decoder(EnvironmentVariable, fields, raw=raw)
+        async for item in self.parent.paginate(
+            "service_environment_variable",
+            params={
+                "$filter": f"service eq {service_id}",
+                "$select": select(EnvironmentVariable, fields),
+            },
+            page_size=page_size,
+            query=query,
+        ):
+            yield decode(item)
 
     async def get_all(
         self,
         service_id: int | None = None,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
     ) -> list[EnvironmentVariable]:
         """Get all service environment variables from a fleet service.
 
         Args:
         ----
             service_id: The service ID.
+            page_size: Number of variables per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
 
         Returns:
         -------
             A list of service environment variables in the fleet service.
 
         """
-        if service_id is None:
-            msg = "You must provide a service ID."
-            raise BalenaCloudParameterValidationError(msg)
-
-        response = await self.parent.request(
-            "service_environment_variable",
-            params={"$filter": f"service eq {service_id}"},
-        )
-        return [EnvironmentVariable.from_dict(item) for item in response["d"]]
+        return [
+            item
+            async for item in self.iter_all(
+                service_id, page_size=page_size, fields=fields, query=query
+            )
+        ]
 
     async def add(
         self,
@@ -307,6 +1035,58 @@ class FleetServiceVariableResource:
             data={"value": str(value)},
         )
 
+    async def upsert(
+        self,
+        service_id: int,
+        name: str,
+        value: object,
+    ) -> EnvironmentVariable | None:
+        """Add or update a service environment variable of a fleet.
+
+        Args:
+        ----
+            service_id: The service ID.
+            name: The variable name.
+            value: The new value.
+
+        Returns:
+        -------
+            The created object, or None when an existing one was updated.
+
+        """
+        try:
+            return await self.add(service_id, name, value)
+        except BalenaCloudConflictError:
+            await self.parent.request(
+                "service_environment_variable",
+                method=METH_PATCH,
+                params={
+                    "$filter": f"service eq {service_id} and name eq {literal(name)}"
+                },
+                data={"value": str(value)},
+            )
+        return None
+
+    async def bulk_upsert(
+        self,
+        items: Iterable[tuple[int, str, object]],
+        *,
+        concurrency: int = 32,
+    ) -> list[BulkResult]:
+        """Add or update many fleet service environment variables concurrently.
+
+        Args:
+        ----
+            items: Tuples of the service ID, variable name and value.
+            concurrency: The maximum number of concurrent requests.
+
+        Returns:
+        -------
+            A result for every item, failed items contain the raised error.
+
+        """
+        return await run_bulk(items, self.upsert, concurrency=concurrency)
+
     async def remove(self, variable_id: int) -> None:
         """Remove a service environment variable from a fleet.
 
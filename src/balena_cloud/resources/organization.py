@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any, Literal, overload
 
+from balena_cloud.decoding import decoder
 from balena_cloud.exceptions import (
     BalenaCloudParameterValidationError,
     BalenaCloudResourceNotFoundError,
 )
 from balena_cloud.models import Fleet, Organization
+from balena_cloud.odata import Query, literal, select
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
 
 
 @dataclass
@@ -18,21 +23,90 @@ class OrganizationResource:
 
     parent: Any
 
-    async def get_all(self) -> list[Organization]:
+    @overload
+    def iter_all(
+        self,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[False] = False,
+    ) -> AsyncIterator[Organization]: ...
+
+    @overload
+    def iter_all(
+        self,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[True],
+    ) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def iter_all(
+        self,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[Organization | dict[str, Any]]:
+        """Iterate over all organizations that is authorized by the user.
+
+        Args:
+        ----
+            page_size: Number of organizations per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+            raw: Yield the JSON decoded rows instead of models (optional).
+
+        Yields:
+        ------
+            Organization objects, one page at a time.
+
+        """
+        decode = decoder(Organization, fields, raw=raw)
+        async for item in self.parent.paginate(
+            "organization",
+            params={"$select": select(Organization, fields)},
+            page_size=page_size,
+            query=query,
+        ):
+            yield decode(item)
+
+    async def get_all(
+        self,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+    ) -> list[Organization]:
         """Get all organizations that is authorized by the user.
 
-        Returns
+        Args:
+        ----
+            page_size: Number of organizations per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+
+        Returns:
         -------
             A list of organizations.
 
         """
-        response = await self.parent.request("organization")
-        return [Organization.from_dict(item) for item in response["d"]]
+        return [
+            item
+            async for item in self.iter_all(
+                page_size=page_size, fields=fields, query=query
+            )
+        ]
 
     async def get(
         self,
         org_id: int | None = None,
         org_handle: str | None = None,
+        *,
+        fields: Sequence[str] | None = None,
     ) -> Organization:
         """Get an organization by its ID or handle.
 
@@ -40,6 +114,7 @@ class OrganizationResource:
         ----
             org_id: The organization ID (optional).
             org_handle: The organization handle (optional).
+            fields: Fields to select instead of the model fields (optional).
 
         Returns:
         -------
@@ -50,29 +125,104 @@ class OrganizationResource:
             msg = "You must provide either an organization ID or handle."
             raise BalenaCloudParameterValidationError(msg)
 
+        decode = decoder(Organization, fields)
+        params = {"$select": select(Organization, fields)}
         if org_id is not None:
-            response = await self.parent.request(f"organization({org_id})")
+            response = await self.parent.request(
+                f"organization({org_id})", params=params
+            )
         else:
-            response = await self.parent.request(f"organization(handle='{org_handle}')")
+            response = await self.parent.request(
+                f"organization(handle={literal(org_handle)})", params=params
+            )
         if not response["d"]:
             msg = "No organization found with the provided ID or handle."
             raise BalenaCloudResourceNotFoundError(msg)
-        return Organization.from_dict(response["d"][0])
+        return decode(response["d"][0])
+
+    @overload
+    def iter_fleets(
+        self,
+        org_handle: str,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[False] = False,
+    ) -> AsyncIterator[Fleet]: ...
+
+    @overload
+    def iter_fleets(
+        self,
+        org_handle: str,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: Literal[True],
+    ) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def iter_fleets(
+        self,
+        org_handle: str,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[Fleet | dict[str, Any]]:
+        """Iterate over all fleets from an organization.
+
+        Args:
+        ----
+            org_handle: The organization handle.
+            page_size: Number of fleets per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
+            raw: Yield the JSON decoded rows instead of models (optional).
 
-    async def get_fleets(self, org_handle: str) -> list[Fleet]:
+        Yields:
+        ------
+            Fleet objects, one page at a time.
+
+        """
+        decode = decoder(Fleet, fields, raw=raw)
+        async for item in self.parent.paginate(
+            "application",
+            params={
+                "$filter": f"organization/any(o:o/handle eq {literal(org_handle)})",
+                "$select": select(Fleet, fields),
+            },
+            page_size=page_size,
+            query=query,
+        ):
+            yield decode(item)
+
+    async def get_fleets(
+        self,
+        org_handle: str,
+        *,
+        page_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        query: Query | None = None,
+    ) -> list[Fleet]:
         """Get all fleets from an organization.
 
         Args:
         ----
             org_handle: The organization handle.
+            page_size: Number of fleets per request (optional).
+            fields: Fields to select instead of the model fields (optional).
+            query: Filter, ordering and row limit of the request (optional).
 
         Returns:
         -------
             A list of organization fleets.
 
         """
-        response = await self.parent.request(
-            "application",
-            params={"$filter": f"organization/any(o:o/handle eq '{org_handle}')"},
-        )
-        return [Fleet.from_dict(item) for item in response["d"]]
+        return [
+            item
+            async for item in self.iter_fleets(
+                org_handle, page_size=page_size, fields=fields, query=query
+            )
+        ]
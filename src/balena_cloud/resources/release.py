@@ -3,12 +3,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from aiohttp.hdrs import METH_DELETE
 
+from balena_cloud.decoding import decoder
 from balena_cloud.exceptions import BalenaCloudResourceNotFoundError
+from balena_cloud.lookup import Lookup, LookupResult
 from balena_cloud.models import Release
+from balena_cloud.odata import select
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
 
 
 @dataclass
@@ -17,23 +23,56 @@ class ReleaseResource:
 
     parent: Any
 
-    async def get(self, release_id: int) -> Release:
+    async def get(
+        self,
+        release_id: int,
+        *,
+        fields: Sequence[str] | None = None,
+    ) -> Release:
         """Get a release by its ID.
 
         Args:
         ----
             release_id: The release ID.
+            fields: Fields to select instead of the model fields (optional).
 
         Returns:
         -------
             A release object.
 
         """
-        response = await self.parent.request(f"release({release_id})")
+        decode = decoder(Release, fields)
+        response = await self.parent.request(
+            f"release({release_id})",
+            params={"$select": select(Release, fields)},
+        )
         if not response["d"]:
             msg = "No release found with the provided ID."
             raise BalenaCloudResourceNotFoundError(msg)
-        return Release.from_dict(response["d"][0])
+        return decode(response["d"][0])
+
+    async def get_many(
+        self,
+        release_ids: Iterable[int],
+        *,
+        fields: Sequence[str] | None = None,
+    ) -> LookupResult[Release]:
+        """Get many releases by their ID with a few requests.
+
+        Args:
+        ----
+            release_ids: The release IDs.
+            fields: Fields to select instead of the model fields (optional).
+
+        Returns:
+        -------
+            The releases in the order of the IDs, and the IDs that were not
+            found.
+
+        """
+        return await Lookup(self.parent, "release", Release).get_many(
+            release_ids, fields
+        )
 
     async def remove(self, release_id: int) -> None:
         """Remove a release.
@@ -0,0 +1,157 @@
+"""Retry policy for requests to the Balena Cloud API."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from aiohttp.hdrs import METH_DELETE, METH_GET, METH_HEAD, METH_OPTIONS, METH_PUT
+
+from .exceptions import (
+    BalenaCloudConnectionError,
+    BalenaCloudError,
+    BalenaCloudResponseError,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from .middleware import Handler, Request
+
+IDEMPOTENT_METHODS = frozenset(
+    {METH_DELETE, METH_GET, METH_HEAD, METH_OPTIONS, METH_PUT}
+)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse the value of a `Retry-After` header.
+
+    Args:
+    ----
+        value: The header value, in seconds or as an HTTP date.
+
+    Returns:
+    -------
+        The number of seconds to wait, or None when it can not be parsed.
+
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((moment - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+@dataclass
+class RetryPolicy:
+    """Retry failed requests with exponential backoff.
+
+    Timeouts, connection errors and the `retry_statuses` responses are
+    retried, only for `methods` (idempotent methods by default). The delay
+    doubles every attempt up to `backoff_cap`, with full jitter, unless the
+    API asks for a delay with the `Retry-After` header. A request is not
+    retried when that delay is longer than `max_retry_after`, the error is
+    raised instead. The `on_retry` hook is called before every retry with
+    the attempt, the delay and the error.
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_cap: float = 30.0
+    max_retry_after: float = 60.0
+    jitter: bool = True
+    retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+    methods: frozenset[str] = IDEMPOTENT_METHODS
+    on_retry: Callable[[int, float, BalenaCloudError], Any] | None = field(
+        default=None, compare=False
+    )
+
+    def should_retry(
+        self,
+        method: str,
+        exception: BalenaCloudError,
+        attempt: int,
+    ) -> bool:
+        """Return whether a failed attempt should be retried.
+
+        Args:
+        ----
+            method: HTTP method of the request.
+            exception: The error of the failed attempt.
+            attempt: The number of the failed attempt, starting at 1.
+
+        Returns:
+        -------
+            True when the request should be sent again.
+
+        """
+        if attempt >= self.max_attempts or method not in self.methods:
+            return False
+        retry_after = getattr(exception, "retry_after", None)
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return False
+        if isinstance(exception, BalenaCloudResponseError):
+            return exception.status in self.retry_statuses
+        return isinstance(exception, BalenaCloudConnectionError)
+
+    def delay(self, attempt: int, exception: BalenaCloudError) -> float:
+        """Get the number of seconds to wait before the next attempt.
+
+        Args:
+        ----
+            attempt: The number of the failed attempt, starting at 1.
+            exception: The error of the failed attempt.
+
+        Returns:
+        -------
+            The delay in seconds.
+
+        """
+        retry_after = getattr(exception, "retry_after", None)
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)  # noqa: S311
+        return delay
+
+    async def __call__(self, request: Request, call_next: Handler) -> Any:
+        """Send a request along the middleware chain, with retries."""
+        return await self.run(request.method, partial(call_next, request))
+
+    async def run(self, method: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a request and retry it according to this policy.
+
+        Args:
+        ----
+            method: HTTP method of the request.
+            call: Coroutine function that sends the request.
+
+        Returns:
+        -------
+            The result of the first successful attempt.
+
+        """
+        attempt = 1
+        while True:
+            try:
+                return await call()
+            except BalenaCloudError as exception:
+                if not self.should_retry(method, exception, attempt):
+                    raise
+                delay = self.delay(attempt, exception)
+                if self.on_retry is not None:
+                    self.on_retry(attempt, delay, exception)
+                await asyncio.sleep(delay)
+                attempt += 1
@@ -0,0 +1,130 @@
+"""Snapshot of the state of a complete fleet."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .index import DeviceIndex
+from .models import Device
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+
+def _group(rows: Iterable[dict[str, Any]], key: str) -> dict[int, list[dict[str, Any]]]:
+    """Group related rows by the `__id` of the parent they refer to."""
+    groups: dict[int, list[dict[str, Any]]] = {}
+    for row in rows:
+        if reference := row.get(key):
+            groups.setdefault(reference["__id"], []).append(row)
+    return groups
+
+
+@dataclass(slots=True)
+class FleetSnapshot:
+    """The devices of a fleet, with their related collections filled in.
+
+    Every device has its tags, environment variables and service installs,
+    with the service variables of the installs, so no further requests are
+    needed to inspect the fleet. The devices are kept in a `DeviceIndex`
+    for lookups by ID, UUID, name, status, tag and online state.
+    """
+
+    fleet_id: int
+    devices: DeviceIndex = field(default_factory=DeviceIndex)
+
+    @classmethod
+    def from_rows(
+        cls,
+        fleet_id: int,
+        devices: Iterable[dict[str, Any]],
+        related: Mapping[str, Iterable[dict[str, Any]]] | None = None,
+    ) -> FleetSnapshot:
+        """Join the rows of the collection requests of a fleet.
+
+        The related rows refer to their device (or service install) by the
+        `__id` of the foreign key, for example, `{"device": {"__id": 1}}`.
+
+        Args:
+        ----
+            fleet_id: The fleet ID.
+            devices: JSON decoded device rows.
+            related: JSON decoded rows of the related collections by their
+                name, 'tags', 'environment_variables', 'service_installs'
+                and 'service_variables' (optional).
+
+        Returns:
+        -------
+            A fleet snapshot.
+
+        """
+        related = related or {}
+        # New rows are built, the decoded rows may be shared with a cache.
+        # Related rows of a parent that is not in the snapshot, for example,
+        # a device that was added between the requests, are left out.
+        variables = _group(related.get("service_variables", ()), "service_install")
+        installs = _group(
+            (
+                {
+                    **row,
+                    "device_service_environment_variable": variables.get(row["id"], []),
+                }
+                for row in related.get("service_installs", ())
+            ),
+            "device",
+        )
+        device_tags = _group(related.get("tags", ()), "device")
+        device_variables = _group(related.get("environment_variables", ()), "device")
+        return cls(
+            fleet_id,
+            DeviceIndex.from_devices(
+                Device.from_dict(
+                    {
+                        **row,
+                        "device_tag": device_tags.get(row["id"], []),
+                        "device_environment_variable": device_variables.get(
+                            row["id"], []
+                        ),
+                        "service_install": installs.get(row["id"], []),
+                    }
+                )
+                for row in devices
+            ),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of devices."""
+        return len(self.devices)
+
+    def __iter__(self) -> Iterator[Device]:
+        """Iterate over the devices."""
+        return iter(self.devices)
+
+    def get(self, device_id: int) -> Device | None:
+        """Get a device by its ID.
+
+        Args:
+        ----
+            device_id: The device ID.
+
+        Returns:
+        -------
+            The device, or None if it is not part of the snapshot.
+
+        """
+        return self.devices.get(device_id)
+
+    def get_by_uuid(self, device_uuid: str) -> Device | None:
+        """Get a device by its UUID.
+
+        Args:
+        ----
+            device_uuid: The device UUID.
+
+        Returns:
+        -------
+            The device, or None if it is not part of the snapshot.
+
+        """
+        return self.devices.get_by_uuid(device_uuid)
@@ -0,0 +1,122 @@
+"""Persistent storage of device syncs."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+import orjson
+
+from .index import DeviceIndex
+from .models import Device
+
+if TYPE_CHECKING:
+    from os import PathLike
+
+    from .sync import DeviceSync
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fleet (
+    fleet_id INTEGER PRIMARY KEY,
+    watermark TEXT,
+    saved_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS device (
+    fleet_id INTEGER NOT NULL,
+    device_id INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (fleet_id, device_id)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class SnapshotStore:
+    """Store the devices and watermark of device syncs in a SQLite database.
+
+    Loading a stored sync on startup and polling it afterwards only requests
+    the changes since it was saved, instead of downloading the whole fleet
+    again. The database is accessed in a worker thread, so the event loop is
+    not blocked.
+    """
+
+    path: str | PathLike[str]
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def _save(
+        self, fleet_id: int, watermark: str | None, rows: list[tuple[int, bytes]]
+    ) -> None:
+        with closing(self._connect()) as connection:
+            connection.execute("DELETE FROM device WHERE fleet_id = ?", (fleet_id,))
+            connection.executemany(
+                "INSERT INTO device (fleet_id, device_id, data) VALUES (?, ?, ?)",
+                ((fleet_id, device_id, data) for device_id, data in rows),
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO fleet (fleet_id, watermark, saved_at) "
+                "VALUES (?, ?, ?)",
+                (fleet_id, watermark, time.time()),
+            )
+            # On an error the connection is closed without a commit, which
+            # rolls the transaction back.
+            connection.commit()
+
+    def _load(self, fleet_id: int) -> tuple[str | None, DeviceIndex] | None:
+        with closing(self._connect()) as connection:
+            fleet = connection.execute(
+                "SELECT watermark FROM fleet WHERE fleet_id = ?", (fleet_id,)
+            ).fetchone()
+            if fleet is None:
+                return None
+            rows = connection.execute(
+                "SELECT data FROM device WHERE fleet_id = ?", (fleet_id,)
+            ).fetchall()
+        return fleet[0], DeviceIndex.from_devices(
+            Device.from_dict(orjson.loads(data)) for (data,) in rows
+        )
+
+    async def save(self, sync: DeviceSync) -> None:
+        """Save the devices and the watermark of a device sync.
+
+        Args:
+        ----
+            sync: The device sync, the previous save of its fleet is replaced.
+
+        """
+        rows = [
+            (device.id, orjson.dumps(device.to_dict(by_alias=True)))
+            for device in sync.devices
+        ]
+        watermark = None if sync.watermark is None else sync.watermark.isoformat()
+        await asyncio.to_thread(self._save, sync.fleet_id, watermark, rows)
+
+    async def load(self, sync: DeviceSync) -> bool:
+        """Restore the devices and the watermark of a device sync.
+
+        Args:
+        ----
+            sync: The device sync, its devices are replaced when the fleet
+                was saved before.
+
+        Returns:
+        -------
+            Whether the fleet of the sync was found in the store.
+
+        """
+        stored = await asyncio.to_thread(self._load, sync.fleet_id)
+        if stored is None:
+            return False
+        watermark, sync.devices = stored
+        sync.watermark = (
+            None if watermark is None else datetime.fromisoformat(watermark)
+        )
+        return True
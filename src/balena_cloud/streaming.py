@@ -0,0 +1,132 @@
+"""Incremental parsing of Balena Cloud API collection responses."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+import orjson
+
+from .exceptions import BalenaCloudError
+
+_ENVELOPE = re.compile(rb'"d"\s*:\s*\[')
+_TOKEN = re.compile(rb'[\[\]{}"]')
+_STRING_END = re.compile(rb'["\\]')
+
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+_OPEN = b"[{"
+
+
+@dataclass
+class RowParser:
+    """Parse the rows of a `{"d": [...]}` response while it is received.
+
+    Feed the chunks of the response body to `feed`, which returns the rows
+    that are complete so far, decoded with orjson. Only the row that is
+    being received is buffered, so the memory use does not depend on the
+    size of the whole response.
+    """
+
+    done: bool = False
+
+    _buffer: bytearray = field(default_factory=bytearray)
+    _position: int = 0
+    _row_start: int = -1
+    _depth: int = 0
+    _started: bool = False
+    _in_string: bool = False
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Parse a chunk of the response body.
+
+        Args:
+        ----
+            chunk: The next bytes of the response body.
+
+        Returns:
+        -------
+            The JSON decoded rows that were completed by this chunk.
+
+        """
+        buffer = self._buffer
+        buffer += chunk
+        rows: list[Any] = []
+        if self.done:
+            return rows
+        if not self._started:
+            match = _ENVELOPE.search(buffer)
+            if match is None:
+                return rows
+            del buffer[: match.end()]
+            self._started = True
+
+        position = self._scan(buffer, self._position, rows)
+
+        # Drop everything before the row that is still being received.
+        keep = self._row_start if self._row_start >= 0 else position
+        del buffer[:keep]
+        self._position = position - keep
+        self._row_start = min(0, self._row_start)
+        return rows
+
+    def _scan(self, buffer: bytearray, position: int, rows: list[Any]) -> int:
+        """Scan the buffer for complete rows, return where scanning stopped."""
+        while not self.done:
+            if self._in_string:
+                position, complete = self._skip_string(buffer, position)
+                if not complete:
+                    break
+                continue
+
+            match = _TOKEN.search(buffer, position)
+            if match is None:
+                return len(buffer)
+            index = match.start()
+            token = buffer[index]
+            position = index + 1
+            if token == _QUOTE:
+                self._in_string = True
+            elif token in _OPEN:
+                if self._depth == 0:
+                    self._row_start = index
+                self._depth += 1
+            elif self._depth == 0:
+                # The end of the array with the rows.
+                self.done = True
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    rows.append(orjson.loads(buffer[self._row_start : position]))
+                    self._row_start = -1
+        return position
+
+    def _skip_string(self, buffer: bytearray, position: int) -> tuple[int, bool]:
+        """Skip to the end of a string or escape sequence.
+
+        Returns the position to continue from and whether the buffer had
+        enough data, or if scanning must wait for the next chunk.
+        """
+        match = _STRING_END.search(buffer, position)
+        if match is None:
+            return len(buffer), False
+        if buffer[match.start()] == _BACKSLASH:
+            if match.end() == len(buffer):
+                # Wait for the escaped character in the next chunk.
+                return match.start(), False
+            return match.end() + 1, True
+        self._in_string = False
+        return match.end(), True
+
+    def close(self) -> None:
+        """Check that the complete response was parsed.
+
+        Raises
+        ------
+            BalenaCloudError: If the response ended before the end of the rows.
+
+        """
+        if not self.done:
+            msg = "Incomplete collection response from the Balena Cloud API."
+            raise BalenaCloudError(msg, {"Response": bytes(self._buffer[:200])})
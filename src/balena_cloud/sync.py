@@ -0,0 +1,136 @@
+"""Incremental synchronization of the devices of a fleet."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Literal
+
+from .index import DeviceIndex
+from .models import Device
+from .odata import Field, model_fields
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from .odata import Filter
+
+DeviceEventKind = Literal["added", "changed", "removed"]
+
+
+@dataclass(slots=True)
+class DeviceEvent:
+    """Class to represent a change of a device found by a device sync."""
+
+    kind: DeviceEventKind
+    device: Device
+
+
+@dataclass
+class DeviceSync:
+    """Keep a local copy of the devices of a fleet up to date.
+
+    The first poll loads the whole fleet. Every next poll only requests the
+    devices that were modified since the newest modification seen so far
+    (the watermark), together with the IDs of the fleet to find removed
+    devices, so the size of a poll depends on the number of changes rather
+    than on the size of the fleet.
+    """
+
+    parent: Any
+    fleet_id: int
+    devices: DeviceIndex = field(default_factory=DeviceIndex)
+    watermark: datetime | None = None
+    watermark_field: str = "modified_at"
+    detect_removals: bool = True
+    page_size: int | None = None
+
+    def _fleet_filter(self) -> Filter:
+        return Field("belongs_to__application").eq(self.fleet_id)
+
+    async def _rows(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        return [
+            item
+            async for item in self.parent.paginate(
+                "device", params=params, page_size=self.page_size
+            )
+        ]
+
+    async def poll(self) -> list[DeviceEvent]:
+        """Request the changes since the last poll and apply them.
+
+        Devices are compared to the local copy, so a device that is returned
+        again without changes, for example, because it was modified at the
+        same time as the watermark, does not cause an event.
+
+        Returns
+        -------
+            The added, changed and removed devices, in that order.
+
+        """
+        changes = self._fleet_filter()
+        full = self.watermark is None
+        if not full:
+            # Greater or equal, to not miss changes made in the same instant.
+            changes &= Field(self.watermark_field).ge(self.watermark)
+        request = self._rows(
+            {
+                "$filter": str(changes),
+                "$select": ",".join([*model_fields(Device), self.watermark_field]),
+            }
+        )
+        ids: set[int] | None = None
+        if full or not self.detect_removals:
+            rows = await request
+        else:
+            rows, fleet = await asyncio.gather(
+                request,
+                self._rows({"$filter": str(self._fleet_filter()), "$select": "id"}),
+            )
+            ids = {row["id"] for row in fleet}
+
+        added: list[DeviceEvent] = []
+        changed: list[DeviceEvent] = []
+        for row in rows:
+            if (modified := row.get(self.watermark_field)) is not None:
+                modified = datetime.fromisoformat(modified)
+                if self.watermark is None or modified > self.watermark:
+                    self.watermark = modified
+            device = Device.from_dict(row)
+            current = self.devices.get(device.id)
+            if current is None:
+                added.append(DeviceEvent("added", device))
+            elif current != device:
+                changed.append(DeviceEvent("changed", device))
+            else:
+                continue
+            self.devices.add(device)
+
+        removed: list[DeviceEvent] = []
+        if full or ids is not None:
+            # A full poll returns every device. Devices added while the IDs
+            # were requested are part of the changes, so count those too.
+            ids = {*(ids or ()), *(row["id"] for row in rows)}
+            for device in list(self.devices):
+                if device.id not in ids:
+                    self.devices.remove(device.id)
+                    removed.append(DeviceEvent("removed", device))
+        return [*added, *changed, *removed]
+
+    async def watch(self, interval: float = 30.0) -> AsyncIterator[DeviceEvent]:
+        """Poll the fleet for changes until the iteration is stopped.
+
+        Args:
+        ----
+            interval: Seconds to wait between the polls.
+
+        Yields:
+        ------
+            The device events of every poll.
+
+        """
+        while True:
+            for event in await self.poll():
+                yield event
+            await asyncio.sleep(interval)
@@ -0,0 +1,273 @@
+"""Columnar device table for fleet-scale analytics."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass, field
+from itertools import compress
+from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple
+
+from .exceptions import BalenaCloudParameterValidationError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+
+class DeviceRow(NamedTuple):
+    """A single device of a device table."""
+
+    id: int
+    uuid: str
+    name: str
+    status: str
+    is_online: bool
+    latitude: float
+    longitude: float
+
+
+def _coordinate(value: Any) -> float:
+    """Convert a coordinate of the API, which is a string, to a float."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+@dataclass(slots=True)
+class DeviceTable:
+    """Devices stored column by column instead of as one object per device.
+
+    The ids, online flags and coordinates are kept in compact typed arrays
+    and the strings in lists, which takes a fraction of the memory of
+    `Device` objects for large fleets. Filtering and sorting return a new
+    table, missing coordinates are NaN.
+    """
+
+    FIELDS: ClassVar[tuple[str, ...]] = (
+        "id",
+        "uuid",
+        "device_name",
+        "status",
+        "is_online",
+        "latitude",
+        "longitude",
+    )
+
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        "ids",
+        "uuids",
+        "names",
+        "statuses",
+        "is_online",
+        "latitudes",
+        "longitudes",
+    )
+
+    ids: array[int] = field(default_factory=lambda: array("q"))
+    uuids: list[str] = field(default_factory=list)
+    names: list[str] = field(default_factory=list)
+    statuses: list[str] = field(default_factory=list)
+    is_online: array[int] = field(default_factory=lambda: array("b"))
+    latitudes: array[float] = field(default_factory=lambda: array("d"))
+    longitudes: array[float] = field(default_factory=lambda: array("d"))
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict[str, Any]]) -> DeviceTable:
+        """Create a table from the device rows of the API.
+
+        Args:
+        ----
+            rows: JSON decoded device rows with (at least) the table fields.
+
+        Returns:
+        -------
+            A device table.
+
+        """
+        table = cls()
+        for row in rows:
+            table.append(row)
+        return table
+
+    def append(self, row: dict[str, Any]) -> None:
+        """Add a device row of the API to the table.
+
+        Args:
+        ----
+            row: JSON decoded device row with (at least) the table fields.
+
+        """
+        self.ids.append(row["id"])
+        self.uuids.append(row["uuid"])
+        self.names.append(row["device_name"])
+        self.statuses.append(row["status"])
+        self.is_online.append(bool(row["is_online"]))
+        self.latitudes.append(_coordinate(row["latitude"]))
+        self.longitudes.append(_coordinate(row["longitude"]))
+
+    def __len__(self) -> int:
+        """Return the number of devices."""
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> DeviceRow:
+        """Return the device at an index."""
+        return DeviceRow(
+            self.ids[index],
+            self.uuids[index],
+            self.names[index],
+            self.statuses[index],
+            bool(self.is_online[index]),
+            self.latitudes[index],
+            self.longitudes[index],
+        )
+
+    def __iter__(self) -> Iterator[DeviceRow]:
+        """Iterate over the devices."""
+        for row in zip(
+            self.ids,
+            self.uuids,
+            self.names,
+            self.statuses,
+            map(bool, self.is_online),
+            self.latitudes,
+            self.longitudes,
+            strict=True,
+        ):
+            yield DeviceRow(*row)
+
+    def take(self, indices: Iterable[int]) -> DeviceTable:
+        """Create a table with the devices at the given indices.
+
+        Args:
+        ----
+            indices: Indices of the devices, in the order of the new table.
+
+        Returns:
+        -------
+            A new device table.
+
+        """
+        indices = list(indices)
+        return DeviceTable(
+            array("q", map(self.ids.__getitem__, indices)),
+            list(map(self.uuids.__getitem__, indices)),
+            list(map(self.names.__getitem__, indices)),
+            list(map(self.statuses.__getitem__, indices)),
+            array("b", map(self.is_online.__getitem__, indices)),
+            array("d", map(self.latitudes.__getitem__, indices)),
+            array("d", map(self.longitudes.__getitem__, indices)),
+        )
+
+    def mask(self, mask: Iterable[bool]) -> DeviceTable:
+        """Create a table with the devices for which the mask is true.
+
+        Args:
+        ----
+            mask: A boolean for every device in the table.
+
+        Returns:
+        -------
+            A new device table.
+
+        """
+        return self.take(compress(range(len(self.ids)), mask))
+
+    def filter(
+        self,
+        *,
+        status: str | None = None,
+        is_online: bool | None = None,
+        predicate: Callable[[DeviceRow], bool] | None = None,
+    ) -> DeviceTable:
+        """Create a table with the devices that match all given conditions.
+
+        Args:
+        ----
+            status: The status the devices must have (optional).
+            is_online: Whether the devices must be online or not (optional).
+            predicate: Function that selects the devices to keep (optional).
+
+        Returns:
+        -------
+            A new device table.
+
+        """
+        indices: Iterable[int] = range(len(self.ids))
+        if status is not None:
+            indices = [i for i in indices if self.statuses[i] == status]
+        if is_online is not None:
+            indices = [i for i in indices if self.is_online[i] == is_online]
+        if predicate is not None:
+            indices = [i for i in indices if predicate(self[i])]
+        return self.take(indices)
+
+    def within(
+        self,
+        latitude: tuple[float, float],
+        longitude: tuple[float, float],
+    ) -> DeviceTable:
+        """Create a table with the devices within a bounding box.
+
+        Args:
+        ----
+            latitude: The minimum and maximum latitude.
+            longitude: The minimum and maximum longitude.
+
+        Returns:
+        -------
+            A new device table, without the devices without coordinates.
+
+        """
+        (south, north), (west, east) = latitude, longitude
+        return self.mask(
+            south <= lat <= north and west <= lon <= east
+            for lat, lon in zip(self.latitudes, self.longitudes, strict=True)
+        )
+
+    def sort_by(self, column: str, *, reverse: bool = False) -> DeviceTable:
+        """Create a table sorted by one of the columns.
+
+        Devices without coordinates are last when sorting by a coordinate,
+        in both orders.
+
+        Args:
+        ----
+            column: Name of the column, for example, 'statuses' or 'ids'.
+            reverse: Sort in descending order.
+
+        Returns:
+        -------
+            A new device table.
+
+        Raises:
+        ------
+            BalenaCloudParameterValidationError: If the column does not exist.
+
+        """
+        if column not in self.COLUMNS:
+            msg = f"Unknown device table column: {column}."
+            raise BalenaCloudParameterValidationError(msg)
+        values = getattr(self, column)
+        indices = list(range(len(values)))
+        missing = []
+        if column in {"latitudes", "longitudes"}:
+            # NaN does not compare, so it would end up anywhere in the order.
+            missing = [index for index in indices if math.isnan(values[index])]
+            indices = [index for index in indices if not math.isnan(values[index])]
+        return self.take(
+            [*sorted(indices, key=values.__getitem__, reverse=reverse), *missing]
+        )
+
+    def count_by_status(self) -> dict[str, int]:
+        """Count the devices per status.
+
+        Returns
+        -------
+            The number of devices for every status.
+
+        """
+        counts: dict[str, int] = {}
+        for status in self.statuses:
+            counts[status] = counts.get(status, 0) + 1
+        return counts
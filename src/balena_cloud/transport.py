@@ -0,0 +1,439 @@
+"""Transports that send the HTTP requests of the Balena Cloud client."""
+
+from __future__ import annotations
+
+import socket
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Protocol, Self
+
+import orjson
+from aiohttp import ClientError, TCPConnector
+from aiohttp.hdrs import CONTENT_TYPE, METH_GET
+from multidict import CIMultiDict
+
+from .exceptions import BalenaCloudConnectionError
+
+try:
+    import httpx  # ty:ignore[unresolved-import]
+except ImportError:
+    httpx: Any = None
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from aiohttp import ClientResponse, ClientSession
+    from yarl import URL
+
+# Size of the chunks in which an in-memory response body is streamed.
+MEMORY_CHUNK_SIZE = 2**16
+
+
+class TransportResponse(Protocol):
+    """Response of a transport, of which the body is read on demand."""
+
+    @property
+    def status(self) -> int:
+        """Return the HTTP status code."""
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        """Return the case-insensitive response headers."""
+
+    async def read(self) -> bytes:
+        """Read the whole body."""
+
+    async def read_chunk(self) -> bytes:
+        """Read the next part of the body, an empty chunk at the end."""
+
+    async def release(self) -> None:
+        """Release the connection without reading the rest of the body."""
+
+
+class Transport(Protocol):
+    """Sends the requests of the client, see `BalenaCloud.transport`.
+
+    A transport returns a response for every status code and raises
+    `BalenaCloudConnectionError` when the request could not be sent, the
+    client handles the status codes and the timeout.
+    """
+
+    async def request(
+        self,
+        method: str,
+        url: URL,
+        *,
+        headers: dict[str, str],
+        data: bytes | None,
+    ) -> TransportResponse:
+        """Send a request and wait for the status and headers of the response."""
+
+    async def close(self) -> None:
+        """Close the connections of the transport."""
+
+
+def _connection_error() -> BalenaCloudConnectionError:
+    msg = "Error occurred while connecting to the Balena Cloud API."
+    return BalenaCloudConnectionError(msg)
+
+
+@dataclass(slots=True)
+class AiohttpResponse:
+    """Response of the aiohttp transport."""
+
+    response: ClientResponse
+
+    @property
+    def status(self) -> int:
+        """Return the HTTP status code."""
+        return self.response.status
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        """Return the case-insensitive response headers."""
+        return self.response.headers
+
+    async def read(self) -> bytes:
+        """Read the whole body."""
+        try:
+            return await self.response.read()
+        except ClientError as exception:
+            raise _connection_error() from exception
+
+    async def read_chunk(self) -> bytes:
+        """Read the next part of the body, an empty chunk at the end."""
+        try:
+            return await self.response.content.readany()
+        except ClientError as exception:
+            raise _connection_error() from exception
+
+    async def release(self) -> None:
+        """Release the connection without reading the rest of the body."""
+        self.response.release()
+
+
+@dataclass(slots=True)
+class ConnectorOptions:
+    """Class to represent the connection pool of the session of the client.
+
+    It configures the `TCPConnector` of the session that `BalenaCloud`
+    creates when no `session` is passed.
+    """
+
+    limit: int = 100
+    limit_per_host: int = 100
+    dns_cache_ttl: int = 300
+    keepalive_timeout: float = 30.0
+
+    def connector(self) -> TCPConnector:
+        """Create a connector with these options.
+
+        Returns
+        -------
+            A connector that keeps and reuses the connections.
+
+        """
+        return TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+
+
+@dataclass
+class AiohttpTransport:
+    """Send requests over HTTP/1.1 with an aiohttp client session.
+
+    This is the default transport, its connection pool is configured with
+    the `ConnectorOptions` of `BalenaCloud`. Concurrent requests use one
+    connection each.
+    """
+
+    session: ClientSession
+
+    async def request(
+        self,
+        method: str,
+        url: URL,
+        *,
+        headers: dict[str, str],
+        data: bytes | None,
+    ) -> AiohttpResponse:
+        """Send a request and wait for the status and headers of the response.
+
+        Args:
+        ----
+            method: HTTP method to use.
+            url: The absolute URL of the request, with its query.
+            headers: The headers of the request.
+            data: The encoded body of the request.
+
+        Returns:
+        -------
+            The response, of which the body is not read yet.
+
+        Raises:
+        ------
+            BalenaCloudConnectionError: If a connection error occurs.
+
+        """
+        try:
+            response = await self.session.request(
+                method, url, headers=headers, data=data, ssl=True
+            )
+        except (ClientError, socket.gaierror) as exception:
+            raise _connection_error() from exception
+        return AiohttpResponse(response)
+
+    async def close(self) -> None:
+        """Close the client session."""
+        await self.session.close()
+
+
+@dataclass(slots=True)
+class HTTP2Response:
+    """Response of the HTTP/2 transport."""
+
+    response: Any
+    _chunks: Any = None
+
+    @property
+    def status(self) -> int:
+        """Return the HTTP status code."""
+        return self.response.status_code
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        """Return the case-insensitive response headers."""
+        return self.response.headers
+
+    async def read(self) -> bytes:
+        """Read the whole body."""
+        try:
+            return await self.response.aread()
+        except httpx.HTTPError as exception:
+            raise _connection_error() from exception
+
+    async def read_chunk(self) -> bytes:
+        """Read the next part of the body, an empty chunk at the end."""
+        if self._chunks is None:
+            self._chunks = self.response.aiter_bytes()
+        try:
+            return await anext(self._chunks, b"")
+        except httpx.HTTPError as exception:
+            raise _connection_error() from exception
+
+    async def release(self) -> None:
+        """Close the stream without reading the rest of the body."""
+        await self.response.aclose()
+
+
+@dataclass
+class HTTP2Transport:
+    """Send requests over HTTP/2 with httpx.
+
+    Concurrent requests are multiplexed as streams over a single connection,
+    so a fan-out of many requests needs one TCP and TLS handshake instead of
+    one per request. Requires the optional `httpx[http2]` package. The
+    transport is not closed with the client, use it as an async context
+    manager or call `close`.
+    """
+
+    max_connections: int = 10
+    keepalive_expiry: float = 30.0
+
+    _client: Any = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Create the httpx client.
+
+        Raises
+        ------
+            ImportError: If httpx is not installed.
+
+        """
+        if httpx is None:
+            msg = "The HTTP/2 transport requires the 'httpx[http2]' package."
+            raise ImportError(msg)
+        self._client = httpx.AsyncClient(
+            http2=True,
+            # The client applies its own timeout to the whole request.
+            timeout=None,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: URL,
+        *,
+        headers: dict[str, str],
+        data: bytes | None,
+    ) -> HTTP2Response:
+        """Send a request and wait for the status and headers of the response.
+
+        Args:
+        ----
+            method: HTTP method to use.
+            url: The absolute URL of the request, with its query.
+            headers: The headers of the request.
+            data: The encoded body of the request.
+
+        Returns:
+        -------
+            The response, of which the body is not read yet.
+
+        Raises:
+        ------
+            BalenaCloudConnectionError: If a connection error occurs.
+
+        """
+        request = self._client.build_request(
+            method, str(url), headers=headers, content=data
+        )
+        try:
+            response = await self._client.send(request, stream=True)
+        except httpx.HTTPError as exception:
+            raise _connection_error() from exception
+        return HTTP2Response(response)
+
+    async def close(self) -> None:
+        """Close the connections of the httpx client."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> Self:
+        """Async enter.
+
+        Returns
+        -------
+            The HTTP/2 transport.
+
+        """
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Async exit.
+
+        Args:
+        ----
+            _exc_info: Exec type.
+
+        """
+        await self.close()
+
+
+@dataclass(slots=True)
+class MemoryRequest:
+    """Class to represent a request received by the in-memory transport."""
+
+    method: str
+    url: URL
+    headers: dict[str, str]
+    data: bytes | None
+
+
+@dataclass(slots=True)
+class MemoryResponse:
+    """Response of the in-memory transport."""
+
+    status: int = 200
+    body: bytes = b""
+    headers: CIMultiDict[str] = field(default_factory=CIMultiDict)
+    _offset: int = 0
+
+    async def read(self) -> bytes:
+        """Read the whole body."""
+        self._offset = len(self.body)
+        return self.body
+
+    async def read_chunk(self) -> bytes:
+        """Read the next part of the body, an empty chunk at the end."""
+        chunk = self.body[self._offset : self._offset + MEMORY_CHUNK_SIZE]
+        self._offset += len(chunk)
+        return chunk
+
+    async def release(self) -> None:
+        """Release the response, there is no connection to release."""
+
+
+@dataclass
+class MemoryTransport:
+    """Answer requests from memory, without a network, for tests and benchmarks.
+
+    Responses are registered per method and URL path with `add`, and are
+    returned for every matching request, regardless of the query string.
+    Requests without a response are answered with 404 Not Found. Received
+    requests are kept in `requests`.
+    """
+
+    routes: dict[tuple[str, str], tuple[int, bytes, CIMultiDict[str]]] = field(
+        default_factory=dict
+    )
+    requests: list[MemoryRequest] = field(default_factory=list)
+
+    def add(
+        self,
+        route: str,
+        payload: Any = None,
+        *,
+        status: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        """Register the response of a request.
+
+        Args:
+        ----
+            route: The URL path, for example, '/v7/device', prefixed with the
+                HTTP method for other methods than GET, for example,
+                'PATCH /v7/device(1)'.
+            payload: The JSON payload of the response, or the raw body as
+                bytes (optional).
+            status: HTTP status code of the response.
+            headers: Headers of the response, the content type defaults to
+                'application/json' (optional).
+
+        """
+        method, _, path = route.rpartition(" ")
+        body = payload if isinstance(payload, bytes) else b""
+        if payload is not None and not isinstance(payload, bytes):
+            body = orjson.dumps(payload)
+        response_headers: CIMultiDict[str] = CIMultiDict(
+            {CONTENT_TYPE: "application/json"}
+        )
+        response_headers.update(headers or {})
+        self.routes[method or METH_GET, path] = (status, body, response_headers)
+
+    async def request(
+        self,
+        method: str,
+        url: URL,
+        *,
+        headers: dict[str, str],
+        data: bytes | None,
+    ) -> MemoryResponse:
+        """Answer a request with the response of its method and URL path.
+
+        Args:
+        ----
+            method: HTTP method to use.
+            url: The absolute URL of the request, with its query.
+            headers: The headers of the request.
+            data: The encoded body of the request.
+
+        Returns:
+        -------
+            The registered response, or a 404 response.
+
+        """
+        self.requests.append(MemoryRequest(method, url, headers, data))
+        route = self.routes.get((method, url.path))
+        if route is None:
+            return MemoryResponse(status=404)
+        status, body, response_headers = route
+        return MemoryResponse(status, body, response_headers.copy())
+
+    async def close(self) -> None:
+        """Close the transport, there are no connections to close."""
@@ -2,14 +2,18 @@
 
 # pylint: disable=protected-access
 import asyncio
+import json
 from unittest.mock import patch
 
 import pytest
-from aiohttp import ClientError, ClientResponse, ClientSession
+from aiohttp import ClientError, ClientResponse, ClientSession, TCPConnector
+from aiohttp.web import StreamResponse
+from aiohttp.web_request import BaseRequest
 from aresponses import Response, ResponsesMockServer
 
-from balena_cloud import BalenaCloud
+from balena_cloud import BalenaCloud, ConnectorOptions
 from balena_cloud.exceptions import BalenaCloudConnectionError, BalenaCloudError
+from balena_cloud.odata import Field, Query
 
 from . import load_fixtures
 
@@ -97,3 +101,325 @@ async def test_client_error() -> None:
             pytest.raises(BalenaCloudConnectionError),
         ):
             assert await client.request("test")
+
+
+async def test_json_body(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the request body is sent as JSON."""
+    bodies = []
+
+    async def response_handler(request: BaseRequest) -> Response:
+        assert request.content_type == "application/json"
+        bodies.append(await request.json())
+        return aresponses.Response(
+            status=201,
+            headers={"Content-Type": "application/json"},
+            text='{"id": 1}',
+        )
+
+    aresponses.add("api.balena-cloud.com", "/v7/test", "POST", response_handler)
+    response = await balena_cloud_client.request(
+        "test", method="POST", data={"value": "ü", "nested": [1, None]}
+    )
+    assert response == {"id": 1}
+    assert bodies == [{"value": "ü", "nested": [1, None]}]
+
+
+async def test_paginate(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test pagination requests pages until a page is not full."""
+    pages = [[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}], [{"id": 5}]]
+    queries = []
+
+    async def response_handler(request: BaseRequest) -> Response:
+        queries.append(dict(request.query))
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=json.dumps({"d": pages[len(queries) - 1]}),
+        )
+
+    aresponses.add(
+        "api.balena-cloud.com", "/v7/device", "GET", response_handler, repeat=4
+    )
+    rows = [
+        row
+        async for row in balena_cloud_client.paginate(
+            "device",
+            params={"$filter": "is_online eq true", "$select": "device_name"},
+            page_size=2,
+        )
+    ]
+    assert [row["id"] for row in rows] == [1, 2, 3, 4, 5]
+    assert all(query["$select"] == "device_name,id" for query in queries)
+    assert [query["$filter"] for query in queries] == [
+        "is_online eq true",
+        "(is_online eq true) and (id gt 2)",
+        "(is_online eq true) and (id gt 4)",
+    ]
+    assert all("$skip" not in query for query in queries)
+    assert all(query["$top"] == "2" for query in queries)
+    assert all(query["$orderby"] == "id asc" for query in queries)
+
+
+async def test_coalesce_requests(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test concurrent identical GET requests share a single request."""
+    calls = 0
+
+    async def response_handler(_: BaseRequest) -> Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("devices/device.json"),
+        )
+
+    aresponses.add(
+        "api.balena-cloud.com", "/v7/device(1)", "GET", response_handler, repeat=4
+    )
+    devices = await asyncio.gather(
+        *(balena_cloud_client.device.get(device_id=1) for _ in range(5))
+    )
+    assert calls == 1
+    assert all(device == devices[0] for device in devices)
+
+    # A cancelled waiting caller does not cancel the shared request.
+    first = asyncio.create_task(balena_cloud_client.device.get(device_id=1))
+    second = asyncio.create_task(balena_cloud_client.device.get(device_id=1))
+    await asyncio.sleep(0.01)
+    second.cancel()
+    assert await first == devices[0]
+    assert calls == 2
+
+    # When the first caller is cancelled, a waiting caller sends the request.
+    first = asyncio.create_task(balena_cloud_client.device.get(device_id=1))
+    second = asyncio.create_task(balena_cloud_client.device.get(device_id=1))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert await second == devices[0]
+    assert calls == 4
+    assert not balena_cloud_client._coalescer
+
+
+async def test_coalesce_requests_error(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test all concurrent callers receive the error of a shared request."""
+    aresponses.add(
+        "api.balena-cloud.com", "/v7/test", "GET", aresponses.Response(status=500)
+    )
+    results = await asyncio.gather(
+        balena_cloud_client.request("test"),
+        balena_cloud_client.request("test"),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, BalenaCloudConnectionError) for result in results)
+
+
+async def test_coalesce_requests_disabled(aresponses: ResponsesMockServer) -> None:
+    """Test coalescing can be disabled."""
+    for _ in range(2):
+        aresponses.add(
+            "api.balena-cloud.com",
+            "/v7/test",
+            "GET",
+            aresponses.Response(
+                status=200,
+                headers={"Content-Type": "application/json"},
+                text=load_fixtures("no_data.json"),
+            ),
+        )
+    async with BalenaCloud(token="FAKE_TOKEN", coalesce_requests=False) as client:  # noqa: S106
+        await asyncio.gather(client.request("test"), client.request("test"))
+    aresponses.assert_no_unused_routes()
+
+
+async def test_connector_options(aresponses: ResponsesMockServer) -> None:
+    """Test the internal session uses the configured connection pool."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/test",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("no_data.json"),
+        ),
+    )
+    async with BalenaCloud(
+        token="FAKE_TOKEN",  # noqa: S106
+        connector=ConnectorOptions(limit=10, limit_per_host=5, keepalive_timeout=60),
+    ) as client:
+        await client.request("test")
+        assert client.session is not None
+        connector = client.session.connector
+        assert isinstance(connector, TCPConnector)
+        assert connector.limit == 10
+        assert connector.limit_per_host == 5
+
+
+async def test_warmup(aresponses: ResponsesMockServer) -> None:
+    """Test warming up opens connections to the API."""
+    for _ in range(3):
+        aresponses.add(
+            "api.balena-cloud.com", "/ping", "GET", aresponses.Response(text="OK")
+        )
+    async with BalenaCloud(token="FAKE_TOKEN") as client:  # noqa: S106
+        await client.warmup(connections=3)
+    aresponses.assert_no_unused_routes()
+
+
+async def test_warmup_error() -> None:
+    """Test warming up raises a connection error when the API is unreachable."""
+    async with ClientSession() as session:
+        client = BalenaCloud(token="FAKE_TOKEN", session=session)  # noqa: S106
+        with (
+            patch.object(session, "request", side_effect=ClientError),
+            pytest.raises(BalenaCloudConnectionError),
+        ):
+            await client.warmup()
+
+
+async def test_stream(aresponses: ResponsesMockServer) -> None:
+    """Test rows are yielded before the whole response is downloaded."""
+    first_row_received = asyncio.Event()
+
+    async def response_handler(request: BaseRequest) -> StreamResponse:
+        response = StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+        await response.write(b'{"d": [{"id": 1}, {"id"')
+        await first_row_received.wait()
+        await response.write(b": 2}]}")
+        await response.write_eof()
+        return response
+
+    aresponses.add("api.balena-cloud.com", "/v7/device", "GET", response_handler)
+    async with BalenaCloud(token="FAKE_TOKEN") as client:  # noqa: S106
+        rows = []
+        async for row in client.stream("device", params={"$top": 2}):
+            rows.append(row)
+            first_row_received.set()
+    assert rows == [{"id": 1}, {"id": 2}]
+
+
+async def test_stream_timeout(aresponses: ResponsesMockServer) -> None:
+    """Test a stalled download of a streamed response times out."""
+
+    async def response_handler(request: BaseRequest) -> StreamResponse:
+        response = StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+        await response.write(b'{"d": [{"id": 1}, ')
+        await asyncio.sleep(0.3)
+        return response
+
+    aresponses.add("api.balena-cloud.com", "/v7/device", "GET", response_handler)
+    async with BalenaCloud(token="FAKE_TOKEN", request_timeout=0.1) as client:  # noqa: S106
+        rows = client.stream("device")
+        assert await anext(rows) == {"id": 1}
+        with pytest.raises(BalenaCloudConnectionError):
+            await anext(rows)
+
+
+async def test_stream_content_type(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test streaming a response that is not JSON raises an error."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device",
+        "GET",
+        aresponses.Response(status=200, headers={"Content-Type": "text/html"}),
+    )
+    with pytest.raises(BalenaCloudError):
+        async for _ in balena_cloud_client.stream("device"):
+            pass
+
+
+async def test_stream_pages(aresponses: ResponsesMockServer) -> None:
+    """Test pagination parses the pages while they are downloaded."""
+    pages = [[{"id": 1}, {"id": 2}], [{"id": 3}]]
+    for page in pages:
+        aresponses.add(
+            "api.balena-cloud.com",
+            "/v7/device",
+            "GET",
+            aresponses.Response(
+                status=200,
+                headers={"Content-Type": "application/json"},
+                text=json.dumps({"d": page}),
+            ),
+        )
+    async with BalenaCloud(token="FAKE_TOKEN", stream_pages=True) as client:  # noqa: S106
+        rows = [row async for row in client.paginate("device", page_size=2)]
+    assert rows == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
+async def test_paginate_query(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test pagination applies the filter, ordering and row limit of a query."""
+    queries = []
+
+    async def response_handler(request: BaseRequest) -> Response:
+        queries.append(dict(request.query))
+        top = int(request.query["$top"])
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=json.dumps({"d": [{"id": index} for index in range(top)]}),
+        )
+
+    aresponses.add(
+        "api.balena-cloud.com", "/v7/device", "GET", response_handler, repeat=2
+    )
+    query = Query(filter=Field("status").eq("Idle"), orderby=["id desc"], top=3)
+    rows = [
+        row
+        async for row in balena_cloud_client.paginate(
+            "device",
+            params={"$filter": "is_online eq true"},
+            page_size=2,
+            query=query,
+        )
+    ]
+    assert len(rows) == 3
+    assert [(query["$top"], query["$filter"]) for query in queries] == [
+        ("2", "(is_online eq true) and (status eq 'Idle')"),
+        ("1", "((is_online eq true) and (status eq 'Idle')) and (id lt 1)"),
+    ]
+    assert all(query["$orderby"] == "id desc" for query in queries)
+
+
+async def test_paginate_query_ties(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test pagination orders the rows that are equal in the ordering by ID."""
+    queries = []
+
+    async def response_handler(request: BaseRequest) -> Response:
+        queries.append(dict(request.query))
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=json.dumps({"d": [{"id": 1}]}),
+        )
+
+    aresponses.add("api.balena-cloud.com", "/v7/device", "GET", response_handler)
+    query = Query(orderby=["is_online desc", "device_name asc"])
+    rows = [row async for row in balena_cloud_client.paginate("device", query=query)]
+    assert rows == [{"id": 1}]
+    assert queries[0]["$orderby"] == "is_online desc,device_name asc,id asc"
+    assert queries[0]["$skip"] == "0"
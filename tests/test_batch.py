@@ -0,0 +1,247 @@
+"""Test the OData $batch support for Balena Cloud."""
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from aiohttp.web_request import BaseRequest
+from aresponses import Response, ResponsesMockServer
+
+from balena_cloud import BalenaCloud
+from balena_cloud.exceptions import (
+    BalenaCloudAuthenticationError,
+    BalenaCloudConflictError,
+    BalenaCloudConnectionError,
+    BalenaCloudError,
+    BalenaCloudParameterValidationError,
+    BalenaCloudResponseError,
+)
+from balena_cloud.transport import MemoryTransport
+
+
+def batch_handler(
+    aresponses: ResponsesMockServer,
+    bodies: list[dict[str, Any]],
+    statuses: dict[str, int] | None = None,
+) -> Any:
+    """Create a $batch handler that answers every request in the batch."""
+
+    async def response_handler(request: BaseRequest) -> Response:
+        body = await request.json()
+        bodies.append(body)
+        responses = [
+            {
+                "id": item["id"],
+                "status": (statuses or {}).get(item["id"], 200),
+                "body": {"id": int(item["id"]) + 1, "tag_key": "key", "value": "1"},
+            }
+            for item in body["requests"]
+        ]
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=json.dumps({"responses": responses}),
+        )
+
+    return response_handler
+
+
+async def test_batch_combines_requests(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test concurrent requests are sent in a single $batch request."""
+    bodies: list[dict[str, Any]] = []
+    aresponses.add(
+        "api.balena-cloud.com", "/v7/$batch", "POST", batch_handler(aresponses, bodies)
+    )
+    async with balena_cloud_client.batch():
+        tags = await asyncio.gather(
+            *(
+                balena_cloud_client.device_tag.add(device_id=1, key=f"key_{i}", value=i)
+                for i in range(3)
+            )
+        )
+    assert len(bodies) == 1
+    assert [tag.id for tag in tags] == [1, 2, 3]
+    assert bodies[0]["requests"][1] == {
+        "id": "1",
+        "method": "POST",
+        "url": "/v7/device_tag",
+        "headers": {"Content-Type": "application/json"},
+        "body": {"device": 1, "tag_key": "key_1", "value": "1"},
+    }
+
+
+async def test_batch_max_size(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test a batch is split into requests of at most max_size requests."""
+    bodies: list[dict[str, Any]] = []
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/$batch",
+        "POST",
+        batch_handler(aresponses, bodies),
+        repeat=2,
+    )
+    async with balena_cloud_client.batch(max_size=2):
+        await asyncio.gather(
+            *(
+                balena_cloud_client.device_tag.update(device_id=1, key="key", value=i)
+                for i in range(3)
+            )
+        )
+    assert [len(body["requests"]) for body in bodies] == [2, 1]
+    assert bodies[0]["requests"][0]["url"] == "/v7/device_tag(device=1,tag_key='key')"
+
+
+@pytest.mark.parametrize(
+    ("status", "exception"),
+    [
+        (401, BalenaCloudAuthenticationError),
+        (409, BalenaCloudConflictError),
+        (500, BalenaCloudResponseError),
+    ],
+)
+async def test_batch_request_errors(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+    status: int,
+    exception: type[BalenaCloudError],
+) -> None:
+    """Test an error response only fails its own request."""
+    bodies: list[dict[str, Any]] = []
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/$batch",
+        "POST",
+        batch_handler(aresponses, bodies, {"1": status}),
+    )
+    async with balena_cloud_client.batch():
+        results = await asyncio.gather(
+            balena_cloud_client.device_tag.get(tag_id=1),
+            balena_cloud_client.device_tag.remove(tag_id=2),
+            return_exceptions=True,
+        )
+    assert len(bodies) == 1
+    assert bodies[0]["requests"][0]["url"].startswith("/v7/device_tag(1)?$select=")
+    assert isinstance(results[1], exception)
+    if isinstance(results[1], BalenaCloudResponseError):
+        assert results[1].status == status
+
+
+async def test_batch_missing_response(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test a request without a response in the batch fails."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/$batch",
+        "POST",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text='{"responses": []}',
+        ),
+    )
+    with pytest.raises(BalenaCloudError):
+        async with balena_cloud_client.batch():
+            await balena_cloud_client.device_tag.remove(tag_id=1)
+
+
+async def test_batch_request_failure(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test all requests fail when the $batch request fails."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/$batch",
+        "POST",
+        aresponses.Response(status=500),
+    )
+    async with balena_cloud_client.batch():
+        results = await asyncio.gather(
+            balena_cloud_client.device_tag.remove(tag_id=1),
+            balena_cloud_client.device_tag.remove(tag_id=2),
+            return_exceptions=True,
+        )
+    assert all(isinstance(result, BalenaCloudConnectionError) for result in results)
+
+
+async def test_batch_flushes_on_exit(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test requests still queued at exit are sent."""
+    bodies: list[dict[str, Any]] = []
+    aresponses.add(
+        "api.balena-cloud.com", "/v7/$batch", "POST", batch_handler(aresponses, bodies)
+    )
+    async with balena_cloud_client.batch():
+        task = asyncio.create_task(balena_cloud_client.device_tag.remove(tag_id=1))
+        await asyncio.sleep(0)
+    await task
+    assert len(bodies) == 1
+
+
+@pytest.mark.parametrize(
+    ("payload", "exception"),
+    [
+        (None, AttributeError),
+        ({"responses": [{"id": "0"}, {"id": "1"}]}, KeyError),
+    ],
+)
+async def test_batch_malformed_response(
+    payload: Any,
+    exception: type[Exception],
+) -> None:
+    """Test every request fails when the $batch response can not be read."""
+    transport = MemoryTransport()
+    transport.add("POST /v7/$batch", payload)
+    async with (
+        BalenaCloud(token="API_TOKEN", transport=transport) as client,  # noqa: S106
+        client.batch(),
+    ):
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                client.device_tag.remove(tag_id=1),
+                client.device_tag.remove(tag_id=2),
+                return_exceptions=True,
+            ),
+            timeout=1,
+        )
+    assert all(isinstance(result, exception) for result in results)
+
+
+async def test_batch_cancelled() -> None:
+    """Test the queued requests are cancelled with the $batch request."""
+    transport = MemoryTransport()
+    async with BalenaCloud(token="API_TOKEN", transport=transport) as client:  # noqa: S106
+        batch = client.batch()
+        request = asyncio.create_task(
+            batch.submit("device_tag(1)", method="DELETE"),
+        )
+        await asyncio.sleep(0)
+        batch.flush()
+        for flush in batch._flushes:
+            flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+
+
+@pytest.mark.parametrize("max_size", [0, -1])
+async def test_batch_invalid_max_size(
+    balena_cloud_client: BalenaCloud,
+    max_size: int,
+) -> None:
+    """Test a batch size below one is rejected."""
+    with pytest.raises(BalenaCloudParameterValidationError):
+        balena_cloud_client.batch(max_size=max_size)
@@ -0,0 +1,78 @@
+"""Test the bulk operations for Balena Cloud."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from balena_cloud.bulk import run_bulk
+from balena_cloud.exceptions import (
+    BalenaCloudError,
+    BalenaCloudParameterValidationError,
+)
+
+
+async def test_run_bulk_bounds_concurrency() -> None:
+    """Test no more calls than the concurrency are in flight."""
+    in_flight = 0
+    peak = 0
+
+    async def call(value: int) -> int:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return value * 2
+
+    results = await run_bulk([(value,) for value in range(20)], call, concurrency=4)
+    assert peak == 4
+    assert [result.result for result in results] == [value * 2 for value in range(20)]
+    assert all(result.ok for result in results)
+
+
+async def test_run_bulk_reports_errors() -> None:
+    """Test an error is reported per item and does not stop the others."""
+
+    async def call(value: int) -> int:
+        if value == 1:
+            msg = "Failed"
+            raise BalenaCloudError(msg)
+        return value
+
+    results = await run_bulk([(0,), (1,), (2,)], call, concurrency=2)
+    assert [result.ok for result in results] == [True, False, True]
+    assert isinstance(results[1].error, BalenaCloudError)
+    assert results[1].item == (1,)
+    assert results[2].result == 2
+
+
+async def test_run_bulk_without_items() -> None:
+    """Test an empty bulk operation."""
+
+    async def call() -> None:  # pragma: no cover
+        return None
+
+    assert await run_bulk([], call, concurrency=8) == []
+
+
+async def test_run_bulk_raises_unexpected_errors() -> None:
+    """Test an error that is not an API error is raised."""
+
+    async def call(key: str, value: str) -> str:
+        return f"{key}={value}"
+
+    with pytest.raises(TypeError):
+        await run_bulk([("a", "1"), ("b",), ("c", "3")], call, concurrency=1)
+
+
+@pytest.mark.parametrize("concurrency", [0, -1])
+async def test_run_bulk_invalid_concurrency(concurrency: int) -> None:
+    """Test a concurrency below one is rejected."""
+
+    async def call() -> None:  # pragma: no cover
+        return None
+
+    with pytest.raises(BalenaCloudParameterValidationError):
+        await run_bulk([()], call, concurrency=concurrency)
@@ -0,0 +1,216 @@
+"""Test the response cache for Balena Cloud."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from aiohttp import ClientSession
+from aiohttp.web_request import BaseRequest
+from aresponses import Response, ResponsesMockServer
+from multidict import CIMultiDict
+
+from balena_cloud import (
+    BalenaCloud,
+    BalenaCloudNotModifiedError,
+    ResponseCache,
+    RevalidatingCache,
+)
+from balena_cloud.cache import cache_key, resource_name
+from balena_cloud.middleware import Request
+
+from . import load_fixtures
+
+
+def test_resource_name() -> None:
+    """Test the resource name of a request URI."""
+    assert resource_name("device") == "device"
+    assert resource_name("device(uuid='1234')") == "device"
+    assert resource_name("device/$count") == "device"
+
+
+def test_cache_key() -> None:
+    """Test the cache key does not depend on the parameter order."""
+    assert cache_key("device", None) == ("device",)
+    assert cache_key("device", {"b": 2, "a": 1}) == cache_key(
+        "device", {"a": 1, "b": 2}
+    )
+
+
+def test_cache_ttl() -> None:
+    """Test responses expire after the TTL of their resource."""
+    cache = ResponseCache(ttl=10, ttls={"device": 1, "release": 0})
+    with patch("balena_cloud.cache.time.monotonic", return_value=100):
+        cache.set("application(1)", None, {"d": [1]})
+        cache.set("device(1)", None, {"d": [2]})
+        cache.set("release(1)", None, {"d": [3]})
+    with patch("balena_cloud.cache.time.monotonic", return_value=105):
+        assert cache.get("application(1)") == {"d": [1]}
+        assert cache.get("device(1)") is None
+        assert cache.get("release(1)") is None
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.hit_ratio == 1 / 3
+
+
+def test_cache_lru_eviction() -> None:
+    """Test the least recently used response is evicted when full."""
+    cache = ResponseCache(max_entries=2)
+    cache.set("device(1)", None, {"d": [1]})
+    cache.set("device(2)", None, {"d": [2]})
+    assert cache.get("device(1)") is not None
+    cache.set("device(3)", None, {"d": [3]})
+    assert cache.get("device(2)") is None
+    assert cache.get("device(1)") is not None
+    assert cache.get("device(3)") is not None
+
+
+def test_cache_invalidate_and_clear() -> None:
+    """Test a change evicts all responses of the same resource."""
+    cache = ResponseCache()
+    assert cache.hit_ratio == 0.0
+    cache.set("device(1)", None, {"d": [1]})
+    cache.set("device", {"$filter": "id eq 1"}, {"d": [1]})
+    cache.set("application(1)", None, {"d": [1]})
+    cache.invalidate("device(1)")
+    assert len(cache) == 1
+    assert cache.get("application(1)") is not None
+    cache.set("device(1)", {"$expand": "device_tag($select=id)"}, {"d": [1]})
+    cache.set("device", {"$filter": "belongs_to__application eq 1"}, {"d": [1]})
+    cache.set("release(1)", None, {"d": [1]})
+    cache.invalidate("device_tag")
+    cache.invalidate("application(1)")
+    assert len(cache) == 1
+    assert cache.get("release(1)") is not None
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+async def test_client_cache(aresponses: ResponsesMockServer) -> None:
+    """Test the client serves repeated lookups from the cache."""
+    for _ in range(2):
+        aresponses.add(
+            "api.balena-cloud.com",
+            "/v7/application(slug='test-slug')",
+            "GET",
+            aresponses.Response(
+                status=200,
+                headers={"Content-Type": "application/json"},
+                text=load_fixtures("fleets/fleet.json"),
+            ),
+        )
+    aresponses.add("api.balena-cloud.com", "/v7/application(1)", "PATCH")
+    cache = ResponseCache()
+    async with ClientSession() as session:
+        client = BalenaCloud(token="API_TOKEN", session=session, cache=cache)  # noqa: S106
+        first = await client.fleet.get(fleet_slug="test-slug")
+        assert await client.fleet.get(fleet_slug="test-slug") == first
+        assert (cache.hits, cache.misses) == (1, 1)
+        await client.request("application(1)", method="PATCH", data={"a": 1})
+        assert await client.fleet.get(fleet_slug="test-slug") == first
+    assert (cache.hits, cache.misses) == (1, 2)
+    aresponses.assert_no_unused_routes()
+
+
+def test_revalidating_cache() -> None:
+    """Test only responses with validators are stored, up to the maximum."""
+    cache = RevalidatingCache(max_entries=2)
+    cache.set("device(1)", None, CIMultiDict(ETag='"1"'), {"d": [1]})
+    cache.set(
+        "device(2)",
+        None,
+        CIMultiDict({"Last-Modified": "Mon, 01 Jan 2024"}),
+        {"d": [2]},
+    )
+    cache.set("device(3)", None, CIMultiDict(), {"d": [3]})
+    assert len(cache) == 2
+    validators = cache.get("device(1)")
+    assert validators is not None
+    assert validators.headers == {"If-None-Match": '"1"'}
+    cache.set(
+        "application(1)",
+        None,
+        CIMultiDict({"ETag": '"2"', "Last-Modified": "now"}),
+        None,
+    )
+    assert cache.get("device(2)") is None
+    validators = cache.get("application(1)")
+    assert validators is not None
+    assert validators.headers == {
+        "If-None-Match": '"2"',
+        "If-Modified-Since": "now",
+    }
+
+    # A response without validators replaces the stored validators.
+    cache.set("device(1)", None, CIMultiDict(), {"d": [1]})
+    assert cache.get("device(1)") is None
+    cache.invalidate("application(1)")
+    assert len(cache) == 0
+    cache.hits = 1
+    cache.clear()
+    assert cache.hits == 0
+
+
+async def test_client_revalidating_cache(aresponses: ResponsesMockServer) -> None:
+    """Test the client reuses the stored payload on 304 Not Modified."""
+    conditions = []
+
+    async def response_handler(request: BaseRequest) -> Response:
+        conditions.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return aresponses.Response(status=304)
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json", "ETag": '"v1"'},
+            text=load_fixtures("fleets/fleet.json"),
+        )
+
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/application(1)",
+        "GET",
+        response_handler,
+        repeat=3,
+    )
+    aresponses.add("api.balena-cloud.com", "/v7/application(1)", "PATCH")
+    cache = RevalidatingCache()
+    async with ClientSession() as session:
+        client = BalenaCloud(
+            token="API_TOKEN",  # noqa: S106
+            session=session,
+            revalidating_cache=cache,
+        )
+        first = await client.request("application(1)")
+        # A coalesced caller receives the stored payload as well.
+        assert await asyncio.gather(
+            client.request("application(1)"), client.request("application(1)")
+        ) == [first, first]
+        await client.request("application(1)", method="PATCH", data={"a": 1})
+        assert await client.request("application(1)") == first
+    assert conditions == [None, '"v1"', None]
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+async def test_revalidating_cache_middleware() -> None:
+    """Test the middleware adds the conditions and handles Not Modified."""
+    sent: list[dict[str, str] | None] = []
+
+    async def send(request: Request) -> dict[str, int]:
+        sent.append(request.headers)
+        if request.headers is not None:
+            msg = "Not modified"
+            raise BalenaCloudNotModifiedError(msg, 304)
+        request.response_headers = CIMultiDict(ETag='"1"')
+        return {"d": 1}
+
+    cache = RevalidatingCache()
+    first = await cache(Request(None, "device"), send)
+    assert await cache(Request(None, "device"), send) is first
+    assert sent == [None, {"If-None-Match": '"1"'}]
+
+    # Without stored validators, the error is not handled.
+    cache.clear()
+    with pytest.raises(BalenaCloudNotModifiedError):
+        await cache(Request(None, "device", headers={"If-None-Match": '"2"'}), send)
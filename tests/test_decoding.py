@@ -0,0 +1,50 @@
+"""Test the decoding of Balena Cloud API rows."""
+
+from __future__ import annotations
+
+import pytest
+
+from balena_cloud.decoding import decoder, required_fields
+from balena_cloud.exceptions import BalenaCloudParameterValidationError
+from balena_cloud.models import Device, ServiceInstall, Tag
+
+
+def test_required_fields() -> None:
+    """Test the required fields are named like the API fields."""
+    assert required_fields(Tag) == ("id", "tag_key", "value")
+    assert required_fields(ServiceInstall) == ("id", "created_at")
+
+
+def test_decoder() -> None:
+    """Test the decoder creates models and is reused per projection."""
+    decode = decoder(Tag)
+    assert decode({"id": 1, "tag_key": "key", "value": "value"}) == Tag(
+        id=1, key="key", value="value"
+    )
+    assert decoder(Tag, ["id", "tag_key", "value"]) is decoder(
+        Tag, ("id", "tag_key", "value")
+    )
+
+
+def test_decoder_raw() -> None:
+    """Test the raw decoder keeps the rows."""
+    row = {"id": 1, "uuid": "1234"}
+    assert decoder(Device, ["id", "uuid"], raw=True)(row) is row
+
+
+def test_decoder_missing_fields() -> None:
+    """Test a projection without the required model fields is rejected."""
+    with pytest.raises(BalenaCloudParameterValidationError, match="device_name"):
+        decoder(Device, ["id", "uuid"])
+
+
+def test_decoder_keeps_rows() -> None:
+    """Test decoding an expanded service install does not change the row."""
+    row = {
+        "id": 1,
+        "created_at": "2024-01-01T00:00:00.000Z",
+        "installs__service": [{"service_name": "main"}],
+    }
+    install = decoder(ServiceInstall)(row)
+    assert install.service_name == "main"
+    assert "service_name" not in row
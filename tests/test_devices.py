@@ -6,9 +6,18 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 import pytest
-from aresponses import ResponsesMockServer
+from aiohttp.web_request import BaseRequest
+from aresponses import Response, ResponsesMockServer
 from syrupy.assertion import SnapshotAssertion
 
+from balena_cloud.exceptions import (
+    BalenaCloudConnectionError,
+    BalenaCloudParameterValidationError,
+)
+from balena_cloud.models import Device
+from balena_cloud.odata import model_fields, select
+from balena_cloud.resources.device import expand_device
+
 from . import load_fixtures
 
 if TYPE_CHECKING:
@@ -558,3 +567,267 @@ async def test_remove_device_service_variable(
         "DELETE",
     )
     await balena_cloud_client.device_service_variable.remove(variable_id=1)
+
+
+async def test_get_device_select(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the get_device method only selects the model fields."""
+    queries = []
+
+    async def response_handler(request: BaseRequest) -> Response:
+        queries.append(dict(request.query))
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("devices/device.json"),
+        )
+
+    aresponses.add(
+        "api.balena-cloud.com", "/v7/device(1)", "GET", response_handler, repeat=2
+    )
+    await balena_cloud_client.device.get(device_id=1)
+    await balena_cloud_client.device.get(
+        device_id=1, fields=[*model_fields(Device), "os_version"]
+    )
+    assert queries[0]["$select"] == select(Device)
+    assert queries[1]["$select"].endswith(",os_version")
+
+
+async def test_get_device_include(
+    aresponses: ResponsesMockServer,
+    snapshot: SnapshotAssertion,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the get_device method with related collections included."""
+    queries = []
+
+    async def response_handler(request: BaseRequest) -> Response:
+        queries.append(dict(request.query))
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("devices/device_include.json"),
+        )
+
+    aresponses.add("api.balena-cloud.com", "/v7/device(1)", "GET", response_handler)
+    device = await balena_cloud_client.device.get(
+        device_id=1,
+        include=["tags", "environment_variables", "service_variables"],
+    )
+    assert device == snapshot
+    assert queries[0]["$select"] == select(Device)
+    assert queries[0]["$expand"] == (
+        "device_tag($select=id,tag_key,value),"
+        "device_environment_variable($select=id,name,value,created_at),"
+        "service_install($select=id,created_at;"
+        "$expand=installs__service($select=service_name),"
+        "device_service_environment_variable($select=id,name,value,created_at))"
+    )
+
+
+def test_expand_device() -> None:
+    """Test the $expand query value of the device includes."""
+    assert expand_device(["service_installs"]) == (
+        "service_install($select=id,created_at;"
+        "$expand=installs__service($select=service_name))"
+    )
+    assert expand_device([]) == ""
+    with pytest.raises(BalenaCloudParameterValidationError, match="firmware"):
+        expand_device(["tags", "firmware"])
+
+
+async def test_bulk_upsert_device_tags(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the bulk_upsert method adds, updates and reports errors."""
+    statuses = {"1": 201, "2": 409, "3": 500}
+
+    async def response_handler(request: BaseRequest) -> Response:
+        data = await request.json()
+        return aresponses.Response(
+            status=statuses[str(data["device"])],
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("devices/post_device_tag.json"),
+        )
+
+    aresponses.add(
+        "api.balena-cloud.com", "/v7/device_tag", "POST", response_handler, repeat=3
+    )
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device_tag(device=2,tag_key='tag_1')",
+        "PATCH",
+    )
+    results = await balena_cloud_client.device_tag.bulk_upsert(
+        [(1, "tag_1", "value_1"), (2, "tag_1", "value_1"), (3, "tag_1", "value_1")],
+        concurrency=2,
+    )
+    assert [result.ok for result in results] == [True, True, False]
+    assert results[0].result.key == "tag_1"
+    assert results[1].result is None
+    assert isinstance(results[2].error, BalenaCloudConnectionError)
+
+
+async def test_upsert_device_variable(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the upsert method updates an existing variable by its name."""
+    queries = []
+
+    async def response_handler(request: BaseRequest) -> Response:
+        queries.append(dict(request.query))
+        return aresponses.Response(status=200)
+
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device_environment_variable",
+        "POST",
+        aresponses.Response(
+            status=409,
+            headers={"Content-Type": "application/json"},
+            text='{"message": "Unique key constraint violated"}',
+        ),
+    )
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device_environment_variable",
+        "PATCH",
+        response_handler,
+    )
+    variable = await balena_cloud_client.device_variable.upsert(
+        device_id=1, name="test_name", value="test_value"
+    )
+    assert variable is None
+    assert queries == [{"$filter": "device eq 1 and name eq 'test_name'"}]
+
+
+async def test_upsert_device_service_variable(
+    aresponses: ResponsesMockServer,
+    snapshot: SnapshotAssertion,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the upsert method adds a new service variable."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device_service_environment_variable",
+        "POST",
+        aresponses.Response(
+            status=201,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("devices/post_device_service_variable.json"),
+        ),
+    )
+    results = await balena_cloud_client.device_service_variable.bulk_upsert(
+        [(1, "test_name", "test_value")]
+    )
+    assert results[0].result == snapshot
+
+
+async def test_bulk_upsert_device_variables(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the bulk_upsert method for device and service variables."""
+    for resource in (
+        "device_environment_variable",
+        "device_service_environment_variable",
+    ):
+        aresponses.add(
+            "api.balena-cloud.com",
+            f"/v7/{resource}",
+            "POST",
+            aresponses.Response(
+                status=409,
+                headers={"Content-Type": "application/json"},
+                text='{"message": "Unique key constraint violated"}',
+            ),
+        )
+        aresponses.add("api.balena-cloud.com", f"/v7/{resource}", "PATCH")
+    variables = await balena_cloud_client.device_variable.bulk_upsert(
+        [(1, "test_name", "test_value")]
+    )
+    service_variables = await balena_cloud_client.device_service_variable.bulk_upsert(
+        [(1, "test_name", "test_value")]
+    )
+    assert variables[0].ok
+    assert service_variables[0].ok
+
+
+async def test_get_many_devices(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the get_many method looks up devices by UUID in one request."""
+
+    async def response_handler(request: BaseRequest) -> Response:
+        assert request.query["$filter"] == (
+            "uuid in ('00000000000000000000000000000002',"
+            "'00000000000000000000000000000001','unknown')"
+        )
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("fleets/fleet_devices.json"),
+        )
+
+    aresponses.add("api.balena-cloud.com", "/v7/device", "GET", response_handler)
+    result = await balena_cloud_client.device.get_many(
+        device_uuids=[
+            "00000000000000000000000000000002",
+            "00000000000000000000000000000001",
+            "unknown",
+        ]
+    )
+    assert [device.id for device in result.items] == [2, 1]
+    assert result.missing == ["unknown"]
+
+
+async def test_get_many_devices_by_id(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the get_many method looks up devices by ID."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("fleets/fleet_devices.json"),
+        ),
+    )
+    result = await balena_cloud_client.device.get_many(device_ids=[1, 2])
+    assert [device.id for device in result.items] == [1, 2]
+    assert result.missing == []
+
+
+async def test_get_many_devices_parameters(balena_cloud_client: BalenaCloud) -> None:
+    """Test the get_many method needs either device IDs or UUIDs."""
+    with pytest.raises(BalenaCloudParameterValidationError):
+        await balena_cloud_client.device.get_many()
+    with pytest.raises(BalenaCloudParameterValidationError):
+        await balena_cloud_client.device.get_many(device_ids=[1], device_uuids=["1"])
+
+
+@pytest.mark.parametrize(
+    "resource",
+    [
+        "device",
+        "device_tag",
+        "device_variable",
+        "device_service_variable",
+        "service_install",
+    ],
+)
+async def test_get_missing_fields(
+    balena_cloud_client: BalenaCloud,
+    resource: str,
+) -> None:
+    """Test selecting too few fields for a single model fails before a request."""
+    with pytest.raises(BalenaCloudParameterValidationError):
+        await getattr(balena_cloud_client, resource).get(1, fields=["id"])
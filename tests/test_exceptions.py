@@ -237,3 +237,43 @@ async def test_conflict_error(
     )
     with pytest.raises(BalenaCloudConflictError):
         assert await balena_cloud_client.request("test")
+
+
+async def test_conflict_error_text(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the conflict error with a body that is not JSON."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/test",
+        "GET",
+        aresponses.Response(
+            status=409,
+            headers={"Content-Type": "text/plain"},
+            text="Unique key constraint violated",
+        ),
+    )
+    with pytest.raises(
+        BalenaCloudConflictError, match="Unique key constraint violated"
+    ):
+        assert await balena_cloud_client.request("test")
+
+
+async def test_invalid_json_error(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the error for a JSON response with an invalid body."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/test",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text="<html>Bad gateway</html>",
+        ),
+    )
+    with pytest.raises(BalenaCloudError, match="Invalid JSON response"):
+        assert await balena_cloud_client.request("test")
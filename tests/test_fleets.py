@@ -6,9 +6,15 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 import pytest
-from aresponses import ResponsesMockServer
+from aiohttp.web_request import BaseRequest
+from aresponses import Response, ResponsesMockServer
 from syrupy.assertion import SnapshotAssertion
 
+from balena_cloud.exceptions import BalenaCloudParameterValidationError
+from balena_cloud.health import FleetHealth
+from balena_cloud.odata import Field, Query
+from balena_cloud.table import DeviceTable
+
 from . import load_fixtures
 
 if TYPE_CHECKING:
@@ -378,3 +384,303 @@ async def test_remove_fleet_service_variable(
         "DELETE",
     )
     await balena_cloud_client.fleet_service_variable.remove(variable_id=1)
+
+
+async def test_iter_fleet_devices(
+    aresponses: ResponsesMockServer,
+    snapshot: SnapshotAssertion,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the iter_devices method pages through the devices."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("fleets/fleet_devices.json"),
+        ),
+    )
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("no_data.json"),
+        ),
+    )
+    devices = [
+        device
+        async for device in balena_cloud_client.fleet.iter_devices(
+            fleet_id=1, page_size=2
+        )
+    ]
+    assert devices == snapshot
+
+
+async def test_bulk_upsert_fleet_service_variables(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the bulk_upsert method updates existing service variables."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/service_environment_variable",
+        "POST",
+        aresponses.Response(
+            status=409,
+            headers={"Content-Type": "application/json"},
+            text='{"message": "Unique key constraint violated"}',
+        ),
+    )
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/service_environment_variable",
+        "PATCH",
+    )
+    results = await balena_cloud_client.fleet_service_variable.bulk_upsert(
+        [(1, "test_name", "test_value")]
+    )
+    assert results[0].ok
+    assert results[0].result is None
+
+
+async def test_get_fleet_device_table(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the get_device_table method only selects the table fields."""
+
+    async def response_handler(request: BaseRequest) -> Response:
+        assert request.query["$select"] == ",".join(DeviceTable.FIELDS)
+        assert request.query["$filter"] == (
+            "belongs_to__application eq 1 and is_online eq true"
+        )
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("fleets/fleet_devices.json"),
+        )
+
+    aresponses.add("api.balena-cloud.com", "/v7/device", "GET", response_handler)
+    table = await balena_cloud_client.fleet.get_device_table(
+        fleet_id=1, filters={"is_online": True}
+    )
+    assert list(table.ids) == [1, 2]
+    assert list(table.is_online) == [1, 0]
+    assert table.count_by_status() == {"Idle": 2}
+
+
+async def test_iter_fleet_devices_raw(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the iter_devices method yields the rows without models."""
+
+    async def response_handler(request: BaseRequest) -> Response:
+        assert request.query["$select"] == "id,uuid"
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text='{"d": [{"id": 1, "uuid": "1234"}, {"id": 2, "uuid": "5678"}]}',
+        )
+
+    aresponses.add("api.balena-cloud.com", "/v7/device", "GET", response_handler)
+    rows = [
+        row
+        async for row in balena_cloud_client.fleet.iter_devices(
+            fleet_id=1, fields=["id", "uuid"], raw=True
+        )
+    ]
+    assert rows == [{"id": 1, "uuid": "1234"}, {"id": 2, "uuid": "5678"}]
+
+
+async def test_iter_fleet_devices_missing_fields(
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test selecting too few fields for the models fails before a request."""
+    with pytest.raises(BalenaCloudParameterValidationError):
+        await balena_cloud_client.fleet.get_devices(fleet_id=1, fields=["id", "uuid"])
+
+
+async def test_get_fleet_devices_query(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the get_devices method filters and orders on the server."""
+
+    async def response_handler(request: BaseRequest) -> Response:
+        assert request.query["$filter"] == (
+            "(belongs_to__application eq 1) and "
+            "((is_online eq true) and (device_tag/any(x0:x0/tag_key eq 'rollout')))"
+        )
+        assert request.query["$orderby"] == "device_name asc,id asc"
+        assert request.query["$top"] == "5"
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("fleets/fleet_devices.json"),
+        )
+
+    aresponses.add("api.balena-cloud.com", "/v7/device", "GET", response_handler)
+    query = Query(
+        filter=Field("is_online").eq(True)  # noqa: FBT003
+        & Field("device_tag").any(lambda tag: (tag / "tag_key").eq("rollout")),
+        orderby=["device_name asc"],
+        top=5,
+    )
+    devices = await balena_cloud_client.fleet.get_devices(fleet_id=1, query=query)
+    assert [device.id for device in devices] == [1, 2]
+
+
+async def test_get_fleet_devices_include(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the get_devices method fetches the device tags in the same request."""
+
+    async def response_handler(request: BaseRequest) -> Response:
+        assert request.query["$expand"] == "device_tag($select=id,tag_key,value)"
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("devices/device_include.json"),
+        )
+
+    aresponses.add("api.balena-cloud.com", "/v7/device", "GET", response_handler)
+    devices = await balena_cloud_client.fleet.get_devices(fleet_id=1, include=["tags"])
+    assert len(devices) == 1
+    assert devices[0].tags is not None
+    assert devices[0].tags[0].key == "location"
+    assert devices[0].service_installs is not None
+    assert devices[0].service_installs[0].service_name == "main"
+
+
+async def test_fleet_snapshot(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the snapshot method loads a fleet with one request per collection."""
+    filters = {}
+    for path, fixture in (
+        ("/v7/device", "fleets/fleet_devices.json"),
+        ("/v7/device_tag", "devices/device_tags.json"),
+        ("/v7/device_environment_variable", "devices/device_variables.json"),
+        ("/v7/service_install", "devices/service_installs.json"),
+        (
+            "/v7/device_service_environment_variable",
+            "devices/device_service_variables.json",
+        ),
+    ):
+
+        async def response_handler(
+            request: BaseRequest, fixture: str = fixture
+        ) -> Response:
+            filters[request.path] = request.query["$filter"]
+            return aresponses.Response(
+                status=200,
+                headers={"Content-Type": "application/json"},
+                text=load_fixtures(fixture),
+            )
+
+        aresponses.add("api.balena-cloud.com", path, "GET", response_handler)
+
+    snapshot = await balena_cloud_client.fleet.snapshot(fleet_id=1)
+    assert filters == {
+        "/v7/device": "belongs_to__application eq 1",
+        "/v7/device_tag": "device/belongs_to__application eq 1",
+        "/v7/device_environment_variable": "device/belongs_to__application eq 1",
+        "/v7/service_install": "device/belongs_to__application eq 1",
+        "/v7/device_service_environment_variable": (
+            "service_install/device/belongs_to__application eq 1"
+        ),
+    }
+    assert len(snapshot) == 2
+    device = snapshot.get(1)
+    assert device is not None
+    assert [tag.key for tag in device.tags or []] == ["tag_1"]
+    assert len(device.environment_variables or []) == 2
+    assert [install.service_name for install in device.service_installs or []] == [
+        "main",
+        "worker",
+    ]
+    assert device.service_installs is not None
+    assert len(device.service_installs[0].service_variables or []) == 2
+
+
+async def test_count_fleet_devices(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the count_devices method counts on the server."""
+
+    async def response_handler(request: BaseRequest) -> Response:
+        assert request.query["$filter"] == (
+            "(belongs_to__application eq 1 and status eq 'Idle') and "
+            "(is_online eq true)"
+        )
+        assert "$orderby" not in request.query
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text='{"d": 5}',
+        )
+
+    aresponses.add("api.balena-cloud.com", "/v7/device/$count", "GET", response_handler)
+    count = await balena_cloud_client.fleet.count_devices(
+        1,
+        {"status": "Idle"},
+        query=Query(
+            filter=Field("is_online").eq(True),  # noqa: FBT003
+            orderby=["id asc"],
+        ),
+    )
+    assert count == 5
+
+
+async def test_fleet_health_summary(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the health_summary method counts the devices of every fleet."""
+    counts = {
+        "belongs_to__application eq 1": 10,
+        "(belongs_to__application eq 1) and (is_online eq true)": 7,
+        "(belongs_to__application eq 1) and (overall_status eq 'updating')": 2,
+        "belongs_to__application eq 2": 3,
+        "(belongs_to__application eq 2) and (is_online eq true)": 3,
+        "(belongs_to__application eq 2) and (overall_status eq 'updating')": 0,
+    }
+
+    async def response_handler(request: BaseRequest) -> Response:
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=f'{{"d": {counts[request.query["$filter"]]}}}',
+        )
+
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device/$count",
+        "GET",
+        response_handler,
+        repeat=6,
+    )
+    summary = await balena_cloud_client.fleet.health_summary([2, 1, 2])
+    assert list(summary) == [2, 1]
+    assert summary[1] == FleetHealth(fleet_id=1, total=10, online=7, updating=2)
+    assert summary[1].offline == 3
+    assert summary[2].offline == 0
+
+
+@pytest.mark.parametrize("resource", ["fleet", "service", "fleet_service_variable"])
+async def test_get_missing_fields(
+    balena_cloud_client: BalenaCloud,
+    resource: str,
+) -> None:
+    """Test selecting too few fields for a single model fails before a request."""
+    with pytest.raises(BalenaCloudParameterValidationError):
+        await getattr(balena_cloud_client, resource).get(1, fields=["id"])
@@ -0,0 +1,86 @@
+"""Test the device index of Balena Cloud."""
+
+from __future__ import annotations
+
+from balena_cloud.index import DeviceIndex
+from balena_cloud.models import Device, Tag
+
+
+def device(
+    device_id: int,
+    *,
+    status: str = "Idle",
+    is_online: bool = True,
+    tags: dict[str, str] | None = None,
+) -> Device:
+    """Create a device."""
+    return Device(
+        id=device_id,
+        name=f"Device_{device_id}",
+        status=status,
+        uuid=f"{device_id:032x}",
+        is_online=is_online,
+        is_web_accessible=False,
+        is_undervolted=False,
+        latitude=0.0,
+        longitude=0.0,
+        tags=[
+            Tag(id=index, key=key, value=value)
+            for index, (key, value) in enumerate((tags or {}).items())
+        ],
+    )
+
+
+def ids(devices: list[Device]) -> list[int]:
+    """Get the sorted IDs of devices."""
+    return sorted(item.id for item in devices)
+
+
+def test_lookups() -> None:
+    """Test the lookups of the index."""
+    index = DeviceIndex.from_devices(
+        [
+            device(1, tags={"site": "ams", "rollout": "beta"}),
+            device(2, status="Offline", is_online=False, tags={"site": "ams"}),
+            device(3, tags={"site": "rtm"}),
+        ]
+    )
+    assert len(index) == 3
+    assert 2 in index
+    assert 4 not in index
+    assert ids(list(index)) == [1, 2, 3]
+
+    assert index.get(2) == index.get_by_uuid(f"{2:032x}")
+    assert index.get(4) is None
+    assert index.get_by_uuid("unknown") is None
+    assert ids(index.with_name("Device_3")) == [3]
+    assert index.with_name("unknown") == []
+    assert ids(index.with_status("Idle")) == [1, 3]
+    assert ids(index.with_tag("site")) == [1, 2, 3]
+    assert ids(index.with_tag("site", "ams")) == [1, 2]
+    assert ids(index.with_tag("rollout", "beta")) == [1]
+    assert index.with_tag("rollout", "stable") == []
+    assert ids(index.online()) == [1, 3]
+    assert ids(index.offline()) == [2]
+    assert index.count_by_status() == {"Idle": 2, "Offline": 1}
+
+
+def test_replace_and_remove() -> None:
+    """Test replacing and removing devices keeps the indexes consistent."""
+    index = DeviceIndex.from_devices([device(1, tags={"site": "ams"}), device(2)])
+    index.add(device(1, status="Offline", is_online=False, tags={"site": "rtm"}))
+    assert len(index) == 2
+    assert ids(index.with_status("Offline")) == [1]
+    assert index.with_tag("site", "ams") == []
+    assert ids(index.with_tag("site", "rtm")) == [1]
+    assert ids(index.offline()) == [1]
+    assert ids(index.online()) == [2]
+
+    removed = index.remove(1)
+    assert removed is not None
+    assert removed.id == 1
+    assert index.remove(1) is None
+    assert index.get_by_uuid(f"{1:032x}") is None
+    assert index.with_tag("site") == []
+    assert index.offline() == []
+    assert index.count_by_status() == {"Idle": 1}
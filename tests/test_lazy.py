@@ -0,0 +1,39 @@
+"""Test the lazily parsed datetime fields of the models."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from balena_cloud.models import EnvironmentVariable, Fleet
+
+ROW = {"id": 1, "name": "VAR", "value": "1", "created_at": "2024-01-01T12:00:00.000Z"}
+
+
+def test_parsed_on_first_access() -> None:
+    """Test the string is kept until the field is read."""
+    variable = EnvironmentVariable.from_dict(ROW)
+    slot = EnvironmentVariable.__dict__["created_at"].fset.__self__
+    assert slot.__get__(variable) == "2024-01-01T12:00:00.000Z"
+    created_at = variable.created_at
+    assert slot.__get__(variable) is created_at
+    assert created_at == datetime(2024, 1, 1, 12, tzinfo=UTC)
+    assert variable.created_at is created_at
+
+
+def test_model_behaves_like_datetime_field() -> None:
+    """Test comparing, serializing and setting the field."""
+    variable = EnvironmentVariable.from_dict(ROW)
+    assert variable == EnvironmentVariable(
+        id=1,
+        name="VAR",
+        value="1",
+        created_at=datetime(2024, 1, 1, 12, tzinfo=UTC),
+    )
+    assert variable.to_dict()["created_at"] == "2024-01-01T12:00:00+00:00"
+    variable.created_at = datetime(2025, 1, 1, tzinfo=UTC)
+    assert variable.created_at.year == 2025
+
+
+def test_class_attribute() -> None:
+    """Test the field is a descriptor on the model class."""
+    assert isinstance(Fleet.__dict__["created_at"], property)
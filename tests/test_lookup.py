@@ -0,0 +1,64 @@
+"""Test the lookups of many resources of Balena Cloud."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import orjson
+import pytest
+from aiohttp.web_request import BaseRequest
+from aresponses import Response, ResponsesMockServer
+
+from balena_cloud.exceptions import BalenaCloudParameterValidationError
+from balena_cloud.lookup import Lookup, chunk_values
+from balena_cloud.models import Tag
+
+if TYPE_CHECKING:
+    from balena_cloud import BalenaCloud
+
+
+def test_chunk_values() -> None:
+    """Test values are split by their URL encoded length."""
+    assert chunk_values([]) == []
+    assert chunk_values([1, 2, 3]) == [[1, 2, 3]]
+    # '1' and the separator are 4 characters, 'a' with quotes 9.
+    assert chunk_values([1, 2, 3], max_length=8) == [[1, 2], [3]]
+    assert chunk_values(["a", "b"], max_length=8) == [["a"], ["b"]]
+
+
+async def test_lookup(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the chunks are requested and the rows returned in input order."""
+    filters = []
+
+    async def response_handler(request: BaseRequest) -> Response:
+        value = request.query["$filter"]
+        filters.append(value)
+        ids = [int(item) for item in value[len("id in (") : -1].split(",")]
+        rows = [
+            {"id": tag_id, "tag_key": f"tag_{tag_id}", "value": ""}
+            for tag_id in ids
+            if tag_id != 3
+        ]
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=orjson.dumps({"d": rows}).decode(),
+        )
+
+    aresponses.add(
+        "api.balena-cloud.com", "/v7/device_tag", "GET", response_handler, repeat=2
+    )
+    lookup = Lookup(balena_cloud_client, "device_tag", Tag, max_length=8)
+    result = await lookup.get_many([4, 3, 1, 4, 2], fields=["tag_key", "value"])
+    assert sorted(filters) == ["id in (1,2)", "id in (4,3)"]
+    assert [tag.id for tag in result.items] == [4, 1, 4, 2]
+    assert result.missing == [3]
+
+
+async def test_lookup_missing_fields(balena_cloud_client: BalenaCloud) -> None:
+    """Test selecting too few fields fails before a request."""
+    with pytest.raises(BalenaCloudParameterValidationError):
+        await Lookup(balena_cloud_client, "device_tag", Tag).get_many([1], ["id"])
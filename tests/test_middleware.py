@@ -0,0 +1,123 @@
+"""Test the middleware chain for Balena Cloud."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from aiohttp import ClientSession
+from aresponses import ResponsesMockServer
+
+from balena_cloud import BalenaCloud, ResponseCache, RetryPolicy
+from balena_cloud.middleware import (
+    Coalescer,
+    Handler,
+    Request,
+    batching,
+    build_chain,
+)
+
+from . import load_fixtures
+
+
+async def test_build_chain() -> None:
+    """Test the middlewares run in order around the handler."""
+    calls = []
+
+    def middleware(name: str) -> Any:
+        async def call(request: Request, call_next: Handler) -> Any:
+            calls.append(f"{name} before")
+            response = await call_next(request)
+            calls.append(f"{name} after")
+            return response
+
+        return call
+
+    async def handler(request: Request) -> Any:
+        calls.append("handler")
+        return request.uri
+
+    chain = build_chain([middleware("outer"), middleware("inner")], handler)
+    assert await chain(Request(None, "device")) == "device"
+    assert calls == [
+        "outer before",
+        "inner before",
+        "handler",
+        "inner after",
+        "outer after",
+    ]
+    assert build_chain([], handler) is handler
+
+
+async def test_short_circuit() -> None:
+    """Test a middleware can answer without calling the next handler."""
+
+    async def ping(request: Request, call_next: Handler) -> Any:
+        if request.uri == "ping":
+            return "OK"
+        return await call_next(request)
+
+    async with BalenaCloud(token="API_TOKEN", middlewares=[ping]) as client:  # noqa: S106
+        assert await client.request("ping") == "OK"
+
+
+async def test_custom_middlewares(aresponses: ResponsesMockServer) -> None:
+    """Test a custom chain with the built-in middlewares of the client."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device(1)",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("devices/device.json"),
+        ),
+    )
+    requests: list[tuple[str, str]] = []
+
+    async def metrics(request: Request, call_next: Handler) -> Any:
+        requests.append((request.method, request.uri))
+        return await call_next(request)
+
+    cache = ResponseCache()
+    async with ClientSession() as session:
+        client = BalenaCloud(
+            token="API_TOKEN",  # noqa: S106
+            session=session,
+            cache=cache,
+        )
+        client.middlewares = [cache, metrics, *client.default_middlewares()[1:]]
+        first = await client.device.get(device_id=1)
+        assert await client.device.get(device_id=1) == first
+    # The second request is served by the cache, before the metrics.
+    assert requests == [("GET", "device(1)")]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_default_middlewares() -> None:
+    """Test the default chain follows the options of the client."""
+    client = BalenaCloud(token="API_TOKEN", coalesce_requests=False)  # noqa: S106
+    assert client.default_middlewares() == [batching]
+
+    cache = ResponseCache()
+    retry = RetryPolicy()
+    client = BalenaCloud(token="API_TOKEN", cache=cache, retry=retry)  # noqa: S106
+    middlewares = client.default_middlewares()
+    assert middlewares[:2] == [cache, batching]
+    assert isinstance(middlewares[2], Coalescer)
+    assert middlewares[3] is retry
+
+
+async def test_coalescer_changes() -> None:
+    """Test changes are never shared between callers."""
+    coalescer = Coalescer()
+    calls = 0
+
+    async def handler(_request: Request) -> Any:
+        nonlocal calls
+        calls += 1
+
+    request = Request(None, "device(1)", method="PATCH", data={"a": 1})
+    await coalescer(request, handler)
+    await coalescer(request, handler)
+    assert calls == 2
+    assert len(coalescer) == 0
@@ -0,0 +1,145 @@
+"""Test the OData query helpers for Balena Cloud."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+
+from balena_cloud.exceptions import BalenaCloudParameterValidationError
+from balena_cloud.models import Device, Fleet, ServiceInstall, Tag
+from balena_cloud.odata import (
+    Field,
+    Filter,
+    Query,
+    expand,
+    literal,
+    model_fields,
+    select,
+)
+
+
+def test_model_fields_use_aliases() -> None:
+    """Test the model fields are named like the API fields."""
+    assert model_fields(Fleet) == (
+        "id",
+        "app_name",
+        "slug",
+        "uuid",
+        "created_at",
+        "is_public",
+        "is_host",
+        "is_archived",
+        "is_discoverable",
+    )
+
+
+def test_model_fields_skip_unselectable_fields() -> None:
+    """Test fields that are not part of the API resource are skipped."""
+    assert model_fields(ServiceInstall) == ("id", "created_at")
+
+
+def test_select() -> None:
+    """Test the select query value."""
+    assert select(Device) == (
+        "id,device_name,status,uuid,is_online,is_web_accessible,"
+        "is_undervolted,latitude,longitude"
+    )
+    assert select(Device, ["id", "uuid"]) == "id,uuid"
+
+
+def test_expand() -> None:
+    """Test the $expand query value of a related collection."""
+    assert expand("device_tag", Tag) == "device_tag($select=id,tag_key,value)"
+    assert expand("service_install", ServiceInstall, "a", "b") == (
+        "service_install($select=id,created_at;$expand=a,b)"
+    )
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, "null"),
+        (True, "true"),
+        (False, "false"),
+        (42, "42"),
+        (1.5, "1.5"),
+        ("Idle", "'Idle'"),
+        ("it's", "'it''s'"),
+        ("' or 1 eq 1 or '", "''' or 1 eq 1 or '''"),
+        (datetime(2024, 1, 1, tzinfo=UTC), "datetime'2024-01-01T00:00:00+00:00'"),
+    ],
+)
+def test_literal(value: object, expected: str) -> None:
+    """Test values are formatted and escaped as OData literals."""
+    assert literal(value) == expected
+
+
+def test_literal_unsupported() -> None:
+    """Test an unsupported value type is rejected."""
+    with pytest.raises(BalenaCloudParameterValidationError):
+        literal(object())
+
+
+def test_comparisons() -> None:
+    """Test the comparison filters."""
+    status = Field("status")
+    assert str(status.eq("Idle")) == "status eq 'Idle'"
+    assert str(status.ne("Idle")) == "status ne 'Idle'"
+    assert str(Field("cpu_temp").gt(60)) == "cpu_temp gt 60"
+    assert str(Field("cpu_temp").ge(60)) == "cpu_temp ge 60"
+    assert str(Field("memory_usage").lt(10)) == "memory_usage lt 10"
+    assert str(Field("memory_usage").le(10)) == "memory_usage le 10"
+    assert str(Field("id").in_([1, 2, 3])) == "id in (1,2,3)"
+    with pytest.raises(BalenaCloudParameterValidationError):
+        Field("id").in_([])
+    assert str(status.contains("dat")) == "contains(status,'dat')"
+    assert str(status.startswith("Up")) == "startswith(status,'Up')"
+    assert str(status.endswith("ing")) == "endswith(status,'ing')"
+    assert (Field("belongs_to__application") / "app_name").name == (
+        "belongs_to__application/app_name"
+    )
+
+
+def test_logical_operators() -> None:
+    """Test combining filters with and, or and not."""
+    online = Field("is_online").eq(True)  # noqa: FBT003
+    idle = Field("status").eq("Idle")
+    assert str(online & idle) == "(is_online eq true) and (status eq 'Idle')"
+    assert str(online | idle) == "(is_online eq true) or (status eq 'Idle')"
+    assert str(~online) == "not (is_online eq true)"
+
+
+def test_lambdas() -> None:
+    """Test the any and all lambda filters, also nested."""
+    assert str(Field("device_tag").any()) == "device_tag/any(x0:true)"
+    assert (
+        str(Field("device_tag").any(lambda tag: (tag / "tag_key").eq("rollout")))
+        == "device_tag/any(x0:x0/tag_key eq 'rollout')"
+    )
+    assert str(
+        Field("service_install").all(
+            lambda install: (install / "installs__service").any(
+                lambda service: (service / "service_name").eq("main")
+            )
+        )
+    ) == (
+        "service_install/all(x0:x0/installs__service/any(x1:x1/service_name eq 'main'))"
+    )
+
+
+def test_query_params() -> None:
+    """Test the query is merged into the request parameters."""
+    query = Query(
+        filter=Field("status").eq("Idle"), orderby=["created_at desc"], top=10
+    )
+    assert query.params({"$filter": "belongs_to__application eq 1"}) == {
+        "$filter": "(belongs_to__application eq 1) and (status eq 'Idle')",
+        "$orderby": "created_at desc",
+    }
+    assert query.params() == {
+        "$filter": "status eq 'Idle'",
+        "$orderby": "created_at desc",
+    }
+    assert Query().params({"$select": "id"}) == {"$select": "id"}
+    assert isinstance(query.filter, Filter)
@@ -9,6 +9,8 @@ import pytest
 from aresponses import ResponsesMockServer
 from syrupy.assertion import SnapshotAssertion
 
+from balena_cloud.exceptions import BalenaCloudParameterValidationError
+
 from . import load_fixtures
 
 if TYPE_CHECKING:
@@ -70,3 +72,9 @@ async def test_get_organization(
             org_handle=param_value
         )
     assert organization == snapshot
+
+
+async def test_get_missing_fields(balena_cloud_client: BalenaCloud) -> None:
+    """Test selecting too few fields for the model fails before a request."""
+    with pytest.raises(BalenaCloudParameterValidationError):
+        await balena_cloud_client.organization.get(1, fields=["id"])
@@ -0,0 +1,79 @@
+"""Test the client-side rate limiter for Balena Cloud."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import ClientSession
+from aresponses import ResponsesMockServer
+
+from balena_cloud import BalenaCloud, RateLimiter
+from balena_cloud.exceptions import BalenaCloudResponseError
+from balena_cloud.rate_limit import TokenBucket
+
+
+async def test_token_bucket_burst_and_rate() -> None:
+    """Test the bucket allows a burst and then the configured rate."""
+    bucket = TokenBucket(rate=100, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.monotonic() - start < 0.02
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.monotonic() - start >= 0.04
+
+
+def test_read_and_write_buckets() -> None:
+    """Test reads and writes only use separate buckets when configured."""
+    shared = RateLimiter()
+    assert shared.bucket("GET") is shared.bucket("PATCH")
+    separate = RateLimiter(rate=10, write_rate=2)
+    assert separate.bucket("GET") is not separate.bucket("PATCH")
+    assert separate.bucket("POST").burst == separate.burst
+
+
+def test_adaptive_rate() -> None:
+    """Test the rate is halved when throttled and recovers on success."""
+    limiter = RateLimiter(rate=8, min_rate=3, recovery=0.25)
+    limiter.throttled("GET")
+    assert limiter.bucket("GET").rate == 4
+    limiter.throttled("GET")
+    assert limiter.bucket("GET").rate == 3
+    limiter.succeeded("GET")
+    assert limiter.bucket("GET").rate == 5
+    for _ in range(3):
+        limiter.succeeded("GET")
+    assert limiter.bucket("GET").rate == 8
+
+    fixed = RateLimiter(rate=8, adaptive=False)
+    fixed.throttled("GET")
+    assert fixed.bucket("GET").rate == 8
+
+
+async def test_client_rate_limiter(aresponses: ResponsesMockServer) -> None:
+    """Test the client waits for the limiter and slows down on 429."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device(1)",
+        "PATCH",
+        aresponses.Response(status=429),
+    )
+    aresponses.add("api.balena-cloud.com", "/v7/device(1)", "PATCH", repeat=2)
+    limiter = RateLimiter(rate=1000, burst=1)
+    async with ClientSession() as session:
+        client = BalenaCloud(
+            token="API_TOKEN",  # noqa: S106
+            session=session,
+            rate_limiter=limiter,
+        )
+        with pytest.raises(BalenaCloudResponseError):
+            await client.device.update(device_id=1, data={"note": "1"})
+        assert limiter.bucket("PATCH").rate == 500
+        await asyncio.gather(
+            client.device.update(device_id=1, data={"note": "2"}),
+            client.device.update(device_id=1, data={"note": "3"}),
+        )
+    assert limiter.bucket("PATCH").rate == 600
@@ -5,9 +5,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import pytest
 from aresponses import ResponsesMockServer
 from syrupy.assertion import SnapshotAssertion
 
+from balena_cloud.exceptions import BalenaCloudParameterValidationError
+
 from . import load_fixtures
 
 if TYPE_CHECKING:
@@ -45,3 +48,29 @@ async def test_remove_release(
         "DELETE",
     )
     await balena_cloud_client.release.remove(release_id=1)
+
+
+async def test_get_many_releases(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the get_many method reports the missing releases."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/release",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("releases/release.json"),
+        ),
+    )
+    result = await balena_cloud_client.release.get_many([1, 987654])
+    assert [release.id for release in result.items] == [987654]
+    assert result.missing == [1]
+
+
+async def test_get_missing_fields(balena_cloud_client: BalenaCloud) -> None:
+    """Test selecting too few fields for the model fails before a request."""
+    with pytest.raises(BalenaCloudParameterValidationError):
+        await balena_cloud_client.release.get(1, fields=["id"])
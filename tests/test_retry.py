@@ -0,0 +1,127 @@
+"""Test the retry policy for Balena Cloud."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from typing import Any
+
+import pytest
+from aiohttp import ClientSession
+from aresponses import ResponsesMockServer
+
+from balena_cloud import BalenaCloud, RetryPolicy
+from balena_cloud.exceptions import (
+    BalenaCloudAuthenticationError,
+    BalenaCloudConnectionError,
+    BalenaCloudError,
+    BalenaCloudResponseError,
+)
+from balena_cloud.retry import parse_retry_after
+
+from . import load_fixtures
+
+
+def test_parse_retry_after() -> None:
+    """Test the Retry-After header is parsed in seconds."""
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("soon") is None
+    moment = datetime.now(UTC) + timedelta(seconds=30)
+    delay = parse_retry_after(format_datetime(moment, usegmt=True))
+    assert delay is not None
+    assert 25 < delay <= 30
+
+
+@pytest.mark.parametrize(
+    ("method", "exception", "attempt", "expected"),
+    [
+        ("GET", BalenaCloudResponseError("Error", 503), 1, True),
+        ("GET", BalenaCloudResponseError("Error", 429), 2, True),
+        ("GET", BalenaCloudResponseError("Error", 429), 3, False),
+        ("GET", BalenaCloudResponseError("Error", 429, 60), 1, True),
+        ("GET", BalenaCloudResponseError("Error", 429, 86400), 1, False),
+        ("GET", BalenaCloudResponseError("Error", 404), 1, False),
+        ("GET", BalenaCloudConnectionError("Timeout"), 1, True),
+        ("GET", BalenaCloudAuthenticationError("Unauthorized"), 1, False),
+        ("POST", BalenaCloudResponseError("Error", 503), 1, False),
+    ],
+)
+def test_should_retry(
+    method: str,
+    exception: BalenaCloudError,
+    attempt: int,
+    *,
+    expected: bool,
+) -> None:
+    """Test which failed attempts are retried."""
+    assert RetryPolicy().should_retry(method, exception, attempt) is expected
+
+
+def test_delay() -> None:
+    """Test the exponential backoff delay."""
+    policy = RetryPolicy(backoff_base=1, backoff_cap=5, jitter=False)
+    error = BalenaCloudConnectionError("Timeout")
+    assert [policy.delay(attempt, error) for attempt in range(1, 5)] == [1, 2, 4, 5]
+    assert policy.delay(1, BalenaCloudResponseError("Error", 429, 7.5)) == 7.5
+    assert 0 <= RetryPolicy(backoff_base=1).delay(3, error) <= 4
+
+
+async def test_retry_request(aresponses: ResponsesMockServer) -> None:
+    """Test a request is retried until it succeeds."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device(1)",
+        "GET",
+        aresponses.Response(status=503),
+    )
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device(1)",
+        "GET",
+        aresponses.Response(status=429, headers={"Retry-After": "0"}),
+    )
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/device(1)",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("devices/device.json"),
+        ),
+    )
+    retries: list[tuple[int, float, Any]] = []
+    policy = RetryPolicy(
+        backoff_base=0.001,
+        on_retry=lambda *args: retries.append(args),
+    )
+    async with ClientSession() as session:
+        client = BalenaCloud(token="API_TOKEN", session=session, retry=policy)  # noqa: S106
+        device = await client.device.get(device_id=1)
+    assert device.id == 1
+    assert [attempt for attempt, _, _ in retries] == [1, 2]
+    assert retries[1][1] == 0.0
+    assert retries[1][2].status == 429
+
+
+async def test_retry_gives_up(aresponses: ResponsesMockServer) -> None:
+    """Test the last error is raised after the maximum number of attempts."""
+    for _ in range(2):
+        aresponses.add(
+            "api.balena-cloud.com",
+            "/v7/test",
+            "GET",
+            aresponses.Response(status=500),
+        )
+    async with ClientSession() as session:
+        client = BalenaCloud(
+            token="API_TOKEN",  # noqa: S106
+            session=session,
+            retry=RetryPolicy(max_attempts=2, backoff_base=0.001),
+        )
+        with pytest.raises(BalenaCloudResponseError) as exc_info:
+            await client.request("test")
+    assert exc_info.value.status == 500
+    aresponses.assert_no_unused_routes()
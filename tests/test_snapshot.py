@@ -0,0 +1,112 @@
+"""Test the fleet snapshot of Balena Cloud."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from balena_cloud.snapshot import FleetSnapshot
+
+
+def device(device_id: int) -> dict[str, Any]:
+    """Create a device row, like the ones returned by the Balena Cloud API."""
+    return {
+        "id": device_id,
+        "device_name": f"Device_{device_id}",
+        "status": "Idle",
+        "uuid": f"{device_id:032x}",
+        "is_online": True,
+        "is_web_accessible": False,
+        "is_undervolted": False,
+        "latitude": "0.0000",
+        "longitude": "0.0000",
+    }
+
+
+def test_from_rows() -> None:
+    """Test the related rows are joined on their device."""
+    snapshot = FleetSnapshot.from_rows(
+        1,
+        [device(1), device(2)],
+        {
+            "tags": [
+                {"id": 1, "device": {"__id": 1}, "tag_key": "a", "value": "1"},
+                {"id": 2, "device": {"__id": 3}, "tag_key": "b", "value": "2"},
+            ],
+            "environment_variables": [
+                {
+                    "id": 1,
+                    "device": {"__id": 2},
+                    "name": "LOG_LEVEL",
+                    "value": "debug",
+                    "created_at": "2024-01-01T00:00:00.000Z",
+                },
+            ],
+            "service_installs": [
+                {
+                    "id": 5,
+                    "device": {"__id": 2},
+                    "created_at": "2024-01-01T00:00:00.000Z",
+                    "installs__service": {"__id": 1, "service_name": "main"},
+                },
+            ],
+            "service_variables": [
+                {
+                    "id": 7,
+                    "service_install": {"__id": 5},
+                    "name": "PORT",
+                    "value": "8080",
+                    "created_at": "2024-01-01T00:00:00.000Z",
+                },
+                {
+                    "id": 8,
+                    "service_install": None,
+                    "name": "ORPHAN",
+                    "value": "",
+                    "created_at": "2024-01-01T00:00:00.000Z",
+                },
+            ],
+        },
+    )
+    assert len(snapshot) == 2
+    assert [item.id for item in snapshot] == [1, 2]
+
+    first = snapshot.get(1)
+    assert first is not None
+    assert [tag.key for tag in first.tags or []] == ["a"]
+    assert first.environment_variables == []
+    assert first.service_installs == []
+
+    second = snapshot.get_by_uuid(f"{2:032x}")
+    assert second is not None
+    assert [variable.name for variable in second.environment_variables or []] == [
+        "LOG_LEVEL"
+    ]
+    assert second.service_installs is not None
+    install = second.service_installs[0]
+    assert install.service_name == "main"
+    assert [variable.name for variable in install.service_variables or []] == ["PORT"]
+
+    assert snapshot.devices.with_tag("a", "1") == [first]
+    assert snapshot.get(3) is None
+    assert snapshot.get_by_uuid("unknown") is None
+
+
+def test_empty() -> None:
+    """Test a snapshot of a fleet without devices."""
+    snapshot = FleetSnapshot.from_rows(1, [])
+    assert len(snapshot) == 0
+    assert snapshot.devices.count_by_status() == {}
+
+
+def test_from_rows_keeps_rows() -> None:
+    """Test joining does not change the rows, which may be shared."""
+    devices = [device(1)]
+    installs = [
+        {"id": 5, "device": {"__id": 1}, "created_at": "2024-01-01T00:00:00.000Z"}
+    ]
+    snapshot = FleetSnapshot.from_rows(1, devices, {"service_installs": installs})
+    first = snapshot.get(1)
+    assert first is not None
+    assert [install.id for install in first.service_installs or []] == [5]
+    assert devices == [device(1)]
+    assert "device_service_environment_variable" not in installs[0]
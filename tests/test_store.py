@@ -0,0 +1,88 @@
+"""Test the snapshot store of Balena Cloud."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from balena_cloud.index import DeviceIndex
+from balena_cloud.models import Device, EnvironmentVariable, ServiceInstall, Tag
+from balena_cloud.store import SnapshotStore
+from balena_cloud.sync import DeviceSync
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def device(device_id: int) -> Device:
+    """Create a device with its related collections."""
+    created_at = datetime(2024, 1, 1, tzinfo=UTC)
+    return Device(
+        id=device_id,
+        name=f"Device_{device_id}",
+        status="Idle",
+        uuid=f"{device_id:032x}",
+        is_online=True,
+        is_web_accessible=False,
+        is_undervolted=False,
+        latitude=52.37,
+        longitude=4.89,
+        tags=[Tag(id=device_id, key="site", value="ams")],
+        environment_variables=[
+            EnvironmentVariable(
+                id=device_id, name="LOG_LEVEL", value="debug", created_at=created_at
+            )
+        ],
+        service_installs=[
+            ServiceInstall(
+                id=device_id,
+                created_at=created_at,
+                service_name="main",
+                service_variables=[],
+            )
+        ],
+    )
+
+
+async def test_save_and_load(tmp_path: Path) -> None:
+    """Test a stored sync is restored with its devices and watermark."""
+    store = SnapshotStore(tmp_path / "fleets.db")
+    watermark = datetime(2024, 1, 2, 12, tzinfo=UTC)
+    await store.save(
+        DeviceSync(
+            None,
+            1,
+            DeviceIndex.from_devices([device(1), device(2)]),
+            watermark=watermark,
+        )
+    )
+    await store.save(DeviceSync(None, 2, DeviceIndex.from_devices([device(3)])))
+
+    sync = DeviceSync(None, 1)
+    assert await store.load(sync)
+    assert sync.watermark == watermark
+    assert list(sync.devices) == [device(1), device(2)]
+    assert sync.devices.with_tag("site", "ams")
+
+    sync = DeviceSync(None, 2)
+    assert await store.load(sync)
+    assert sync.watermark is None
+    assert [item.id for item in sync.devices] == [3]
+
+
+async def test_save_replaces(tmp_path: Path) -> None:
+    """Test saving a fleet again replaces its devices."""
+    store = SnapshotStore(tmp_path / "fleets.db")
+    await store.save(DeviceSync(None, 1, DeviceIndex.from_devices([device(1)])))
+    await store.save(DeviceSync(None, 1, DeviceIndex.from_devices([device(2)])))
+    sync = DeviceSync(None, 1)
+    assert await store.load(sync)
+    assert [item.id for item in sync.devices] == [2]
+
+
+async def test_load_unknown_fleet(tmp_path: Path) -> None:
+    """Test loading a fleet that was never saved leaves the sync untouched."""
+    store = SnapshotStore(str(tmp_path / "fleets.db"))
+    sync = DeviceSync(None, 1)
+    assert not await store.load(sync)
+    assert len(sync.devices) == 0
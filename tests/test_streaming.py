@@ -0,0 +1,62 @@
+"""Test the incremental parsing of Balena Cloud collection responses."""
+
+from __future__ import annotations
+
+import orjson
+import pytest
+
+from balena_cloud.exceptions import BalenaCloudError
+from balena_cloud.streaming import RowParser
+
+from . import load_fixtures
+
+
+def parse(content: bytes, chunk_size: int) -> list[object]:
+    """Parse a response in chunks of the given size."""
+    parser = RowParser()
+    rows = []
+    for index in range(0, len(content), chunk_size):
+        rows.extend(parser.feed(content[index : index + chunk_size]))
+    parser.close()
+    return rows
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 100_000])
+def test_rows_in_chunks(chunk_size: int) -> None:
+    """Test rows are parsed, no matter where the chunks are split."""
+    content = load_fixtures("devices/device_tags.json").encode()
+    assert parse(content, chunk_size) == orjson.loads(content)["d"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5])
+def test_strings_with_json_tokens(chunk_size: int) -> None:
+    """Test brackets, quotes and escapes in strings do not end a row."""
+    rows = [
+        {"value": 'a"}]{["b', "nested": [1, {"value": "\\"}]},
+        {"value": 'ü \\\\ \\" x'},
+    ]
+    content = orjson.dumps({"d": rows, "__count": 2})
+    assert parse(content, chunk_size) == rows
+
+
+def test_rows_are_returned_when_complete() -> None:
+    """Test a row is returned as soon as it is complete."""
+    parser = RowParser()
+    assert parser.feed(b'{"d": [{"id": 1}, {"id"') == [{"id": 1}]
+    assert parser.feed(b": 2}") == [{"id": 2}]
+    assert not parser.done
+    assert parser.feed(b"]}") == []
+    assert parser.done
+
+
+def test_empty_collection() -> None:
+    """Test an empty collection has no rows."""
+    assert parse(b'{"d":[]}', 1) == []
+
+
+def test_incomplete_response() -> None:
+    """Test a response that ends before the end of the rows is an error."""
+    parser = RowParser()
+    assert parser.feed(b'{"d": [{"id": 1}, {"id": 2') == [{"id": 1}]
+    with pytest.raises(BalenaCloudError):
+        parser.close()
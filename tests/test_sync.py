@@ -0,0 +1,149 @@
+"""Test the device sync of Balena Cloud."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from aiohttp.web_request import BaseRequest
+from aresponses import Response, ResponsesMockServer
+
+if TYPE_CHECKING:
+    from balena_cloud import BalenaCloud
+
+
+def device(device_id: int, modified_at: str, status: str = "Idle") -> dict[str, Any]:
+    """Create a device row, like the ones returned by the Balena Cloud API."""
+    return {
+        "id": device_id,
+        "device_name": f"Device_{device_id}",
+        "status": status,
+        "uuid": f"{device_id:032x}",
+        "is_online": True,
+        "is_web_accessible": False,
+        "is_undervolted": False,
+        "latitude": "0.0000",
+        "longitude": "0.0000",
+        "modified_at": modified_at,
+    }
+
+
+def fleet_server(
+    aresponses: ResponsesMockServer,
+    responses: list[tuple[list[dict[str, Any]], list[int] | None]],
+    queries: list[dict[str, str]],
+) -> None:
+    """Serve the changed devices and the device IDs of every poll."""
+    polls = iter(responses)
+    current: list[int] | None = None
+
+    async def response_handler(request: BaseRequest) -> Response:
+        nonlocal current
+        queries.append(dict(request.query))
+        if request.query["$select"] == "id":
+            rows = [{"id": device_id} for device_id in current or []]
+        else:
+            rows, current = next(polls)
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=orjson.dumps({"d": rows}).decode(),
+        )
+
+    aresponses.add(
+        "api.balena-cloud.com", "/v7/device", "GET", response_handler, repeat=10
+    )
+
+
+async def test_poll(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test polls only request the changes and emit the device events."""
+    queries: list[dict[str, str]] = []
+    fleet_server(
+        aresponses,
+        [
+            (
+                [
+                    device(1, "2024-01-01T00:00:00.000Z"),
+                    device(2, "2024-01-02T00:00:00.000Z"),
+                ],
+                None,
+            ),
+            (
+                [
+                    device(2, "2024-01-03T00:00:00.000Z", status="Updating"),
+                    device(3, "2024-01-03T00:00:00.000Z"),
+                ],
+                [2],
+            ),
+            ([device(3, "2024-01-03T00:00:00.000Z")], [2, 3]),
+        ],
+        queries,
+    )
+    sync = balena_cloud_client.fleet.sync(fleet_id=1)
+
+    events = await sync.poll()
+    assert [(event.kind, event.device.id) for event in events] == [
+        ("added", 1),
+        ("added", 2),
+    ]
+    assert sync.watermark == datetime(2024, 1, 2, tzinfo=UTC)
+    assert queries[0]["$filter"] == "belongs_to__application eq 1"
+    assert queries[0]["$select"].endswith(",modified_at")
+
+    events = await sync.poll()
+    assert [(event.kind, event.device.id) for event in events] == [
+        ("added", 3),
+        ("changed", 2),
+        ("removed", 1),
+    ]
+    assert sync.watermark == datetime(2024, 1, 3, tzinfo=UTC)
+    assert queries[1]["$filter"] == (
+        "(belongs_to__application eq 1) and "
+        "(modified_at ge datetime'2024-01-02T00:00:00+00:00')"
+    )
+    assert queries[2]["$select"] == "id"
+    assert [item.id for item in sync.devices.with_status("Updating")] == [2]
+
+    # A device modified at the watermark is returned again, without changes.
+    assert await sync.poll() == []
+    assert len(sync.devices) == 2
+
+
+async def test_poll_without_removals(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test the device IDs are not requested when removals are not detected."""
+    queries: list[dict[str, str]] = []
+    fleet_server(
+        aresponses,
+        [([device(1, "2024-01-01T00:00:00.000Z")], None), ([], None)],
+        queries,
+    )
+    sync = balena_cloud_client.fleet.sync(fleet_id=1, detect_removals=False)
+    assert len(await sync.poll()) == 1
+    assert await sync.poll() == []
+    assert len(queries) == 2
+    assert len(sync.devices) == 1
+
+
+async def test_watch(
+    aresponses: ResponsesMockServer,
+    balena_cloud_client: BalenaCloud,
+) -> None:
+    """Test watching a fleet yields the events of the polls."""
+    fleet_server(
+        aresponses,
+        [([device(1, "2024-01-01T00:00:00.000Z")], None), ([], [])],
+        [],
+    )
+    sync = balena_cloud_client.fleet.sync(fleet_id=1)
+    events = sync.watch(interval=0)
+    event = await anext(events)
+    assert (event.kind, event.device.id) == ("added", 1)
+    event = await anext(events)
+    assert (event.kind, event.device.id) == ("removed", 1)
@@ -0,0 +1,99 @@
+"""Test the columnar device table."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from balena_cloud.exceptions import BalenaCloudParameterValidationError
+from balena_cloud.table import DeviceRow, DeviceTable
+
+ROWS = [
+    {
+        "id": 3,
+        "uuid": "c",
+        "device_name": "Device_3",
+        "status": "Idle",
+        "is_online": True,
+        "latitude": "52.0",
+        "longitude": "5.0",
+    },
+    {
+        "id": 1,
+        "uuid": "a",
+        "device_name": "Device_1",
+        "status": "Updating",
+        "is_online": False,
+        "latitude": None,
+        "longitude": "",
+    },
+    {
+        "id": 2,
+        "uuid": "b",
+        "device_name": "Device_2",
+        "status": "Idle",
+        "is_online": False,
+        "latitude": "40.7",
+        "longitude": "-74.0",
+    },
+]
+
+
+@pytest.fixture(name="table")
+def device_table() -> DeviceTable:
+    """Create a device table."""
+    return DeviceTable.from_rows(ROWS)
+
+
+def test_columns(table: DeviceTable) -> None:
+    """Test the rows are stored column by column."""
+    assert len(table) == 3
+    assert list(table.ids) == [3, 1, 2]
+    assert table.uuids == ["c", "a", "b"]
+    assert list(table.is_online) == [1, 0, 0]
+    assert table.latitudes[0] == 52.0
+    assert math.isnan(table.latitudes[1])
+    assert math.isnan(table.longitudes[1])
+
+
+def test_rows(table: DeviceTable) -> None:
+    """Test a device table can be used like a sequence of rows."""
+    assert table[0] == DeviceRow(3, "c", "Device_3", "Idle", True, 52.0, 5.0)  # noqa: FBT003
+    assert [row.uuid for row in table] == ["c", "a", "b"]
+
+
+def test_filter(table: DeviceTable) -> None:
+    """Test filtering the devices."""
+    assert list(table.filter(status="Idle").ids) == [3, 2]
+    assert list(table.filter(is_online=False).ids) == [1, 2]
+    assert list(table.filter(status="Idle", is_online=False).ids) == [2]
+    assert list(table.filter(predicate=lambda row: row.id > 1).ids) == [3, 2]
+    assert len(table.filter(status="Offline")) == 0
+
+
+def test_mask_and_take(table: DeviceTable) -> None:
+    """Test selecting devices by a mask and by indices."""
+    assert table.mask([True, False, True]).uuids == ["c", "b"]
+    assert table.take([2, 0]).names == ["Device_2", "Device_3"]
+
+
+def test_within(table: DeviceTable) -> None:
+    """Test selecting the devices within a bounding box."""
+    assert table.within((50, 54), (3, 8)).uuids == ["c"]
+    assert table.within((-90, 90), (-180, 180)).uuids == ["c", "b"]
+
+
+def test_sort_by(table: DeviceTable) -> None:
+    """Test sorting the devices by a column."""
+    assert list(table.sort_by("ids").ids) == [1, 2, 3]
+    assert table.sort_by("names", reverse=True).uuids == ["c", "b", "a"]
+    assert table.sort_by("latitudes").uuids == ["b", "c", "a"]
+    assert table.sort_by("longitudes", reverse=True).uuids == ["c", "b", "a"]
+    with pytest.raises(BalenaCloudParameterValidationError):
+        table.sort_by("device_name")
+
+
+def test_count_by_status(table: DeviceTable) -> None:
+    """Test counting the devices per status."""
+    assert table.count_by_status() == {"Idle": 2, "Updating": 1}
@@ -0,0 +1,235 @@
+"""Test the transports for Balena Cloud."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import ClientError, ClientSession
+from aresponses import ResponsesMockServer
+from yarl import URL
+
+from balena_cloud import (
+    AiohttpTransport,
+    BalenaCloud,
+    BalenaCloudAuthenticationError,
+    BalenaCloudConflictError,
+    BalenaCloudConnectionError,
+    BalenaCloudResponseError,
+    HTTP2Transport,
+    MemoryTransport,
+)
+from balena_cloud import transport as transport_module
+from balena_cloud.transport import AiohttpResponse, HTTP2Response
+
+from . import load_fixtures
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+class HTTPError(Exception):
+    """Base error of the fake httpx module."""
+
+
+def fake_httpx(*chunks: bytes) -> MagicMock:
+    """Get a fake httpx module of which the client answers with the chunks."""
+
+    async def aiter_bytes() -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+
+    response = MagicMock(status_code=200, headers={"Content-Type": "application/json"})
+    response.aread = AsyncMock(return_value=b"".join(chunks))
+    response.aiter_bytes = aiter_bytes
+    response.aclose = AsyncMock()
+    httpx = MagicMock(HTTPError=HTTPError)
+    httpx.AsyncClient.return_value.send = AsyncMock(return_value=response)
+    httpx.AsyncClient.return_value.aclose = AsyncMock()
+    return httpx
+
+
+async def test_memory_transport() -> None:
+    """Test requests are answered from memory and recorded."""
+    transport = MemoryTransport()
+    transport.add("/v7/device", {"d": [{"id": 1}]})
+    transport.add("PATCH /v7/device(1)")
+    async with BalenaCloud(token="API_TOKEN", transport=transport) as client:  # noqa: S106
+        assert await client.request("device", params={"$top": 1}) == {"d": [{"id": 1}]}
+        assert (
+            await client.request("device(1)", method="PATCH", data={"is_online": True})
+            is None
+        )
+    assert client.session is None
+    first, second = transport.requests
+    assert (first.method, first.url.path, first.url.query) == (
+        "GET",
+        "/v7/device",
+        {"$top": "1"},
+    )
+    assert first.headers["Authorization"] == "Bearer API_TOKEN"
+    assert second.data == b'{"is_online":true}'
+
+
+@pytest.mark.parametrize(
+    ("status", "error"),
+    [
+        (401, BalenaCloudAuthenticationError),
+        (404, BalenaCloudResponseError),
+        (409, BalenaCloudConflictError),
+    ],
+)
+async def test_memory_transport_errors(status: int, error: type[Exception]) -> None:
+    """Test the client raises an error for the status codes of a transport."""
+    transport = MemoryTransport()
+    transport.add("/v7/device", {"error": "error"}, status=status)
+    async with BalenaCloud(token="API_TOKEN", transport=transport) as client:  # noqa: S106
+        with pytest.raises(error):
+            await client.request("device")
+
+
+async def test_memory_transport_retry_after() -> None:
+    """Test the Retry-After header of a transport response is parsed."""
+    transport = MemoryTransport()
+    transport.add("/v7/device", status=429, headers={"retry-after": "3"})
+    async with BalenaCloud(token="API_TOKEN", transport=transport) as client:  # noqa: S106
+        with pytest.raises(BalenaCloudResponseError) as exception:
+            await client.request("unknown")
+        assert exception.value.status == 404
+        with pytest.raises(BalenaCloudResponseError) as exception:
+            await client.request("device")
+        assert exception.value.status == 429
+        assert exception.value.retry_after == 3
+
+
+async def test_memory_transport_stream() -> None:
+    """Test a response from memory is streamed in chunks."""
+    transport = MemoryTransport()
+    transport.add("/v7/device", {"d": [{"id": 1}, {"id": 2}, {"id": 3}]})
+    async with BalenaCloud(token="API_TOKEN", transport=transport) as client:  # noqa: S106
+        with patch.object(transport_module, "MEMORY_CHUNK_SIZE", 4):
+            rows = [row async for row in client.stream("device")]
+    assert rows == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
+async def test_memory_transport_warmup() -> None:
+    """Test warming up goes through the transport."""
+    transport = MemoryTransport()
+    transport.add("/ping", b"OK", headers={"Content-Type": "text/plain"})
+    async with BalenaCloud(token="API_TOKEN", transport=transport) as client:  # noqa: S106
+        await client.warmup(connections=2)
+    assert [request.url for request in transport.requests] == [
+        URL("https://api.balena-cloud.com/ping")
+    ] * 2
+
+
+async def test_aiohttp_transport(aresponses: ResponsesMockServer) -> None:
+    """Test the aiohttp transport is the default transport."""
+    aresponses.add(
+        "api.balena-cloud.com",
+        "/v7/test",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("no_data.json"),
+        ),
+    )
+    async with ClientSession() as session:
+        client = BalenaCloud(token="API_TOKEN", session=session)  # noqa: S106
+        await client.request("test")
+        assert isinstance(client.transport, AiohttpTransport)
+        assert client.transport.session is session
+        with (
+            patch.object(session, "request", side_effect=ClientError),
+            pytest.raises(BalenaCloudConnectionError),
+        ):
+            await client.request("other")
+        await client.transport.close()
+        assert session.closed
+
+
+async def test_aiohttp_transport_read_error() -> None:
+    """Test an error while reading the body is a connection error."""
+    response = AiohttpResponse(MagicMock())
+    response.response.read = AsyncMock(side_effect=ClientError)
+    response.response.content.readany = AsyncMock(side_effect=ClientError)
+    with pytest.raises(BalenaCloudConnectionError):
+        await response.read()
+    with pytest.raises(BalenaCloudConnectionError):
+        await response.read_chunk()
+
+
+async def test_http2_transport_without_httpx() -> None:
+    """Test the HTTP/2 transport requires httpx."""
+    with (
+        patch.object(transport_module, "httpx", None),
+        pytest.raises(ImportError, match="httpx"),
+    ):
+        HTTP2Transport()
+
+
+async def test_http2_transport() -> None:
+    """Test requests are sent and read with the httpx client."""
+    httpx = fake_httpx(b'{"d": [{"id": 1},', b' {"id": 2}]}')
+    with patch.object(transport_module, "httpx", httpx):
+        async with HTTP2Transport(max_connections=2) as transport:
+            client = BalenaCloud(token="API_TOKEN", transport=transport)  # noqa: S106
+            assert await client.request("device", params={"$top": 2}) == {
+                "d": [{"id": 1}, {"id": 2}]
+            }
+            assert [row async for row in client.stream("device")] == [
+                {"id": 1},
+                {"id": 2},
+            ]
+    httpx.Limits.assert_called_once_with(max_connections=2, keepalive_expiry=30.0)
+    httpx.AsyncClient.assert_called_once_with(
+        http2=True, timeout=None, limits=httpx.Limits.return_value
+    )
+    httpx_client = httpx.AsyncClient.return_value
+    assert httpx_client.build_request.call_args_list[0].args == (
+        "GET",
+        "https://api.balena-cloud.com/v7/device?$top=2",
+    )
+    # The stream is closed after it is read, the client when the transport is.
+    httpx_client.send.return_value.aclose.assert_awaited_once()
+    httpx_client.aclose.assert_awaited_once()
+
+
+async def test_http2_transport_errors() -> None:
+    """Test an httpx error while sending or reading is a connection error."""
+    httpx = fake_httpx(b"{}")
+    httpx_client = httpx.AsyncClient.return_value
+    with patch.object(transport_module, "httpx", httpx):
+        transport = HTTP2Transport()
+        response = await transport.request(
+            "GET",
+            URL("https://api.balena-cloud.com/v7/device"),
+            headers={},
+            data=None,
+        )
+        assert isinstance(response, HTTP2Response)
+        assert response.status == 200
+        assert response.headers["Content-Type"] == "application/json"
+
+        response.response.aread.side_effect = HTTPError
+        with pytest.raises(BalenaCloudConnectionError):
+            await response.read()
+
+        async def aiter_bytes() -> AsyncIterator[bytes]:
+            raise HTTPError
+            yield b""
+
+        response.response.aiter_bytes = aiter_bytes
+        with pytest.raises(BalenaCloudConnectionError):
+            await response.read_chunk()
+
+        httpx_client.send.side_effect = HTTPError
+        with pytest.raises(BalenaCloudConnectionError):
+            await transport.request(
+                "GET",
+                URL("https://api.balena-cloud.com/v7/device"),
+                headers={},
+                data=None,
+            )